@@ -5,12 +5,21 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+The task event stream (`/api/tasks/stream/`) is only served through this entry point, e.g.
+``uvicorn _Project_TodoList.asgi:application``.
 """
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_Project_TodoList.settings")
 
 application = get_asgi_application()
+
+if settings.STARTUP_WARMUP:
+    from _Project_TodoList.startup import warm_up
+
+    warm_up()  # Antes de que el servidor entregue solicitudes a este worker
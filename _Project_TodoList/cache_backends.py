@@ -0,0 +1,65 @@
+"""
+Backends de caché del proyecto
+
+Clases:
+- FileBasedCache: Caché de archivos de Django con `add` y `update` atómicos entre los procesos de la máquina.
+- RedisCache: Caché de Redis de Django que además ejecuta scripts Lua (atómicos en el servidor).
+"""
+
+import os
+from contextlib import contextmanager
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache as DjangoFileBasedCache
+from django.core.cache.backends.redis import RedisCache as DjangoRedisCache
+from django.core.files import locks
+
+
+class FileBasedCache(DjangoFileBasedCache):
+    """
+    Caché de archivos con operaciones atómicas entre procesos: Django implementa `add` como "consultar y luego
+    escribir", por lo que dos workers podían crear la misma clave a la vez. Aquí `add` y `update` hacen la
+    lectura y la escritura con un bloqueo exclusivo sobre un archivo del directorio del caché (`add.lock`, que no
+    cuenta como entrada porque no termina en `.djcache`). El bloqueo lo espera el sistema operativo, sin reintentos.
+    Lo usan los throttles para sus baldes (ver `api/throttling.py`).
+    """
+
+    lock_filename = "add.lock"
+
+    @contextmanager
+    def _locked(self):
+        self._createdir()
+        with open(os.path.join(self._dir, self.lock_filename), "ab") as lock:
+            locks.lock(lock, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(lock)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._locked():
+            return super().add(key, value, timeout, version)
+
+    def update(self, key, function, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Lee el valor de `key` (o `None`), guarda el primer elemento de `function(valor)` y devuelve el segundo,
+        sin que otro proceso pueda modificar la clave entremedio.
+        """
+        with self._locked():
+            value, result = function(self.get(key, version=version))
+            self.set(key, value, timeout, version)
+            return result
+
+
+class RedisCache(DjangoRedisCache):
+    """
+    Caché de Redis que expone `eval`: un script Lua se ejecuta de forma atómica en el servidor, en un único viaje
+    de ida y vuelta.
+    """
+
+    def eval(self, script, keys, args, version=None):
+        """
+        Ejecuta `script` con las claves del caché `keys` (ya con prefijo y versión) y los argumentos `args`.
+        """
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        client = self._cache.get_client(keys[0], write=True)
+        return client.eval(script, len(keys), *keys, *args)
@@ -0,0 +1,195 @@
+"""
+Compresión de las respuestas (brotli o gzip) negociada con `Accept-Encoding`
+
+`CompressionMiddleware` comprime las respuestas HTML y de la API (listas de `/api/tasks/`, `task_list.html`):
+
+- Solo los tipos de `COMPRESSION_CONTENT_TYPES`: las imágenes o archivos ya comprimidos no se benefician, y el
+  stream de eventos (`text/event-stream`) debe entregar cada evento en cuanto se publica.
+- Solo las respuestas de al menos `COMPRESSION_MIN_SIZE` bytes: por debajo de un paquete TCP el ahorro no
+  compensa el costo.
+- Elige brotli (paquete `brotli`, en requirements.txt) o gzip según las preferencias (`q`) del cliente.
+- Los niveles de `COMPRESSION_LEVELS` se limitan a `MAX_LEVELS`: los niveles altos cuestan varias veces más CPU
+  por solicitud y ahorran pocos bytes más (ver `python manage.py benchmark_compression`). Los archivos
+  estáticos ya se sirven precomprimidos con el nivel máximo (ver `_Project_TodoList/staticfiles.py`).
+- Las respuestas en streaming (`StreamingHttpResponse`, sincrónicas o asincrónicas) se comprimen por partes:
+  cada parte se envía comprimida en cuanto se genera, sin esperar a tener todo el cuerpo.
+
+Igual que `GZipMiddleware` de Django, las respuestas comprimidas llevan `Vary: Accept-Encoding` y su `ETag`
+pasa a ser débil (el cuerpo ya no es idéntico byte a byte). El token CSRF de las páginas se enmascara distinto
+en cada respuesta, lo que mitiga ataques de tipo BREACH.
+
+Clases:
+- CompressionMiddleware: Middleware de compresión.
+
+Funciones:
+- negotiate_encoding: Elige la codificación según `Accept-Encoding`.
+- compress: Comprime un contenido completo.
+- encoder: Crea un compresor incremental para las respuestas en streaming.
+"""
+
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # Sin brotli se usa gzip
+    brotli = None
+
+# Niveles máximos permitidos: por encima el costo de CPU crece mucho más que el ahorro
+MAX_LEVELS = {"br": 5, "gzip": 6}
+# Preferencia del servidor ante igual `q` del cliente
+PREFERENCE = ["br", "gzip"]
+
+strong_etag_re = _lazy_re_compile(r'^\s*"')
+
+
+def available_encodings():
+    return [encoding for encoding in PREFERENCE if encoding != "br" or brotli is not None]
+
+
+def level(encoding):
+    return min(settings.COMPRESSION_LEVELS[encoding], MAX_LEVELS[encoding])
+
+
+def negotiate_encoding(accept_encoding, encodings=None):
+    """
+    Devuelve la codificación a usar (`br`, `gzip`) según el encabezado `Accept-Encoding`, o `None`.
+    Respeta los valores `q` (`q=0` excluye) y el comodín `*`; ante igual `q` prefiere el orden de `PREFERENCE`.
+    """
+    encodings = available_encodings() if encodings is None else encodings
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, *params = (item.strip() for item in part.split(";"))
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name:
+            weights[name.lower()] = weight
+    candidates = [
+        (weights.get(encoding, weights.get("*", 0.0)), -index, encoding)
+        for index, encoding in enumerate(encodings)
+    ]
+    weight, _, encoding = max(candidates, default=(0.0, 0, None))
+    return encoding if weight > 0 else None
+
+
+def compress(content, encoding, compression_level=None):
+    """
+    Comprime un contenido completo con `encoding` (por defecto con el nivel configurado).
+    """
+    compression_level = level(encoding) if compression_level is None else compression_level
+    if encoding == "br":
+        return brotli.compress(content, quality=compression_level, mode=brotli.MODE_TEXT)
+    compressor = zlib.compressobj(compression_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # Formato gzip
+    return compressor.compress(content) + compressor.flush()
+
+
+class GzipEncoder:
+    def __init__(self, compression_level):
+        self._compressor = zlib.compressobj(compression_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data):
+        # `Z_SYNC_FLUSH` entrega todo lo recibido hasta ahora, sin cerrar el stream
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self, compression_level):
+        self._compressor = brotli.Compressor(quality=compression_level, mode=brotli.MODE_TEXT)
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def encoder(encoding, compression_level=None):
+    """
+    Devuelve un compresor incremental (`chunk(datos)` por parte y `finish()` al terminar).
+    """
+    compression_level = level(encoding) if compression_level is None else compression_level
+    return (BrotliEncoder if encoding == "br" else GzipEncoder)(compression_level)
+
+
+def compress_sequence(sequence, encoding):
+    stream = encoder(encoding)
+    for data in sequence:
+        compressed = stream.chunk(data)
+        if compressed:
+            yield compressed
+    yield stream.finish()
+
+
+async def compress_async_sequence(sequence, encoding):
+    stream = encoder(encoding)
+    async for data in sequence:
+        compressed = stream.chunk(data)
+        if compressed:
+            yield compressed
+    yield stream.finish()
+
+
+class CompressionMiddleware:
+    """
+    Comprime con brotli o gzip las respuestas de los tipos permitidos a partir de `COMPRESSION_MIN_SIZE` bytes.
+    Debe ubicarse antes que los middlewares que leen o modifican el contenido de la respuesta.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.content_types = set(settings.COMPRESSION_CONTENT_TYPES)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def is_compressible(self, response):
+        if response.has_header("Content-Encoding"):
+            return False
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type not in self.content_types:
+            return False
+        if response.streaming:
+            # Las respuestas en streaming con tamaño conocido (archivos) también respetan el mínimo
+            length = response.get("Content-Length")
+            return length is None or not length.isdigit() or int(length) >= settings.COMPRESSION_MIN_SIZE
+        return len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+    def process_response(self, request, response):
+        if not self.is_compressible(response):
+            return response
+        # La respuesta depende de `Accept-Encoding` aunque a este cliente se le envíe sin comprimir
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_sequence(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_sequence(response.streaming_content, encoding)
+            del response["Content-Length"]
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and strong_etag_re.match(etag):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
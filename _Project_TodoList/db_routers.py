@@ -0,0 +1,126 @@
+"""
+Enrutamiento de la base de datos: escrituras en la primaria, lecturas en las réplicas
+
+Las réplicas se configuran en `settings.DATABASE_REPLICA_ALIASES` (ver `DATABASE_REPLICAS` en settings).
+Sin réplicas configuradas el router envía todo a `default`, igual que antes.
+
+Lectura de las propias escrituras: la replicación tiene demora, por lo que después de escribir un usuario
+lee de la primaria durante `DATABASE_PRIMARY_STICKINESS` segundos:
+- Dentro de la misma solicitud: cualquier escritura fija las lecturas siguientes a `default`.
+- En las solicitudes siguientes: `ReadYourWritesMiddleware` recuerda la escritura en el caché (por usuario)
+  y en una cookie (para clientes anónimos o con varios usuarios en el mismo navegador). Los usuarios
+  autenticados por la API sin sesión se verifican al autenticarse (`pin_if_recent_write`).
+
+Clases:
+- PrimaryReplicaRouter: Router de Django (`DATABASE_ROUTERS`).
+- ReadYourWritesMiddleware: Fija a la primaria las lecturas de quien escribió recientemente.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+# Contexto de la solicitud en curso: si las lecturas deben ir a la primaria y si hubo escrituras
+_pinned = ContextVar("db_pinned_to_primary", default=False)
+_wrote = ContextVar("db_wrote", default=False)
+
+
+def pin_to_primary():
+    """
+    Envía a la primaria las lecturas que resten en el contexto actual (solicitud, tarea o comando).
+    """
+    _pinned.set(True)
+
+
+def pin_if_recent_write(user_id):
+    """
+    Fija el contexto actual a la primaria si el usuario escribió hace menos de `DATABASE_PRIMARY_STICKINESS` segundos.
+    """
+    if user_id is not None and replica_aliases() and pin_cache().get(pin_cache_key(user_id)):
+        pin_to_primary()
+
+
+def replica_aliases():
+    return list(getattr(settings, "DATABASE_REPLICA_ALIASES", []))
+
+
+def pin_cache_key(user_id):
+    return f"db_primary_pin:{user_id}"
+
+
+def pin_cache():
+    return caches[settings.DATABASE_PRIMARY_STICKINESS_CACHE_ALIAS]
+
+
+class PrimaryReplicaRouter:
+    """
+    Router que envía las escrituras a `default` y las lecturas a una réplica elegida al azar.
+
+    Las lecturas van a la primaria si el contexto está fijado (escritura reciente) o si el modelo pertenece
+    a `primary_only_apps` (las sesiones recién creadas deben poder leerse en la solicitud siguiente).
+    Las lecturas con `select_for_update()` se tratan como escrituras y también van a la primaria.
+    """
+
+    primary_only_apps = {"sessions"}
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or _pinned.get() or model._meta.app_label in self.primary_only_apps:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Todas las bases contienen los mismos datos: las relaciones entre ellas son válidas
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación, no por `migrate`
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware que fija a la primaria las lecturas de un usuario durante `DATABASE_PRIMARY_STICKINESS`
+    segundos después de una escritura. Debe ubicarse después de `AuthenticationMiddleware`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned_token = _pinned.set(self.recent_write_cookie(request))
+        wrote_token = _wrote.set(False)
+        try:
+            # Usuario de la sesión (sin consultar `auth_user`); la API lo verifica al autenticar
+            pin_if_recent_write(request.session.get(SESSION_KEY))
+            response = self.get_response(request)
+            if _wrote.get() and replica_aliases():
+                self.remember_write(request, response)
+            return response
+        finally:
+            _pinned.reset(pinned_token)
+            _wrote.reset(wrote_token)
+
+    def recent_write_cookie(self, request):
+        try:
+            return bool(replica_aliases()) and float(request.COOKIES.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def remember_write(self, request, response):
+        window = settings.DATABASE_PRIMARY_STICKINESS
+        user = getattr(request, "user", None)  # DRF también asigna aquí el usuario autenticado por la API
+        if user is not None and user.is_authenticated:
+            pin_cache().set(pin_cache_key(user.pk), True, timeout=window)
+        response.set_cookie(PRIMARY_PIN_COOKIE, str(time.time() + window), max_age=window, httponly=True, samesite="Lax")
@@ -32,32 +32,54 @@ INSTALLED_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
-    "django.contrib.staticfiles",
+    "_Project_TodoList.staticfiles.StaticFilesConfig",  # django.contrib.staticfiles sin la entrada de Tailwind
     
     # Aplicaciones de Terceros
     "crispy_forms",
     "crispy_tailwind",
     "rest_framework",
     "corsheaders",
-    "coreapi",
         
     # Mis Aplicaciones
     "app_homepage",
     "app_tasks",
     "app_users",
+    "api",
 ]
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "_Project_TodoList.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "_Project_TodoList.db_routers.ReadYourWritesMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Compresión de las respuestas HTML y de la API (ver _Project_TodoList/compression.py)
+COMPRESSION_MIN_SIZE = 1024  # Bytes; las respuestas más chicas se envían sin comprimir
+COMPRESSION_CONTENT_TYPES = [
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "application/coreapi+json",
+    "application/x-ndjson",
+    "application/vnd.tasks.columns+ndjson",  # Formatos compactos de /api/tasks/ (ver api/renderers.py)
+    "application/msgpack",
+    "application/xml",
+    "image/svg+xml",
+]
+# Niveles para contenido dinámico (gzip 1-9, brotli 0-11); se limitan a gzip 6 y brotli 5 por el costo de CPU
+COMPRESSION_LEVELS = {"br": 4, "gzip": 5}
+
 ROOT_URLCONF = "_Project_TodoList.urls"
 
 TEMPLATES = [
@@ -78,6 +100,14 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "_Project_TodoList.wsgi.application"
 
+# Precalentamiento de cada worker antes de atender solicitudes (ver _Project_TodoList/startup.py).
+# Se activa con STARTUP_WARMUP=1; `python manage.py profile_startup` muestra lo que cuesta cada paso.
+STARTUP_WARMUP = os.environ.get("STARTUP_WARMUP", "0") == "1"
+# Plantillas de terceros que también se compilan (las del proyecto se compilan todas)
+STARTUP_WARMUP_TEMPLATES = [
+    "rest_framework/api.html",  # API navegable de DRF
+]
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -89,6 +119,149 @@ DATABASES = {
     }
 }
 
+# Réplicas de solo lectura (ver _Project_TodoList/db_routers.py). DATABASE_REPLICAS recibe rutas de archivos
+# SQLite separadas por comas, por ejemplo "replica1.sqlite3,replica2.sqlite3"; para probar localmente la
+# "replicación" basta con copiar db.sqlite3 sobre cada archivo. En las pruebas las réplicas apuntan a `default`.
+DATABASE_REPLICAS = [path for path in os.environ.get("DATABASE_REPLICAS", "").split(",") if path.strip()]
+for index, path in enumerate(DATABASE_REPLICAS, start=1):
+    DATABASES[f"replica_{index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / path.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_REPLICA_ALIASES = [alias for alias in DATABASES if alias.startswith("replica_")]
+
+# Shards de tareas por usuario (ver app_tasks/sharding.py). TASKS_SHARDS recibe rutas de archivos SQLite separadas
+# por comas, por ejemplo "tasks1.sqlite3,tasks2.sqlite3". Cada shard se crea con `migrate --database tasks_shard_N`
+# y las tareas existentes se reparten con `manage.py rebalance_task_shards --all --from default`.
+TASKS_SHARDS = [path for path in os.environ.get("TASKS_SHARDS", "").split(",") if path.strip()]
+for index, path in enumerate(TASKS_SHARDS, start=1):
+    DATABASES[f"tasks_shard_{index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / path.strip(),
+    }
+TASKS_SHARD_ALIASES = [alias for alias in DATABASES if alias.startswith("tasks_shard_")]
+TASKS_SHARD_ID_BLOCK_SIZE = 1000  # `id` de tareas reservados por proceso en cada escritura a `default`
+
+DATABASE_ROUTERS = [
+    "app_tasks.sharding.TaskShardRouter",
+    "_Project_TodoList.db_routers.PrimaryReplicaRouter",
+]
+
+# Segundos durante los que un usuario lee de la primaria después de escribir (lectura de las propias escrituras)
+DATABASE_PRIMARY_STICKINESS = int(os.environ.get("DATABASE_PRIMARY_STICKINESS", 5))
+DATABASE_PRIMARY_STICKINESS_CACHE_ALIAS = "default"
+
+# Stream de cambios de tareas por Server-Sent Events (`/api/tasks/stream/`, ver app_tasks/events.py).
+# Requiere un servidor ASGI (por ejemplo `uvicorn _Project_TodoList.asgi:application`).
+# TASK_EVENTS_BROKER="redis" reparte los eventos entre varios workers (TASK_EVENTS_REDIS_URL con la URL del servidor).
+TASK_EVENTS_BROKER = {
+    "memory": "app_tasks.events.InProcessBroker",
+    "redis": "app_tasks.events.RedisBroker",
+}[os.environ.get("TASK_EVENTS_BROKER", "memory")]
+TASK_EVENTS_REDIS_URL = os.environ.get("TASK_EVENTS_REDIS_URL", "redis://127.0.0.1:6379/1")
+TASK_EVENTS_HEARTBEAT = 15  # Segundos sin eventos antes de enviar un comentario para mantener viva la conexión
+TASK_EVENTS_BUFFER = 100  # Eventos pendientes por conexión; si se llena, se desconecta al cliente lento
+TASK_EVENTS_HISTORY = 200  # Eventos recientes por usuario disponibles para reanudar con `Last-Event-ID`
+# Segundos que se conserva el historial de un usuario después de cerrarse su última conexión (plazo para reconectarse).
+# Solo tienen historial los usuarios con conexiones en el proceso: los workers sin conexiones no guardan eventos.
+TASK_EVENTS_HISTORY_TTL = 5 * 60
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "default",
+    },
+    # Fragmentos HTML de las filas de la tabla de tareas, acotados en cantidad de entradas
+    "task_rows": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "task-rows",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {
+            "MAX_ENTRIES": 5000,
+        },
+    },
+}
+
+# Caché de resultados de consultas de tareas. Backend configurable con TASKS_QUERY_CACHE_BACKEND:
+# - "locmem": memoria del proceso (por defecto, ideal para desarrollo y un único worker).
+# - "file": archivos en disco, compartido entre procesos de la misma máquina.
+# - "redis": caché de red compartido entre máquinas (TASKS_QUERY_CACHE_LOCATION con la URL del servidor).
+TASKS_QUERY_CACHE_BACKEND = os.environ.get("TASKS_QUERY_CACHE_BACKEND", "locmem")
+TASKS_QUERY_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "task-queries",
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("TASKS_QUERY_CACHE_LOCATION", os.path.join(BASE_DIR, ".cache", "task_queries")),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",  # El límite de memoria lo define `maxmemory` en Redis
+        "LOCATION": os.environ.get("TASKS_QUERY_CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+    },
+}
+CACHES["task_queries"] = {
+    **TASKS_QUERY_CACHE_BACKENDS[TASKS_QUERY_CACHE_BACKEND],
+    "TIMEOUT": 5 * 60,
+}
+TASKS_QUERY_CACHE_MAX_ROWS = 500  # Las consultas con más filas no se cachean
+
+# Baldes de los throttles (ver api/throttling.py). Deben compartirse entre todos los workers, si no cada
+# proceso tiene su propia cuota. Backend configurable con THROTTLE_CACHE_BACKEND:
+# - "file": archivos en disco, compartido entre procesos de la misma máquina (por defecto).
+# - "redis": compartido entre máquinas (THROTTLE_CACHE_LOCATION con la URL del servidor).
+THROTTLE_CACHE_BACKEND = os.environ.get("THROTTLE_CACHE_BACKEND", "file")
+THROTTLE_CACHE_BACKENDS = {
+    "file": {
+        "BACKEND": "_Project_TodoList.cache_backends.FileBasedCache",  # `update` atómico entre procesos
+        "LOCATION": os.environ.get("THROTTLE_CACHE_LOCATION", os.path.join(BASE_DIR, ".cache", "throttle")),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "redis": {
+        "BACKEND": "_Project_TodoList.cache_backends.RedisCache",  # Baldes con un script Lua atómico
+        "LOCATION": os.environ.get("THROTTLE_CACHE_LOCATION", "redis://127.0.0.1:6379/2"),
+    },
+}
+CACHES["throttle"] = THROTTLE_CACHE_BACKENDS[THROTTLE_CACHE_BACKEND]
+
+# Cantidad máxima de ids por solicitud en /api/tasks/batch/ (se resuelven con una única consulta)
+TASKS_BATCH_MAX_IDS = 100
+# Cantidad máxima de tareas por alta en lote en POST /api/tasks/ (cuerpo con una lista, por ejemplo NDJSON)
+TASKS_BULK_CREATE_MAX_ITEMS = 500
+
+
+# Sesiones y usuario autenticado
+# https://docs.djangoproject.com/en/5.1/topics/http/sessions/#using-cached-sessions
+
+# Motor de sesiones configurable con SESSION_BACKEND:
+# - "cached_db": lee del caché y persiste en la base de datos (por defecto, sobrevive a reinicios).
+# - "cache": solo caché, sin escrituras en `django_session` (requiere un caché compartido entre workers).
+# - "db": el motor por defecto de Django.
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "cached_db")
+SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_BACKEND}"
+SESSION_CACHE_ALIAS = "default"
+
+# `CachedModelBackend` evita la consulta a `auth_user` en cada solicitud autenticada
+AUTHENTICATION_BACKENDS = ["app_users.backends.CachedModelBackend"]
+AUTH_USER_CACHE_ALIAS = "default"
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+
+# Intervalo mínimo (segundos) entre escrituras de `last_login` para un mismo usuario
+LAST_LOGIN_UPDATE_INTERVAL = 60 * 60
+
+# Pool de procesos para calcular hashes de contraseñas (ver app_users/hashing.py).
+# Con PASSWORD_HASHING_WORKERS=0 el hash se calcula en el proceso del request.
+PASSWORD_HASHING_WORKERS = int(os.environ.get("PASSWORD_HASHING_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASHING_MAX_PENDING = int(os.environ.get("PASSWORD_HASHING_MAX_PENDING", PASSWORD_HASHING_WORKERS * 4))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -124,7 +297,26 @@ USE_TZ = True
 
 STATIC_URL = '/static/' # Define una ruta para los archivos estáticos
 STATIC_ROOT = os.path.join(BASE_DIR, 'static') # Ruta donde Django recopilará todos los archivos estáticos cuando ejecutes collectstatic
-STATICFILES_DIRS = []# Directorios adicionales que contienen archivos estáticos personalizados
+STATICFILES_DIRS = [BASE_DIR / "assets"]  # Directorios adicionales que contienen archivos estáticos personalizados
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    # collectstatic agrega un hash del contenido a cada nombre y genera las variantes .gz/.br (ver _Project_TodoList/staticfiles.py)
+    "staticfiles": {"BACKEND": "_Project_TodoList.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+# Archivos estáticos con hash en el nombre: se cachean por un año sin revalidar
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Hoja de estilos generada con `python manage.py build_css` (CLI standalone de Tailwind v4) a partir de las clases
+# usadas en las plantillas. El resultado se guarda en el repositorio; el CLI solo hace falta para regenerarlo.
+TAILWIND_CLI = os.environ.get("TAILWIND_CLI", "tailwindcss")
+TAILWIND_INPUT = BASE_DIR / "assets" / "css" / "tailwind.css"
+TAILWIND_CONTENT = [
+    "templates/**/*.html",
+    "app_*/templates/**/*.html",
+]
+TAILWIND_CONTENT_PACKAGES = ["crispy_tailwind"]  # Plantillas de los formularios (`{{ form|crispy }}`)
+TAILWIND_OUTPUT = BASE_DIR / "assets" / "css" / "app.css"
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -138,6 +330,11 @@ LOGOUT_REDIRECT_URL = "login"
 # Redirigir al usuario a la siguiente URL si intenta acceder a una vista que requiere autenticación
 LOGIN_URL = "/app_users/login/"
 
+# Días desde la última actualización tras los cuales una tarea finalizada se archiva (manage.py archive_tasks)
+TASKS_ARCHIVE_AFTER_DAYS = 90
+# Días que se conservan las tareas archivadas antes de eliminarlas (manage.py purge_tasks)
+TASKS_RETENTION_DAYS = 365
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "tailwind"
 CRISPY_TEMPLATE_PACK = "tailwind"
 
@@ -165,8 +362,21 @@ REST_FRAMEWORK = {
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "rest_framework.schemas.coreapi.AutoSchema", # Genera la Documentación de la API automáticamente
+    # Cuotas de los endpoints que calculan hashes de contraseñas (ver api/throttling.py)
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "20/min",
+        "login_username": "5/min",
+        "register_ip": "10/hour",
+        "basic_auth": "120/min",
+        "basic_auth_ip": "240/min",
+    },
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),  # Proxies de confianza delante de Django (IP del cliente)
+    "EXCEPTION_HANDLER": "api.exceptions.exception_handler",
 }
 
+# Esquema precalculado que sirve /api/docs/; se regenera con `python manage.py generate_api_schema` (ver api/schema.py)
+API_SCHEMA_FILE = BASE_DIR / "api" / "schema.json"
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
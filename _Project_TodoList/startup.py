@@ -0,0 +1,206 @@
+"""
+Arranque de los workers: perfil de importaciones y precalentamiento
+
+Un worker recién iniciado atiende su primera solicitud mucho más lento que las siguientes: recién entonces
+importa el URLconf (y con él DRF y coreapi), compila las plantillas en el loader con caché, carga las
+traducciones y los renderers de DRF y abre la conexión a la base de datos.
+
+Con `STARTUP_WARMUP` activado, `wsgi.py` y `asgi.py` ejecutan `warm_up()` al cargar la aplicación, antes de
+que el servidor entregue solicitudes al worker. El precalentamiento debe correr en cada worker (por ejemplo
+gunicorn sin `--preload`): las conexiones a la base de datos no se pueden compartir entre procesos.
+
+`python manage.py profile_startup` muestra el tiempo de importación de cada aplicación de `INSTALLED_APPS`,
+los módulos más costosos y la duración de cada paso del precalentamiento.
+
+Funciones:
+- warm_up: Precalienta el worker (rutas, plantillas, traducciones, DRF y conexiones a la base de datos).
+- profile_imports: Mide en un proceso nuevo el tiempo de importación de cada módulo.
+- app_import_times: Agrupa esos tiempos por aplicación de `INSTALLED_APPS`.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from importlib import import_module
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth import get_backends
+from django.db import connections
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.urls import Resolver404, get_resolver
+from django.utils import translation
+from django.utils.formats import get_format
+
+logger = logging.getLogger("django")
+
+ImportTiming = namedtuple("ImportTiming", ["module", "own_ms", "cumulative_ms", "parent"])
+
+# Código que ejecuta el proceso perfilado: el arranque de un worker hasta tener el URLconf cargado
+PROFILED_STARTUP = "import django; django.setup(); from django.urls import get_resolver; get_resolver().url_patterns"
+
+
+def warm_up_urls():
+    """
+    Importa el URLconf completo (con sus `include()` y vistas) y compila las expresiones de todas las rutas.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict  # Recorre todos los `include()` anidados
+    try:
+        resolver.resolve("/__warmup__/")  # Una ruta inexistente se compara contra todos los patrones
+    except Resolver404:
+        pass
+    return len(resolver.reverse_dict)
+
+
+def project_templates(engine):
+    """
+    Devuelve los nombres de las plantillas del proyecto (las carpetas de plantillas dentro de `BASE_DIR`).
+    """
+    base_dir = Path(settings.BASE_DIR).resolve()
+    names = set()
+    for directory in map(Path, engine.template_dirs):
+        if directory.is_dir() and directory.resolve().is_relative_to(base_dir):
+            names.update(path.relative_to(directory).as_posix() for path in directory.rglob("*.html"))
+    return sorted(names)
+
+
+def warm_up_templates():
+    """
+    Compila en el loader con caché las plantillas del proyecto y las de `STARTUP_WARMUP_TEMPLATES`.
+    """
+    compiled = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in project_templates(engine) + list(settings.STARTUP_WARMUP_TEMPLATES):
+            engine.get_template(name)
+            compiled += 1
+    return compiled
+
+
+def warm_up_translations():
+    """
+    Carga el catálogo de traducciones y los formatos locales del idioma por defecto (fechas en las plantillas).
+    """
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("Home")
+        formats = [get_format(name) for name in ("DATE_FORMAT", "DATETIME_FORMAT", "SHORT_DATE_FORMAT")]
+    return len(formats)
+
+
+def warm_up_rest_framework():
+    """
+    Importa e instancia los renderers, parsers y demás clases por defecto de DRF, el motor de sesiones y los
+    backends de autenticación, que se cargan con la primera solicitud que los usa.
+    """
+    from rest_framework.settings import api_settings
+
+    classes = [
+        *api_settings.DEFAULT_RENDERER_CLASSES,
+        *api_settings.DEFAULT_PARSER_CLASSES,
+        *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+        *api_settings.DEFAULT_PERMISSION_CLASSES,
+        *api_settings.DEFAULT_THROTTLE_CLASSES,
+        api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS,
+    ]
+    for cls in classes:
+        cls()
+    api_settings.EXCEPTION_HANDLER
+    import_module(settings.SESSION_ENGINE)
+    get_backends()
+    return len(classes)
+
+
+def warm_up_databases():
+    """
+    Abre la conexión de este hilo a cada base configurada (primaria, réplicas y shards). Además de verificar la
+    configuración antes de recibir tráfico, la conexión se reutiliza en la primera solicitud si `CONN_MAX_AGE`
+    es mayor a 0 (con 0, Django abre una conexión nueva en cada solicitud).
+    """
+    for alias in connections:
+        connections[alias].ensure_connection()
+    return len(connections.all())
+
+
+WARMUP_STEPS = [
+    ("rutas", warm_up_urls),
+    ("plantillas", warm_up_templates),
+    ("traducciones", warm_up_translations),
+    ("drf", warm_up_rest_framework),
+    ("bases de datos", warm_up_databases),
+]
+
+
+def warm_up():
+    """
+    Ejecuta los pasos de precalentamiento y devuelve `[(paso, cantidad, milisegundos)]`.
+    """
+    results = []
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        count = step()
+        elapsed = (time.perf_counter() - started) * 1000
+        results.append((name, count, elapsed))
+        logger.info(f"Precalentamiento: {name} ({count}) en {elapsed:.1f} ms")
+    return results
+
+
+def profile_imports(code=PROFILED_STARTUP):
+    """
+    Ejecuta `code` en un intérprete nuevo con `-X importtime` y devuelve `[ImportTiming]` en el orden de
+    Python (cada módulo aparece después de los que importó).
+    """
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "_Project_TodoList.settings")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(own) / 1000, int(cumulative) / 1000))
+
+    # Cada módulo se imprime después de sus hijos: el padre es el siguiente módulo con menor profundidad
+    timings, stack = [], []
+    for depth, name, own, cumulative in reversed(rows):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        parent = stack[-1][1] if stack else None
+        stack.append((depth, name))
+        timings.append(ImportTiming(name, own, cumulative, parent))
+    timings.reverse()
+    return timings
+
+
+def app_import_times(timings, app_names):
+    """
+    Devuelve `{aplicación: milisegundos}` con el tiempo de importación de los módulos de cada aplicación,
+    incluidos los que importaron por primera vez. Los tiempos se solapan: si `api` importó DRF antes que nadie,
+    ese tiempo cuenta para `api` y también para `rest_framework`.
+    """
+    parents = {timing.module: timing.parent for timing in timings}
+
+    def app_of(module):
+        return next((app for app in app_names if module == app or module.startswith(app + ".")), None)
+
+    def imported_by_same_app(module, app):
+        parent = parents.get(module)
+        while parent is not None:
+            if app_of(parent) == app:
+                return True
+            parent = parents.get(parent)
+        return False
+
+    totals = dict.fromkeys(app_names, 0.0)
+    for timing in timings:
+        app = app_of(timing.module)
+        if app is not None and not imported_by_same_app(timing.module, app):
+            totals[app] += timing.cumulative_ms
+    return totals
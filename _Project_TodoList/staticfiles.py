@@ -0,0 +1,164 @@
+"""
+Archivos estáticos con hash en el nombre, precomprimidos y con caché de larga duración
+
+`collectstatic` copia los archivos a `STATIC_ROOT` con un hash de su contenido en el nombre
+(`css/app.3f2a9c1b04d7.css`, ver `ManifestStaticFilesStorage`) y, para los archivos de texto, guarda además las
+variantes `.gz` y `.br` (brotli, con el paquete `brotli` de requirements.txt). `{% static %}` devuelve el nombre con
+hash, de modo que cada cambio produce una URL nueva y el navegador puede cachear el archivo por un año sin
+revalidarlo.
+
+`serve_static` sirve `STATIC_URL` desde `STATIC_ROOT`: elige la variante comprimida según `Accept-Encoding`
+(sin comprimir nada en cada solicitud) y envía `Cache-Control: immutable` para los nombres con hash. En
+desarrollo (`DEBUG`), los archivos que no están en `STATIC_ROOT` se buscan con los finders de Django, sin
+caché, para no tener que ejecutar `collectstatic` tras cada cambio.
+
+Clases:
+- StaticFilesConfig: Configuración de `django.contrib.staticfiles` que no publica la entrada de Tailwind.
+- CompressedManifestStaticFilesStorage: Storage de `collectstatic` que además genera las variantes comprimidas.
+
+Funciones:
+- serve_static: Vista que sirve los archivos estáticos con sus variantes y cabeceras de caché.
+"""
+
+import gzip
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.apps import StaticFilesConfig as DjangoStaticFilesConfig
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from .compression import negotiate_encoding
+
+try:
+    import brotli
+except ImportError:  # Sin brotli solo se generan las variantes gzip
+    brotli = None
+
+# Tipos de archivo que se comprimen (las imágenes y fuentes ya vienen comprimidas)
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".map", ".svg", ".json", ".txt", ".html", ".xml", ".ico", ".ttf", ".eot", ".otf"}
+# No vale la pena comprimir archivos más chicos que un paquete TCP
+COMPRESS_MIN_SIZE = 1024
+# Codificaciones en orden de preferencia: (codificación, extensión)
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+# Nombres generados por ManifestStaticFilesStorage: `nombre.<12 hex>.ext`
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+
+class StaticFilesConfig(DjangoStaticFilesConfig):
+    """
+    `django.contrib.staticfiles` sin la entrada del CLI de Tailwind (`css/tailwind.css`): solo sirve para
+    `build_css`, y su `@import "tailwindcss"` no es un archivo que `ManifestStaticFilesStorage` pueda resolver.
+    """
+
+    ignore_patterns = [*DjangoStaticFilesConfig.ignore_patterns, "css/tailwind.css"]
+
+
+def compress(content):
+    """
+    Devuelve `{extensión: contenido comprimido}` con las variantes que resultan más chicas que el original.
+    """
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}  # mtime=0: misma salida en cada build
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    return {extension: data for extension, data in variants.items() if len(data) < len(content)}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    `ManifestStaticFilesStorage` que además guarda las variantes `.gz` y `.br` de los archivos de texto.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for hashed_name in self.hashed_files.values():
+            if Path(hashed_name).suffix.lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            with self.open(hashed_name) as file:
+                content = file.read()
+            if len(content) < COMPRESS_MIN_SIZE:
+                continue
+            for extension, data in compress(content).items():
+                if self.exists(hashed_name + extension):
+                    self.delete(hashed_name + extension)
+                self._save(hashed_name + extension, ContentFile(data))
+
+    def stored_name(self, name):
+        # Sin `collectstatic` (desarrollo y tests) no hay manifiesto: se usa el nombre original. Con manifiesto,
+        # un archivo que no figura en él sigue siendo un error.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+
+def find_static(path):
+    """
+    Devuelve la ruta absoluta del archivo en `STATIC_ROOT` o, en desarrollo, la de los finders.
+    """
+    try:
+        candidate = Path(safe_join(settings.STATIC_ROOT, path))
+    except Exception:  # Rutas que salen de STATIC_ROOT
+        raise Http404("Archivo no encontrado.")
+    if candidate.is_file():
+        return candidate
+    if settings.DEBUG:
+        found = finders.find(path)
+        if found:
+            return Path(found)
+    raise Http404("Archivo no encontrado.")
+
+
+def patch_static_headers(response, file_path, compressible):
+    """
+    Cabeceras comunes a las respuestas completas y a las 304: `Vary` (la respuesta depende de
+    `Accept-Encoding`, también cuando no se modificó) y `Cache-Control`.
+    """
+    if compressible:
+        patch_vary_headers(response, ["Accept-Encoding"])
+    if HASHED_NAME.search(file_path.name):
+        response.headers["Cache-Control"] = f"public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def serve_static(request, path):
+    """
+    Sirve un archivo estático con su variante precomprimida (si el cliente la acepta) y con caché de un año
+    para los nombres con hash, o con revalidación (`Last-Modified`) para los demás.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    file_path = find_static(path)
+    content_type, _ = mimetypes.guess_type(str(file_path))
+    stat = file_path.stat()
+    compressible = file_path.suffix.lower() in COMPRESSIBLE_EXTENSIONS
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+    if if_modified_since is not None and int(stat.st_mtime) <= if_modified_since:
+        return patch_static_headers(HttpResponseNotModified(), file_path, compressible)
+
+    served, encoding = file_path, None
+    if compressible:
+        variants = {
+            name: file_path.with_name(file_path.name + extension)
+            for name, extension in ENCODINGS
+            if file_path.with_name(file_path.name + extension).is_file()
+        }
+        # Misma negociación que las respuestas dinámicas: respeta los valores `q` (`br;q=0.0` excluye)
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding", ""), list(variants))
+        if encoding:
+            served = variants[encoding]
+
+    response = FileResponse(served.open("rb"), content_type=content_type or "application/octet-stream")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Last-Modified"] = http_date(stat.st_mtime)
+    return patch_static_headers(response, file_path, compressible)
@@ -9,15 +9,15 @@ Este archivo define las rutas principales del proyecto Django, incluyendo las ap
 - API: Proporciona endpoints RESTful mediante Django Rest Framework (DRF).
 - Django Admin: Consola de administración estándar de Django.
 
-Se define el uso de archivos estáticos utilizando las configuraciones de Django.
+Los archivos estáticos se sirven con sus variantes precomprimidas y caché de larga duración (ver _Project_TodoList/staticfiles.py).
 
 """
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.views.generic import RedirectView
 from django.conf import settings
-from django.conf.urls.static import static
+from _Project_TodoList.staticfiles import serve_static
 
 urlpatterns = [
     # Ruta para la página principal (home) de la aplicación.
@@ -34,4 +34,7 @@ urlpatterns = [
 
     # Rutas para la API RESTful, proporcionadas por Django Rest Framework.
     path("", include("api.urls")),
-] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+
+    # Archivos estáticos (también sin DEBUG): nombres con hash, variantes .gz/.br y caché de un año.
+    re_path(rf"^{settings.STATIC_URL.lstrip('/')}(?P<path>.+)$", serve_static, name="static"),
+]
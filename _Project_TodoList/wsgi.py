@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "_Project_TodoList.settings")
 
 application = get_wsgi_application()
+
+if settings.STARTUP_WARMUP:
+    from _Project_TodoList.startup import warm_up
+
+    warm_up()  # Antes de que el servidor entregue solicitudes a este worker
@@ -0,0 +1,50 @@
+"""
+Manejo de excepciones de la API RESTful
+
+Extiende el manejador de excepciones de DRF para traducir las excepciones propias del proyecto en respuestas HTTP.
+
+Clases:
+- PreconditionFailed: 412, la versión indicada en `If-Match` no es la actual (la respuesta incluye la `ETag` actual).
+- EditConflict: 409, la tarea cambió durante la solicitud (sin `If-Match`).
+
+Funciones:
+- exception_handler: Responde 503 (con `Retry-After`) cuando el pool de hashing de contraseñas está lleno.
+"""
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from rest_framework.views import exception_handler as drf_exception_handler
+from app_users.hashing import PasswordHashingBusy
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "La tarea fue modificada por otra solicitud: vuelva a leerla y reintente con su ETag actual."
+    default_code = "precondition_failed"
+
+    def __init__(self, etag=None, detail=None):
+        super().__init__(detail)
+        self.etag = etag
+
+
+class EditConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "La tarea fue modificada mientras se procesaba la solicitud: vuelva a intentarlo."
+    default_code = "conflict"
+
+
+def exception_handler(exc, context):
+    """
+    Manejador de excepciones configurado en `REST_FRAMEWORK["EXCEPTION_HANDLER"]`.
+    """
+    if isinstance(exc, PasswordHashingBusy):
+        return Response(
+            {"detail": "Servicio de autenticación saturado, reintente en unos segundos."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+    response = drf_exception_handler(exc, context)
+    if isinstance(exc, PreconditionFailed) and exc.etag:
+        response["ETag"] = exc.etag
+    return response
@@ -0,0 +1,71 @@
+"""
+Comando de medición de los formatos de la API de tareas (JSON, NDJSON en columnas y MessagePack)
+
+Uso:
+    python manage.py benchmark_wire_formats
+    python manage.py benchmark_wire_formats --tasks 100 1000 10000 --repeat 20
+
+Serializa tareas en memoria con `TasksSerializer` (igual que `/api/tasks/`) y, para cada formato, informa el
+tamaño (sin comprimir y con gzip al nivel configurado) y el tiempo de codificación con el renderer de DRF y
+de decodificación con el parser, como lo haría un cliente. No usa ni modifica la base de datos. MessagePack
+solo se mide si está instalado el paquete `msgpack`. Ver `api/renderers.py`.
+"""
+
+import random
+import time
+from io import BytesIO
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from _Project_TodoList import compression
+from api.renderers import (
+    ColumnarNDJSONParser, ColumnarNDJSONRenderer, MessagePackParser, MessagePackRenderer, msgpack,
+)
+from api.serializers import TasksSerializer
+from app_tasks.management.commands.benchmark_compression import make_tasks
+
+FORMATS = {
+    "JSON": (JSONRenderer, JSONParser),
+    "NDJSON columnas": (ColumnarNDJSONRenderer, ColumnarNDJSONParser),
+    "MessagePack": (MessagePackRenderer, MessagePackParser),
+}
+
+
+class Command(BaseCommand):
+    help = "Compara tamaño y tiempo de codificación/decodificación de los formatos de /api/tasks/."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 10000], help="Tareas por respuesta.")
+        parser.add_argument("--repeat", type=int, default=10, help="Repeticiones de cada medición (se informa la mejor).")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla del generador de datos.")
+
+    def handle(self, *args, **options):
+        formats = dict(FORMATS)
+        if msgpack is None:
+            del formats["MessagePack"]
+            self.stdout.write(self.style.WARNING("msgpack no está instalado: no se mide MessagePack."))
+
+        rng = random.Random(options["seed"])
+        for count in options["tasks"]:
+            data = TasksSerializer(make_tasks(rng, count), many=True).data
+            self.stdout.write(f"\n{count} tareas:")
+            baseline = None
+            for label, (renderer_class, parser_class) in formats.items():
+                content, encode_ms = self.best(options["repeat"], lambda: renderer_class().render(data))
+                _, decode_ms = self.best(options["repeat"], lambda: parser_class().parse(BytesIO(content)))
+                compressed = len(compression.compress(content, "gzip"))
+                baseline = baseline or (len(content), encode_ms, decode_ms)
+                self.stdout.write(
+                    f"  {label:<16} {len(content) / 1024:9.1f} KiB ({len(content) / baseline[0]:4.0%})  "
+                    f"gzip {compressed / 1024:8.1f} KiB  "
+                    f"codificar {encode_ms:8.2f} ms ({encode_ms / baseline[1]:4.0%})  "
+                    f"decodificar {decode_ms:8.2f} ms ({decode_ms / baseline[2]:4.0%})"
+                )
+
+    def best(self, repeat, function):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return result, min(timings)
@@ -0,0 +1,33 @@
+"""
+Comando de generación del esquema de la API
+
+Uso:
+    python manage.py generate_api_schema            # Escribe API_SCHEMA_FILE
+    python manage.py generate_api_schema --check    # Falla si el archivo no coincide con las rutas actuales (CI)
+    python manage.py generate_api_schema --output /tmp/schema.json
+
+Se debe ejecutar después de cambiar las rutas, ViewSets o serializers de la API. Ver `api/schema.py`.
+"""
+
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from api.schema import encode_schema, generate_schema, schema_file
+
+
+class Command(BaseCommand):
+    help = "Genera el esquema de la API que sirve /api/docs/ y lo guarda en API_SCHEMA_FILE."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Archivo de destino (por defecto API_SCHEMA_FILE).")
+        parser.add_argument("--check", action="store_true", help="Solo verifica que el archivo esté actualizado.")
+
+    def handle(self, *args, **options):
+        output = Path(options["output"]) if options["output"] else schema_file()
+        content = encode_schema(generate_schema())
+        if options["check"]:
+            if not output.exists() or output.read_bytes() != content:
+                raise CommandError(f"{output} está desactualizado. Ejecute `python manage.py generate_api_schema`.")
+            self.stdout.write(self.style.SUCCESS(f"{output} está actualizado."))
+            return
+        output.write_bytes(content)
+        self.stdout.write(self.style.SUCCESS(f"Esquema de la API guardado en {output} ({len(content)} bytes)."))
@@ -0,0 +1,128 @@
+"""
+Formatos compactos para la API de tareas (renderers y parsers de DRF)
+
+Para los clientes que leen o escriben muchas tareas, `/api/tasks/` negocia además de JSON:
+
+- NDJSON en columnas (`application/vnd.tasks.columns+ndjson`, `?format=ndjson`): la primera línea es la lista
+  de nombres de campo y cada línea siguiente la lista de valores de un elemento, en el mismo orden. Los nombres
+  no se repiten en cada elemento y cada línea se puede procesar a medida que llega. Los campos que faltan en un
+  elemento se envían como `null`.
+- MessagePack (`application/msgpack`, `?format=msgpack`): JSON binario, más chico y rápido de decodificar.
+  Requiere el paquete `msgpack` (incluido en requirements.txt); sin él, el formato no se ofrece.
+
+Los parsers aceptan los mismos formatos en el cuerpo de las solicitudes (alta y cambio de estado masivo). En
+NDJSON, un cuerpo con una sola fila se entrega como objeto y uno con varias como lista de objetos: `POST
+/api/tasks/` con varias filas crea todas las tareas en una transacción (ver `TaskViewSet.create`).
+`python manage.py benchmark_wire_formats` compara el tamaño y el tiempo de codificación de cada formato.
+
+Clases:
+- ColumnarNDJSONRenderer / ColumnarNDJSONParser: NDJSON en columnas.
+- MessagePackRenderer / MessagePackParser: MessagePack.
+
+Funciones:
+- encode_columns / decode_columns: Conversión entre objetos y NDJSON en columnas.
+"""
+
+import json
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils import encoders
+
+try:
+    import msgpack
+except ImportError:  # Sin msgpack la API no ofrece el formato MessagePack
+    msgpack = None
+
+
+def lines(values):
+    # Un único encoder para todas las líneas (`json.dumps` crea uno por llamada)
+    encode = encoders.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    return "".join(encode(value) + "\n" for value in values).encode()
+
+
+def encode_columns(data):
+    """
+    Devuelve `data` (un objeto o una lista de objetos) en NDJSON en columnas.
+    """
+    items = [data] if isinstance(data, dict) else list(data)
+    if not all(isinstance(item, dict) for item in items):
+        # Sin objetos no hay columnas (no ocurre en las respuestas de tareas): un valor por línea
+        return lines(items)
+    columns = list(dict.fromkeys(key for item in items for key in item))
+    return lines([columns, *([item.get(column) for column in columns] for item in items)])
+
+
+def decode_columns(content):
+    """
+    Devuelve la lista de objetos de un contenido en NDJSON en columnas. Lanza `ValueError` si es inválido.
+    """
+    rows = [line for line in content.splitlines() if line.strip()]
+    if not rows:
+        return []
+    # Una sola decodificación para todas las líneas, más rápida que una por línea
+    columns, *rows = json.loads("[" + ",".join(rows) + "]")
+    if not isinstance(columns, list) or not all(isinstance(column, str) for column in columns):
+        raise ValueError("La primera línea debe ser la lista de nombres de campo.")
+    for number, values in enumerate(rows, start=2):
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(f"La línea {number} debe ser una lista de {len(columns)} valores.")
+    return [dict(zip(columns, values)) for values in rows]
+
+
+class ColumnarNDJSONRenderer(BaseRenderer):
+    media_type = "application/vnd.tasks.columns+ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return encode_columns(data)
+
+
+class ColumnarNDJSONParser(BaseParser):
+    media_type = "application/vnd.tasks.columns+ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            items = decode_columns(stream.read().decode(encoding))
+        except ValueError as exc:
+            raise ParseError(f"NDJSON inválido: {exc}")
+        return items[0] if len(items) == 1 else items
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        # Fechas, decimales y UUID se envían como texto, igual que en JSON
+        return msgpack.packb(data, use_bin_type=True, default=encoders.JSONEncoder().default)
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f"MessagePack inválido: {exc}")
+
+
+def compact_renderers():
+    """
+    Renderers de los formatos compactos disponibles (MessagePack solo si está instalado `msgpack`).
+    """
+    return [ColumnarNDJSONRenderer, *([MessagePackRenderer] if msgpack is not None else [])]
+
+
+def compact_parsers():
+    return [ColumnarNDJSONParser, *([MessagePackParser] if msgpack is not None else [])]
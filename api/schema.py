@@ -0,0 +1,137 @@
+"""
+Esquema precalculado de la API para la documentación (`/api/docs/`)
+
+DRF genera el esquema (coreapi) recorriendo todas las rutas e inspeccionando cada ViewSet, y lo hacía en cada
+solicitud a la documentación. Ahora el esquema se genera una vez con `python manage.py generate_api_schema`,
+se guarda en `API_SCHEMA_FILE` y cada proceso lo lee una sola vez y lo sirve desde memoria. Si el archivo no
+existe, se genera con la primera solicitud y también se conserva en memoria.
+
+Las vistas de la documentación se crean recién con la primera solicitud: `coreapi` (que importa `requests` y
+`pkg_resources`) y los renderers de documentación de DRF no se importan al iniciar el worker.
+
+Clases:
+- PrecomputedSchemaGenerator: Generador de DRF que devuelve el esquema guardado.
+
+Funciones:
+- generate_schema / encode_schema: Genera el esquema y lo serializa (CoreJSON).
+- load_schema: Devuelve el esquema en memoria (leído del archivo o generado).
+- docs_urls: Rutas de la documentación con sus vistas creadas al primer uso.
+"""
+
+import functools
+import logging
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.urls import include, path
+from django.views.decorators.csrf import csrf_exempt
+
+API_TITLE = "API Documentation"
+
+logger = logging.getLogger("api")
+
+_schema = None
+_schema_lock = threading.Lock()
+
+
+def schema_file():
+    return Path(settings.API_SCHEMA_FILE)
+
+
+def generate_schema():
+    """
+    Genera el esquema público de la API inspeccionando las rutas (costoso: se hace una vez).
+    """
+    from rest_framework.schemas.coreapi import SchemaGenerator
+
+    return SchemaGenerator(title=API_TITLE).get_schema(request=None, public=True)
+
+
+def encode_schema(document):
+    from coreapi.codecs import CoreJSONCodec
+
+    return CoreJSONCodec().encode(document, indent=True) + b"\n"
+
+
+def decode_schema(content):
+    from coreapi.codecs import CoreJSONCodec
+
+    return CoreJSONCodec().decode(content)
+
+
+def load_schema():
+    """
+    Devuelve el esquema de la API, leído de `API_SCHEMA_FILE` (o generado si no existe) una vez por proceso.
+    """
+    global _schema
+    if _schema is None:
+        with _schema_lock:
+            if _schema is None:
+                try:
+                    _schema = decode_schema(schema_file().read_bytes())
+                except FileNotFoundError:
+                    logger.warning(f"No existe {schema_file()}: se genera el esquema de la API en memoria.")
+                    _schema = generate_schema()
+    return _schema
+
+
+def reset_schema():
+    global _schema
+    with _schema_lock:
+        _schema = None
+
+
+class PrecomputedSchemaGenerator:
+    """
+    Generador de esquemas para `SchemaView` que devuelve el esquema guardado en lugar de inspeccionar las rutas.
+    Recibe los mismos argumentos que los generadores de DRF (`get_schema_view`), que aquí no se usan.
+    """
+
+    def __init__(self, **kwargs):
+        pass
+
+    def get_schema(self, request=None, public=False):
+        import coreapi
+
+        document = load_schema()
+        # La URL base del documento depende del host de la solicitud, igual que al generarlo en cada solicitud
+        url = request.build_absolute_uri() if request is not None else document.url
+        return coreapi.Document(url=url, title=document.title, description=document.description, content=document.data)
+
+
+def lazy_view(factory):
+    """
+    Devuelve una vista que crea la vista real con `factory` en su primera solicitud.
+    """
+    factory = functools.cache(factory)
+
+    @csrf_exempt  # Igual que las vistas de DRF, que se envuelven con `csrf_exempt`
+    def view(request, *args, **kwargs):
+        return factory()(request, *args, **kwargs)
+
+    return view
+
+
+@lazy_view
+def docs_view():
+    from rest_framework.documentation import get_docs_view
+
+    return get_docs_view(title=API_TITLE, generator_class=PrecomputedSchemaGenerator)
+
+
+@lazy_view
+def schema_js_view():
+    from rest_framework.documentation import get_schemajs_view
+
+    return get_schemajs_view(title=API_TITLE, generator_class=PrecomputedSchemaGenerator)
+
+
+def docs_urls():
+    """
+    Equivalente a `include_docs_urls` de DRF (mismo espacio de nombres `api-docs`, que usa su plantilla).
+    """
+    urls = [
+        path("", docs_view, name="docs-index"),
+        path("schema.js", schema_js_view, name="schema-js"),
+    ]
+    return include((urls, "api-docs"), namespace="api-docs")
@@ -6,9 +6,12 @@ que luego serán usados por las vistas de la API.
 Estos serializadores manejan el registro de usuarios,inicio de sesión, gestión de tareas y cierre de sesión.
 
 Clases de serializadores:
+- SparseFieldsMixin: Permite restringir los campos serializados (parámetro `fields=` de la API).
 - UserSerializer: Serializador para registrar nuevos usuarios.
 - LoginSerializer: Serializador para autenticar usuarios.
 - TasksSerializer: Serializador para la gestión de tareas.
+- ArchivedTasksSerializer: Serializador de solo lectura para las tareas archivadas.
+- BulkStatusSerializer: Serializador del estado destino para el cambio de estado masivo.
 - LogoutSerializer: Serializador para cerrar sesión (sin datos adicionales).
 """
 
@@ -17,7 +20,9 @@ from rest_framework.serializers import ModelSerializer
 from django.contrib.auth.password_validation import validate_password
 from rest_framework.validators import UniqueValidator
 from django.contrib.auth import authenticate
-from app_tasks.models import Tasks
+from rest_framework.settings import api_settings
+from app_users.hashing import ahash_password, hash_password
+from app_tasks.models import ArchivedTasks, Tasks
 from django.contrib.auth.models import User
 
 
@@ -53,12 +58,19 @@ class UserSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """
         Crear un nuevo usuario después de validar los datos.
-        - Encripta la contraseña usando `set_password`.
+        - Encripta la contraseña en el pool de hashing (ver `app_users/hashing.py`).
+        - Inserta el usuario con la contraseña ya encriptada, en una sola escritura.
         """
-        user = User.objects.create(username=validated_data['username'])
-        user.set_password(validated_data['password'])  # Encripta la contraseña
-        user.save()
-        return user
+        password = hash_password(validated_data['password'])  # Encripta la contraseña
+        return User.objects.create(username=validated_data['username'], password=password)
+
+    async def asave(self):
+        """
+        Versión asíncrona de `save()` para el registro: el hash se espera con `await` (`ahash_password`).
+        """
+        password = await ahash_password(self.validated_data['password'])
+        self.instance = await User.objects.acreate(username=self.validated_data['username'], password=password)
+        return self.instance
 
 
 class LoginSerializer(serializers.ModelSerializer):
@@ -71,9 +83,17 @@ class LoginSerializer(serializers.ModelSerializer):
 
     Validaciones:
     - Verifica que ambos campos (username y password) estén presentes.
-    - Autentica al usuario utilizando el método `authenticate` de Django.
+    - Autentica con `authenticate()` (backends de `AUTHENTICATION_BACKENDS`, señal `user_login_failed`); el
+      backend verifica la contraseña en el pool de hashing (ver `app_users/backends.py`).
+    - Con `authenticate=False` en el contexto solo valida los campos: la vista asíncrona autentica después con
+      `aauthenticate()` y `check_user`.
     """
 
+    default_error_messages = {
+        'invalid_credentials': "Credenciales inválidas.",
+        'missing_credentials': "Debe proporcionar nombre de usuario y contraseña.",
+    }
+
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
 
@@ -89,18 +109,41 @@ class LoginSerializer(serializers.ModelSerializer):
         username = data.get('username')
         password = data.get('password')
 
-        if username and password:
-            user = authenticate(username=username, password=password)
-            if not user:
-                raise serializers.ValidationError("Credenciales inválidas.")
-        else:
-            raise serializers.ValidationError("Debe proporcionar nombre de usuario y contraseña.")
-
-        data['user'] = user
+        if not (username and password):
+            self.fail('missing_credentials')
+        if self.context.get('authenticate', True):
+            request = self.context.get('request')
+            data['user'] = self.check_user(authenticate(request=request, username=username, password=password))
         return data
 
+    def check_user(self, user):
+        """
+        Devuelve el usuario autenticado o lanza el error de credenciales inválidas (`non_field_errors`).
+        """
+        if user is None:
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [self.error_messages['invalid_credentials']]}
+            )
+        return user
+
+
+class SparseFieldsMixin:
+    """
+    Mixin para serializadores que acepta el argumento `fields` con la lista de campos a devolver.
+
+    Los campos no pedidos se quitan del serializador, por lo que no se leen ni se serializan.
+    La validación de los nombres la hace la vista, contra `Meta.fields`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
-class TasksSerializer(ModelSerializer):
+
+class TasksSerializer(SparseFieldsMixin, ModelSerializer):
     """
     Serializador para la gestión de tareas.
 
@@ -112,16 +155,41 @@ class TasksSerializer(ModelSerializer):
     - status: Estado de la tarea (ej. en progreso, completado).
     - created_at: Fecha de creación de la tarea (solo lectura).
     - updated_at: Fecha de última actualización de la tarea (solo lectura).
+    - version: Versión de la tarea, la misma que su `ETag` (solo lectura).
 
-    Los campos `user`, `created_at` y `updated_at` son de solo lectura.
+    Los campos `user`, `created_at`, `updated_at` y `version` son de solo lectura.
     """
 
     class Meta:
         model = Tasks
-        fields = ["id", "user", "name", "description", "status", "created_at", "updated_at"]
+        fields = ["id", "user", "name", "description", "status", "created_at", "updated_at", "version"]
         read_only_fields = ("user", "created_at", "updated_at")
 
 
+class ArchivedTasksSerializer(SparseFieldsMixin, ModelSerializer):
+    """
+    Serializador de solo lectura para las tareas archivadas.
+
+    Expone los mismos campos que `TasksSerializer` más `archived_at` (fecha de archivado).
+    """
+
+    class Meta:
+        model = ArchivedTasks
+        fields = ["id", "user", "name", "description", "status", "created_at", "updated_at", "archived_at"]
+        read_only_fields = fields
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    """
+    Serializador para el cambio de estado masivo de tareas.
+
+    Campos:
+    - status: Estado destino, debe ser uno de `Tasks.STATUS_CHOICES`.
+    """
+
+    status = serializers.ChoiceField(choices=Tasks.STATUS_CHOICES)
+
+
 class LogoutSerializer(serializers.ModelSerializer):
     """
     Serializador para el cierre de sesión de usuarios.
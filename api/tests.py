@@ -8,16 +8,53 @@ Django Rest Framework (DRF) para realizar estas pruebas.
 Clases de pruebas:
 - UserRegistrationTest: Pruebas para el registro de usuarios.
 - UserLoginTest: Pruebas para el inicio de sesión de usuarios.
+- ThrottleTest: Pruebas de las cuotas de autenticación (balde compartido y límite por IP).
 - TaskTest: Pruebas para la creación y filtrado de tareas.
+- SparseFieldsTest: Pruebas de la selección de campos (`fields=`) en el listado de tareas.
+- BulkStatusTest: Pruebas del cambio de estado masivo de tareas.
+- BatchRetrieveTest: Pruebas de la consulta de varias tareas por lista de ids.
+- ConditionalUpdateTest: Pruebas de la modificación de tareas con `ETag` / `If-Match`.
+- WireFormatTest: Pruebas de los formatos compactos (NDJSON en columnas y MessagePack) de la API de tareas.
+- ArchivedTaskTest: Pruebas del archivado de tareas finalizadas.
+- ReplicaRoutingTest: Pruebas del enrutamiento de lecturas a réplicas con lectura de las propias escrituras.
+- TaskEventStreamTest: Pruebas del stream de eventos de tareas (Server-Sent Events).
+- ApiSchemaTest: Pruebas de la documentación de la API con el esquema precalculado.
 - LogoutTest: Pruebas para el cierre de sesión de usuarios.
 """
 
 import base64
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import async_to_sync, sync_to_async
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
 from django.urls import reverse
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
 from django.contrib.auth.models import User
-from app_tasks.models import Tasks
+from django.contrib.auth.signals import user_login_failed
+from app_tasks.archive import archive_completed_tasks
+from app_tasks.models import ArchivedTasks, Tasks
+from app_tasks.cache import get_query_cache_stats
+from app_tasks.events import get_broker, reset_broker
+from _Project_TodoList.cache_backends import FileBasedCache
+from api import schema
+from api.throttling import BasicAuthIPThrottle, LoginIPThrottle
+from api.renderers import decode_columns, encode_columns, msgpack
+from app_users.hashing import PasswordHashingBusy
+from django.core.cache import cache, caches
+from django.test import override_settings
+from _Project_TodoList.db_routers import PRIMARY_PIN_COOKIE, PrimaryReplicaRouter
 
 
 class UserRegistrationTest(APITestCase):
@@ -25,6 +62,12 @@ class UserRegistrationTest(APITestCase):
     Pruebas para el endpoint de registro de usuarios (/api/register/).
     """
 
+    def setUp(self):
+        """
+        Configuración inicial: Vaciar los baldes de los throttles (el caché `throttle` persiste entre ejecuciones).
+        """
+        caches['throttle'].clear()
+
     def test_register_user(self):
         """
         Verifica que un usuario pueda registrarse con datos válidos.
@@ -57,6 +100,24 @@ class UserRegistrationTest(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    async def test_register_user_with_asgi(self):
+        """
+        Verifica que, con ASGI, el registro espere el hash con `ahash_password` (sin el cálculo síncrono) y
+        responda igual que la vista síncrona.
+        """
+        url = reverse('apiregister-list')
+        data = {'username': 'asyncuser', 'password': 'StrongPass!1', 'password2': 'StrongPass!1'}
+        with patch('api.serializers.hash_password', side_effect=AssertionError('hash síncrono')):
+            response = await self.async_client.post(url, data, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json(), {'user': {'username': 'asyncuser'}})
+        user = await User.objects.aget(username='asyncuser')
+        self.assertTrue(await user.acheck_password('StrongPass!1'))
+
+        response = await self.async_client.post(url, data, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('username', response.json())
+
 
 class UserLoginTest(APITestCase):
     """
@@ -66,8 +127,9 @@ class UserLoginTest(APITestCase):
     def setUp(self):
         """
         Configuración inicial:
-        - Crear un usuario de prueba.
+        - Vaciar los baldes de los throttles y crear un usuario de prueba.
         """
+        caches['throttle'].clear()
         self.user = User.objects.create_user(username='testuser', password='password123')
 
     def test_login_user(self):
@@ -96,6 +158,154 @@ class UserLoginTest(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    async def test_login_user_with_asgi(self):
+        """
+        Verifica que, con ASGI, el login verifique la contraseña con `averify_password` (sin el cálculo síncrono),
+        inicie la sesión y responda los errores igual que la vista síncrona.
+        """
+        url = reverse('apilogin-list')
+        with patch('app_users.backends.verify_password', side_effect=AssertionError('hash síncrono')):
+            response = await self.async_client.post(
+                url, {'username': 'testuser', 'password': 'password123'}, content_type='application/json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()['Username'], 'testuser')
+            self.assertIn('sessionid', response.cookies)
+
+            response = await self.async_client.post(
+                url, {'username': 'testuser', 'password': 'wrongpassword'}, content_type='application/json'
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.json(), {'non_field_errors': ['Credenciales inválidas.']})
+
+        with patch('app_users.backends.averify_password', side_effect=PasswordHashingBusy):
+            response = await self.async_client.post(
+                url, {'username': 'testuser', 'password': 'password123'}, content_type='application/json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_login_is_throttled_before_hashing(self):
+        """
+        Verifica que los intentos de login que superan la cuota por usuario se rechacen sin verificar la contraseña.
+        - El código de respuesta debe ser 429 (TOO MANY REQUESTS) con el encabezado `Retry-After`.
+        - No se verifica la contraseña (no se calcula ningún hash).
+        """
+        url = reverse('apilogin-list')
+        data = {'username': 'ThrottledUser', 'password': 'wrongpassword'}
+        for _ in range(5):  # Cuota "login_username": 5/min
+            self.client.post(url, data, format='json', REMOTE_ADDR='10.0.0.31')
+
+        with patch('app_users.backends.verify_password') as verify_password, \
+                patch('app_users.backends.hash_password') as hash_password:
+            response = self.client.post(url, data, format='json', REMOTE_ADDR='10.0.0.31')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        verify_password.assert_not_called()
+        hash_password.assert_not_called()
+
+    def test_login_returns_503_when_hashing_pool_is_full(self):
+        """
+        Verifica que, con el pool de hashing lleno, el login responda 503 de inmediato en lugar de encolarse.
+        """
+        url = reverse('apilogin-list')
+        data = {'username': 'testuser', 'password': 'password123'}
+        with patch('app_users.backends.verify_password', side_effect=PasswordHashingBusy):
+            response = self.client.post(url, data, format='json', REMOTE_ADDR='10.0.0.32')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_login_uses_authentication_backends(self):
+        """
+        Verifica que el login pase por `authenticate()`: un intento fallido envía `user_login_failed` y un
+        login correcto actualiza el hash de la contraseña si usa menos iteraciones que las configuradas.
+        """
+        url = reverse('apilogin-list')
+        failures = []
+        handler = lambda sender, credentials, **kwargs: failures.append(credentials['username'])
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+        response = self.client.post(url, {'username': 'testuser', 'password': 'wrongpassword'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(failures, ['testuser'])
+
+        self.user.password = PBKDF2PasswordHasher().encode('password123', 'oldsalt', iterations=1000)
+        self.user.save(update_fields=['password'])
+        response = self.client.post(url, {'username': 'testuser', 'password': 'password123'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertIn(f'${PBKDF2PasswordHasher.iterations}$', self.user.password)
+        self.assertTrue(self.user.check_password('password123'))
+
+
+class ThrottleTest(APITestCase):
+    """
+    Pruebas de los baldes de `api/throttling.py`.
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Vaciar los baldes de los throttles y crear un usuario de prueba.
+        """
+        caches['throttle'].clear()
+        self.user = User.objects.create_user(username='testuser', password='password123')
+
+    def test_concurrent_workers_share_the_bucket(self):
+        """
+        Verifica que varios workers (cada uno con su propia instancia del caché de archivos sobre el mismo
+        directorio) gasten fichas de un único balde y que ninguna ficha se gaste dos veces.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        class WorkerThrottle(LoginIPThrottle):
+            def __init__(self):
+                super().__init__()
+                self.worker_cache = FileBasedCache(directory, {})
+
+            @property
+            def cache(self):
+                return self.worker_cache
+
+        request = APIRequestFactory().post('/api/login/', REMOTE_ADDR='10.0.0.40')
+        with patch.dict(LoginIPThrottle.THROTTLE_RATES, {'login_ip': '10/hour'}):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda _: WorkerThrottle().allow_request(request, None), range(30)))
+        self.assertEqual(results.count(True), 10)
+
+    def test_bucket_is_one_atomic_update(self):
+        """
+        Verifica que cada solicitud gaste su ficha con una sola operación atómica del caché, sin esperas.
+        """
+        request = APIRequestFactory().post('/api/login/', REMOTE_ADDR='10.0.0.43')
+        throttle_cache = caches['throttle']
+        with patch.dict(LoginIPThrottle.THROTTLE_RATES, {'login_ip': '2/hour'}), \
+                patch('time.sleep', side_effect=AssertionError('time.sleep en la solicitud')), \
+                patch.object(throttle_cache, 'update', wraps=throttle_cache.update) as update:
+            results = [LoginIPThrottle().allow_request(request, None) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(update.call_count, 3)
+
+    def test_basic_auth_is_limited_per_ip_across_usernames(self):
+        """
+        Verifica que rotar nombres de usuario desde una IP no dé intentos ilimitados de autenticación básica:
+        al agotar la cuota por IP se responde 429 sin verificar la contraseña.
+        """
+        url = reverse('apitasks-list')
+        with patch.dict(BasicAuthIPThrottle.THROTTLE_RATES, {'basic_auth_ip': '3/min'}):
+            for index in range(3):
+                credentials = base64.b64encode(f'user{index}:wrong'.encode()).decode('utf-8')
+                response = self.client.get(url, HTTP_AUTHORIZATION='Basic ' + credentials, REMOTE_ADDR='10.0.0.41')
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+            credentials = base64.b64encode(b'testuser:password123').decode('utf-8')
+            with patch('django.contrib.auth.backends.ModelBackend.authenticate') as authenticate:
+                response = self.client.get(url, HTTP_AUTHORIZATION='Basic ' + credentials, REMOTE_ADDR='10.0.0.41')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            authenticate.assert_not_called()
+            response = self.client.get(url, HTTP_AUTHORIZATION='Basic ' + credentials, REMOTE_ADDR='10.0.0.42')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
 
 class TaskTest(APITestCase):
     """
@@ -105,8 +315,9 @@ class TaskTest(APITestCase):
     def setUp(self):
         """
         Configuración inicial:
-        - Crear un usuario de prueba y configurar autenticación básica.
+        - Vaciar los baldes de los throttles, crear un usuario de prueba y configurar autenticación básica.
         """
+        caches['throttle'].clear()
         self.user = User.objects.create_user(username='testuser', password='password123')
         credentials = base64.b64encode(b'testuser:password123').decode('utf-8')  # Codificar las credenciales en Base64 para autenticación básica
         self.client.credentials(HTTP_AUTHORIZATION='Basic ' + credentials)
@@ -138,6 +349,636 @@ class TaskTest(APITestCase):
         response = self.client.get(f"{url}?date_from={date_from}&date_to={date_to}", format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_task_list_is_cached_until_a_write(self):
+        """
+        Verifica que un listado repetido se sirva desde el caché de consultas y que una escritura lo invalide.
+        - La segunda solicitud idéntica es un acierto del caché.
+        - Tras crear una tarea, el listado la incluye.
+        """
+        url = reverse('apitasks-list')
+        Tasks.objects.create(name='Cached Task', user=self.user)
+        self.client.get(url, {'q': 'Task'})
+
+        hits = get_query_cache_stats()['hits']
+        response = self.client.get(url, {'q': 'Task'})
+        self.assertEqual(get_query_cache_stats()['hits'], hits + 1)
+        self.assertEqual(len(response.data), 1)
+
+        self.client.post(url, {'name': 'Another Task'}, format='json')
+        response = self.client.get(url, {'q': 'Task'})
+        self.assertEqual(len(response.data), 2)
+
+    def test_cache_stats_are_staff_only(self):
+        """
+        Verifica que `/api/cache-stats/` devuelva los contadores del caché de consultas solo al staff.
+        """
+        url = reverse('apicachestats-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(reverse('apitasks-list'), {'q': 'Task'})
+        self.client.get(reverse('apitasks-list'), {'q': 'Task'})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['pid'], os.getpid())
+        self.assertEqual(
+            {key: response.data[key] for key in ('hits', 'misses', 'hit_ratio')}, get_query_cache_stats()
+        )
+        self.assertGreaterEqual(response.data['hits'], 1)
+
+
+class SparseFieldsTest(APITestCase):
+    """
+    Pruebas del parámetro `fields=` de /api/tasks/ (campos serializados y columnas leídas).
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear un usuario con una tarea y autenticarlo.
+        """
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.task = Tasks.objects.create(name='Sparse Task', description='Long description', user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_fields_restrict_output_and_columns(self):
+        """
+        Verifica que solo se devuelvan los campos pedidos y que la consulta no lea la columna `description`.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('apitasks-list'), {'fields': 'id,name,status'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'id': self.task.id, 'name': 'Sparse Task', 'status': 'not_started'}])
+        select = [query['sql'] for query in queries if 'FROM "app_tasks_tasks"' in query['sql']]
+        self.assertEqual(len(select), 1)
+        self.assertNotIn('"description"', select[0])
+
+        response = self.client.get(reverse('apitasks-detail', args=[self.task.id]), {'fields': 'name'})
+        self.assertEqual(response.data, {'name': 'Sparse Task'})
+
+    def test_unknown_fields_are_rejected(self):
+        """
+        Verifica que un campo no declarado en el serializador se rechace con 400 (BAD REQUEST).
+        """
+        response = self.client.get(reverse('apitasks-list'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+
+class OrderingTest(APITestCase):
+    """
+    Pruebas del parámetro `ordering=` de /api/tasks/.
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear un usuario con tareas de distintos nombres y estados, y autenticarlo.
+        """
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        for name, task_status in [('Beta', 'completed'), ('Alpha', 'not_started'), ('Gamma', 'in_progress')]:
+            Tasks.objects.create(name=name, status=task_status, user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_ordering_by_allowed_fields(self):
+        """
+        Verifica que las tareas se devuelvan en el orden pedido, ascendente o descendente.
+        """
+        response = self.client.get(reverse('apitasks-list'), {'ordering': 'name'})
+        self.assertEqual([task['name'] for task in response.data], ['Alpha', 'Beta', 'Gamma'])
+
+        response = self.client.get(reverse('apitasks-list'), {'ordering': '-name'})
+        self.assertEqual([task['name'] for task in response.data], ['Gamma', 'Beta', 'Alpha'])
+
+        response = self.client.get(reverse('apitasks-list'), {'ordering': 'status'})
+        self.assertEqual([task['status'] for task in response.data], ['not_started', 'in_progress', 'completed'])  # Orden del flujo de trabajo
+
+    def test_unknown_ordering_is_rejected(self):
+        """
+        Verifica que un ordenamiento sin índice que lo respalde se rechace con 400 (BAD REQUEST).
+        """
+        response = self.client.get(reverse('apitasks-list'), {'ordering': 'description'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', response.data)
+
+
+class BulkStatusTest(APITestCase):
+    """
+    Pruebas para el cambio de estado masivo (/api/tasks/bulk-status/).
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear dos usuarios con tareas y autenticar al primero.
+        """
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.other_user = User.objects.create_user(username='otheruser', password='password123')
+        Tasks.objects.create(name='Report A', user=self.user)
+        Tasks.objects.create(name='Report B', status='completed', user=self.user)
+        Tasks.objects.create(name='Groceries', user=self.user)
+        Tasks.objects.create(name='Report C', user=self.other_user)
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_status_updates_filtered_tasks_in_one_query(self):
+        """
+        Verifica que solo se modifiquen las tareas del usuario que cumplen los filtros, con un único UPDATE.
+        - Devuelve la cantidad de tareas modificadas (las que ya tenían el estado no cuentan).
+        - El listado cacheado refleja el cambio.
+        """
+        url = reverse('apitasks-list')
+        self.client.get(url)  # Llena el caché de consultas
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('apitasks-bulk-status') + '?q=Report', {'status': 'completed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE')]), 1)
+
+        statuses = {task['name']: task['status'] for task in self.client.get(url).data}
+        self.assertEqual(statuses, {'Report A': 'completed', 'Report B': 'completed', 'Groceries': 'not_started'})
+        self.assertEqual(Tasks.objects.get(name='Report C').status, 'not_started')  # Tarea de otro usuario
+
+    def test_bulk_status_rejects_unknown_status(self):
+        """
+        Verifica que un estado inexistente se rechace con 400 (BAD REQUEST).
+        """
+        response = self.client.post(reverse('apitasks-bulk-status'), {'status': 'archived'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BatchRetrieveTest(APITestCase):
+    """
+    Pruebas para la consulta de varias tareas por id (/api/tasks/batch/).
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear dos usuarios con tareas y autenticar al primero.
+        """
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.other_user = User.objects.create_user(username='otheruser', password='password123')
+        self.tasks = [Tasks.objects.create(name=f'Task {index}', user=self.user) for index in range(3)]
+        self.other_task = Tasks.objects.create(name='Other', user=self.other_user)
+        self.client.force_authenticate(self.user)
+
+    def test_batch_preserves_order_and_reports_missing(self):
+        """
+        Verifica que las tareas se devuelvan en el orden pedido con una única consulta, y que los ids
+        inexistentes o de otro usuario se informen como faltantes.
+        """
+        first, second, third = self.tasks
+        ids = [third.id, self.other_task.id, first.id, 999999, third.id]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('apitasks-batch'), {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['results']], [third.id, first.id])
+        self.assertEqual(response.data['missing'], [self.other_task.id, 999999])
+        self.assertEqual(len([query for query in queries if 'app_tasks_tasks' in query['sql']]), 1)
+
+        response = self.client.get(reverse('apitasks-batch'), {'ids': second.id, 'fields': 'id,name'})
+        self.assertEqual(response.data['results'], [{'id': second.id, 'name': 'Task 1'}])
+
+        response = self.client.get(reverse('apitasks-batch'), {'ids': second.id})
+        self.assertIn('version', response.data['results'][0])
+        for archived in ['true', 'all']:  # Se leen las tareas activas: no se usa el serializador de archivadas
+            response = self.client.get(reverse('apitasks-batch'), {'ids': second.id, 'archived': archived})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('archived', response.data)
+
+    def test_batch_validates_ids(self):
+        """
+        Verifica que se rechacen con 400 la lista vacía, los ids no numéricos o fuera de rango y las listas
+        demasiado largas.
+        """
+        url = reverse('apitasks-batch')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'ids': '1,abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        for ids in ['1,²', '99999999999999999999', str(2**63), '0']:  # Dígitos Unicode y fuera de rango
+            response = self.client.get(url, {'ids': ids})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, ids)
+        self.assertEqual(self.client.get(url, {'ids': str(2**63 - 1)}).data['missing'], [2**63 - 1])
+        with override_settings(TASKS_BATCH_MAX_IDS=2):
+            self.assertEqual(self.client.get(url, {'ids': '1,2,3'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalUpdateTest(APITestCase):
+    """
+    Pruebas del control de concurrencia optimista (`ETag` / `If-Match`) al modificar tareas.
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear un usuario con una tarea y autenticarlo.
+        """
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.task = Tasks.objects.create(name='Task', user=self.user)
+        self.url = reverse('apitasks-detail', kwargs={'pk': self.task.pk})
+        self.client.force_authenticate(self.user)
+
+    def test_update_with_current_etag(self):
+        """
+        Verifica que la consulta devuelva la `ETag` y que la modificación con `If-Match` vigente (también débil)
+        se haga con un `UPDATE` condicional, sin `SELECT ... FOR UPDATE`, y devuelva la nueva `ETag`.
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response['ETag'], '"1"')
+        self.assertEqual(response.data['version'], 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, {'name': 'Renamed'}, format='json', HTTP_IF_MATCH='W/"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(response.data['version'], 2)
+        self.assertFalse([query for query in queries if 'FOR UPDATE' in query['sql']])
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "app_tasks_tasks"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"app_tasks_tasks"."version" = 1', updates[0])
+
+    def test_stale_etag_is_rejected(self):
+        """
+        Verifica que una modificación con una `ETag` vieja responda 412 con la `ETag` actual y no sobrescriba
+        el cambio de la otra solicitud.
+        """
+        self.client.patch(self.url, {'name': 'First'}, format='json', HTTP_IF_MATCH='"1"')
+        response = self.client.put(
+            self.url, {'name': 'Second', 'status': 'completed'}, format='json', HTTP_IF_MATCH='"1"',
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response['ETag'], '"2"')
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.name, self.task.status, self.task.version), ('First', 'not_started', 2))
+
+    def test_concurrent_write_between_read_and_update(self):
+        """
+        Verifica que si otra escritura se adelanta entre la lectura y el `UPDATE`, la solicitud responda 412
+        (con `If-Match`) o 409 (sin él) en lugar de sobrescribirla.
+        """
+        original = Tasks.save_if_version
+
+        def concurrent_save(task, expected_version):
+            Tasks.objects.filter(pk=task.pk).update(name='Concurrent', version=expected_version + 1)
+            return original(task, expected_version)
+
+        with patch.object(Tasks, 'save_if_version', concurrent_save):
+            response = self.client.patch(self.url, {'name': 'Mine'}, format='json', HTTP_IF_MATCH='*')
+            self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+            self.assertEqual(response['ETag'], '"2"')
+            response = self.client.patch(self.url, {'name': 'Mine'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.name, 'Concurrent')
+
+
+class WireFormatTest(APITestCase):
+    """
+    Pruebas de la negociación de NDJSON en columnas y MessagePack en /api/tasks/.
+    """
+
+    NDJSON = 'application/vnd.tasks.columns+ndjson'
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear un usuario con dos tareas y autenticarlo.
+        """
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        Tasks.objects.create(name='Report A', description='Primera', user=self.user)
+        Tasks.objects.create(name='Report B', status='completed', user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_list_as_columnar_ndjson(self):
+        """
+        Verifica que el listado en NDJSON envíe los nombres de campo una vez y contenga los mismos datos que JSON.
+        """
+        url = reverse('apitasks-list')
+        expected = self.client.get(url).json()
+        response = self.client.get(url, HTTP_ACCEPT=self.NDJSON)
+        self.assertEqual(response['Content-Type'], f'{self.NDJSON}; charset=utf-8')
+        lines = response.content.decode().splitlines()
+        self.assertEqual(json.loads(lines[0]), ['id', 'user', 'name', 'description', 'status', 'created_at', 'updated_at', 'version'])
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(decode_columns(response.content.decode()), expected)
+
+        response = self.client.get(url, {'format': 'ndjson', 'fields': 'id,name'})
+        self.assertEqual(response.content.decode().splitlines()[0], '["id","name"]')
+
+    def test_create_and_bulk_status_with_columnar_ndjson(self):
+        """
+        Verifica que el alta y el cambio de estado masivo acepten el cuerpo en NDJSON en columnas.
+        """
+        body = encode_columns({'name': 'Desde NDJSON', 'status': 'in_progress'})
+        response = self.client.post(reverse('apitasks-list'), body, content_type=self.NDJSON)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Tasks.objects.get(name='Desde NDJSON').status, 'in_progress')
+
+        body = encode_columns({'status': 'completed'})
+        response = self.client.post(reverse('apitasks-bulk-status'), body, content_type=self.NDJSON)
+        self.assertEqual(response.data['updated'], 2)
+
+    def test_bulk_create_with_multi_row_ndjson(self):
+        """
+        Verifica que un cuerpo NDJSON con varias filas cree todas las tareas, y que si alguna es inválida no se
+        cree ninguna (400 con los errores por posición) ni se superen las tareas permitidas por solicitud.
+        """
+        url = reverse('apitasks-list')
+        body = encode_columns([{'name': 'Lote 1', 'status': 'in_progress'}, {'name': 'Lote 2', 'status': 'completed'}])
+        response = self.client.post(url, body, content_type=self.NDJSON)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([task['name'] for task in response.data], ['Lote 1', 'Lote 2'])
+        self.assertEqual(
+            list(Tasks.objects.filter(name__startswith='Lote').order_by('id').values_list('status', 'user')),
+            [('in_progress', self.user.id), ('completed', self.user.id)],
+        )
+
+        body = encode_columns([{'name': 'Lote 3', 'status': 'completed'}, {'name': 'Lote 4', 'status': 'bogus'}])
+        response = self.client.post(url, body, content_type=self.NDJSON)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('status', response.data[1])
+        self.assertFalse(Tasks.objects.filter(name='Lote 3').exists())
+
+        with override_settings(TASKS_BULK_CREATE_MAX_ITEMS=1):
+            body = encode_columns([{'name': 'Lote 5'}, {'name': 'Lote 6'}])
+            self.assertEqual(self.client.post(url, body, content_type=self.NDJSON).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_columnar_ndjson_is_rejected(self):
+        """
+        Verifica que una fila con una cantidad de valores distinta a la de columnas responda 400.
+        """
+        body = b'["name","status"]\n["Sin estado"]\n'
+        response = self.client.post(reverse('apitasks-list'), body, content_type=self.NDJSON)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_and_create_with_msgpack(self):
+        """
+        Verifica la lectura y el alta de tareas en MessagePack.
+        """
+        url = reverse('apitasks-list')
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), self.client.get(url).json())
+        body = msgpack.packb({'name': 'Desde MessagePack'})
+        response = self.client.post(url, body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class ArchivedTaskTest(APITestCase):
+    """
+    Pruebas del archivado de tareas finalizadas y de su consulta desde /api/tasks/.
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear un usuario con una tarea finalizada antigua, una reciente y una en progreso, y archivar.
+        """
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.old = Tasks.objects.create(name='Old Task', status='completed', user=self.user)
+        Tasks.objects.create(name='Recent Task', status='completed', user=self.user)
+        Tasks.objects.create(name='Open Task', status='in_progress', user=self.user)
+        Tasks.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - timedelta(days=365))
+        call_command('archive_tasks', '--batch-size', '1', stdout=StringIO())
+        self.client.force_authenticate(self.user)
+
+    def test_archive_moves_only_old_completed_tasks(self):
+        """
+        Verifica que solo la tarea finalizada antigua se mueva a la tabla de archivadas, conservando su id.
+        """
+        self.assertFalse(Tasks.objects.filter(pk=self.old.pk).exists())
+        self.assertEqual(ArchivedTasks.objects.get().id, self.old.pk)
+        self.assertEqual(Tasks.objects.count(), 2)
+
+    def test_task_reopened_during_archive_is_kept(self):
+        """
+        Verifica que una tarea reabierta entre la lectura del lote y la eliminación siga activa con sus cambios
+        y que su copia se descarte del archivo.
+        """
+        reopened = Tasks.objects.create(name='Reopened Task', status='completed', user=self.user)
+        Tasks.objects.filter(pk=reopened.pk).update(updated_at=timezone.now() - timedelta(days=365))
+        original = QuerySet.bulk_create
+
+        def bulk_create_then_reopen(queryset, objs, *args, **kwargs):
+            Tasks.objects.filter(pk=reopened.pk).update(status='in_progress', updated_at=timezone.now())
+            return original(queryset, objs, *args, **kwargs)
+
+        with patch.object(QuerySet, 'bulk_create', bulk_create_then_reopen):
+            archived = list(archive_completed_tasks())
+        self.assertEqual(archived, [0])
+        reopened.refresh_from_db()
+        self.assertEqual(reopened.status, 'in_progress')
+        self.assertEqual(list(ArchivedTasks.objects.values_list('id', flat=True)), [self.old.pk])
+
+    def test_archived_tasks_are_excluded_by_default(self):
+        """
+        Verifica que el listado excluya las archivadas salvo que se pidan con `archived=true` o `archived=all`.
+        """
+        url = reverse('apitasks-list')
+        self.assertEqual({task['name'] for task in self.client.get(url).data}, {'Recent Task', 'Open Task'})
+        self.assertEqual([task['name'] for task in self.client.get(url, {'archived': 'true'}).data], ['Old Task'])
+        self.assertEqual(len(self.client.get(url, {'archived': 'all'}).data), 3)
+
+    def test_count_spans_both_tiers(self):
+        """
+        Verifica que el conteo incluya ambos niveles de almacenamiento y respete los filtros.
+        """
+        response = self.client.get(reverse('apitasks-count'))
+        self.assertEqual(response.data, {'active': 2, 'archived': 1, 'total': 3})
+        response = self.client.get(reverse('apitasks-count'), {'q': 'Old'})
+        self.assertEqual(response.data, {'active': 0, 'archived': 1, 'total': 1})
+
+
+@override_settings(DATABASE_REPLICA_ALIASES=['replica_1'])
+class ReplicaRoutingTest(APITestCase):
+    """
+    Pruebas de `PrimaryReplicaRouter` y `ReadYourWritesMiddleware` con una réplica configurada.
+
+    Se registra a qué base envía el router cada lectura de tareas, pero la consulta se ejecuta en `default`
+    (en las pruebas las réplicas son un espejo de la base de prueba).
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear un usuario con una tarea y configurar autenticación básica.
+        - Registrar las decisiones del router para el modelo `Tasks`.
+        """
+        cache.clear()
+        caches['throttle'].clear()
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        Tasks.objects.create(name='Replicated', user=self.user)
+        credentials = base64.b64encode(b'testuser:password123').decode('utf-8')
+        self.client.credentials(HTTP_AUTHORIZATION='Basic ' + credentials)
+
+        self.routed = []
+        original = PrimaryReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            alias = original(router, model, **hints)
+            if model is Tasks:
+                self.routed.append(alias)
+            return 'default'
+
+        patcher = patch.object(PrimaryReplicaRouter, 'db_for_read', record)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_go_to_replica_until_user_writes(self):
+        """
+        Verifica que las lecturas vayan a la réplica y que, tras una escritura, el usuario lea de la primaria
+        aunque el cliente no conserve la cookie (API con autenticación básica).
+        """
+        self.routed.clear()
+        self.client.get(reverse('apitasks-list'))
+        self.assertEqual(set(self.routed), {'replica_1'})
+
+        response = self.client.post(reverse('apitasks-list'), {'name': 'New', 'status': 'not_started'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+        self.client.cookies.clear()
+        self.routed.clear()
+        self.client.get(reverse('apitasks-list'), {'q': 'New'})
+        self.assertEqual(set(self.routed), {'default'})
+
+        cache.clear()  # Vence la ventana de lectura de la primaria
+        self.routed.clear()
+        self.client.get(reverse('apitasks-list'), {'q': 'Replicated'})
+        self.assertEqual(set(self.routed), {'replica_1'})
+
+    def test_pin_cookie_routes_reads_to_primary(self):
+        """
+        Verifica que la cookie dejada por una escritura fije a la primaria las lecturas de la solicitud siguiente.
+        """
+        self.client.post(reverse('apitasks-list'), {'name': 'New', 'status': 'not_started'})
+        cache.clear()  # Solo queda la cookie
+        self.routed.clear()
+        self.client.get(reverse('apitasks-list'), {'q': 'New'})
+        self.assertEqual(set(self.routed), {'default'})
+
+
+@override_settings(TASK_EVENTS_HEARTBEAT=0.05)
+class TaskEventStreamTest(APITestCase):
+    """
+    Pruebas del stream de eventos de tareas (/api/tasks/stream/).
+    """
+
+    def setUp(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        self.user = User.objects.create_user(username='testuser', password='password123')
+        self.url = reverse('apitasks-stream')
+
+    def create_task(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Tasks.objects.create(name=name, user=self.user)
+
+    async def open_stream(self, **headers):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertTrue((await anext(stream)).startswith(b'retry: '))
+        return stream
+
+    async def test_stream_sends_task_events_and_heartbeats(self):
+        """
+        Verifica que se reciban los eventos de las tareas del usuario y los comentarios de mantenimiento.
+        """
+        stream = await self.open_stream()
+        self.assertEqual(get_broker().subscriber_count(self.user.id), 1)
+        self.assertEqual(await anext(stream), b': ping\n\n')
+
+        task = await sync_to_async(self.create_task)('Streamed')
+        chunk = (await anext(stream)).decode()
+        self.assertIn('event: created\n', chunk)
+        self.assertIn(f'"id":{task.id}', chunk)
+        await stream.aclose()
+
+    @override_settings(TASK_EVENTS_BUFFER=2)
+    async def test_slow_client_is_disconnected(self):
+        """
+        Verifica que un cliente que no lee a tiempo reciba `overflow` y que la conexión se cierre.
+        """
+        stream = await self.open_stream()
+        for n in range(5):
+            get_broker().publish(self.user.id, 'updated', {'id': n})
+        self.assertIn(b'"id":1', await anext(stream))
+        self.assertEqual(await anext(stream), b'event: overflow\ndata: {}\n\n')
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(get_broker().subscriber_count(self.user.id), 0)
+
+    async def test_stream_resumes_from_last_event_id(self):
+        """
+        Verifica que con `Last-Event-ID` se reenvíen los eventos perdidos, o `reset` si no están disponibles.
+        """
+        stream = await self.open_stream()  # El cliente se conecta y se corta antes de los eventos
+        await stream.aclose()
+        first = get_broker().publish(self.user.id, 'updated', {'id': 1})
+        second = get_broker().publish(self.user.id, 'deleted', {'id': 2})
+
+        stream = await self.open_stream(last_event_id=str(first.id))
+        self.assertEqual(await anext(stream), second.to_sse().encode())
+        await stream.aclose()
+
+        stream = await self.open_stream(last_event_id='1')
+        self.assertEqual(await anext(stream), b'event: reset\ndata: {}\n\n')
+        await stream.aclose()
+
+    def test_stream_requires_authentication_and_asgi(self):
+        """
+        Verifica que el stream rechace a los usuarios anónimos y las solicitudes fuera de ASGI.
+        """
+        response = async_to_sync(self.async_client.get)(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        credentials = base64.b64encode(b'testuser:wrong').decode('utf-8')
+        response = async_to_sync(self.async_client.get)(self.url, headers={'authorization': 'Basic ' + credentials})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+
+class ApiSchemaTest(APITestCase):
+    """
+    Pruebas de `/api/docs/` con el esquema precalculado (ver `api/schema.py`).
+    """
+
+    def setUp(self):
+        schema.reset_schema()
+        self.addCleanup(schema.reset_schema)
+
+    def test_schema_file_is_up_to_date(self):
+        """
+        Verifica que `api/schema.json` coincida con las rutas actuales (regenerar con `generate_api_schema`).
+        """
+        call_command('generate_api_schema', '--check', stdout=StringIO())
+
+    def test_docs_serve_schema_from_memory(self):
+        """
+        Verifica que la documentación se sirva sin volver a inspeccionar las rutas en cada solicitud.
+        """
+        with patch('api.schema.generate_schema', side_effect=AssertionError('No debe generarse')):
+            for _ in range(2):
+                response = self.client.get('/api/docs/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertContains(response, 'bulk-status')
+            response = self.client.get('/api/docs/schema.js')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(API_SCHEMA_FILE='/nonexistent/schema.json')
+    def test_missing_schema_file_is_generated_once(self):
+        """
+        Verifica que sin archivo el esquema se genere con la primera solicitud y luego se reutilice.
+        """
+        with patch('api.schema.generate_schema', wraps=schema.generate_schema) as generate:
+            self.client.get('/api/docs/schema.js')
+            self.client.get('/api/docs/schema.js')
+        self.assertEqual(generate.call_count, 1)
+
 
 class LogoutTest(APITestCase):
     """
@@ -147,8 +988,9 @@ class LogoutTest(APITestCase):
     def setUp(self):
         """
         Configuración inicial:
-        - Crear un usuario de prueba y configurar autenticación básica.
+        - Vaciar los baldes de los throttles, crear un usuario de prueba y configurar autenticación básica.
         """
+        caches['throttle'].clear()
         self.user = User.objects.create_user(username='testuser', password='password123')
         credentials = base64.b64encode(b'testuser:password123').decode('utf-8')
         self.client.credentials(HTTP_AUTHORIZATION='Basic ' + credentials)
@@ -0,0 +1,176 @@
+"""
+Limitación de tasa (throttling) para los endpoints de autenticación de la API
+
+El registro, el login y la autenticación básica calculan hashes de contraseñas (PBKDF2), una operación costosa
+a propósito. Estas clases rechazan a los clientes que superan su cuota antes de calcular ningún hash, por lo que
+una solicitud limitada solo cuesta una lectura y una escritura en el caché.
+
+Se usa un balde de fichas (token bucket): cada clave tiene `capacidad` fichas que se recargan de forma continua
+a razón de `capacidad / período`. Las tasas se configuran en `REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]` con el
+formato habitual de DRF (por ejemplo `"5/min"`) y el estado vive en el caché `throttle`, compartido entre los
+workers (archivos o Redis, ver `THROTTLE_CACHE_BACKEND`).
+
+La recarga y el gasto de cada balde son una única operación atómica del backend, así dos solicitudes
+simultáneas no pueden gastar la misma ficha y ninguna solicitud espera en un bucle:
+- Redis: un script Lua (`TOKEN_BUCKET_SCRIPT`), un solo viaje al servidor.
+- Archivos: `update` del caché de archivos del proyecto, bajo un bloqueo de archivo que espera el sistema operativo.
+
+Clases:
+- TokenBucketThrottle: Base del balde de fichas, compatible con `SimpleRateThrottle` de DRF.
+- LoginIPThrottle / LoginUsernameThrottle: Cuotas de `/api/login/` por IP y por nombre de usuario.
+- RegisterIPThrottle: Cuota de `/api/register/` por IP.
+- BasicAuthIPThrottle: Cuota de intentos de autenticación básica por IP (con cualquier usuario).
+- BasicAuthThrottle: Cuota de intentos de autenticación básica por IP y usuario.
+- ThrottledBasicAuthentication: `BasicAuthentication` que consulta ambas cuotas antes del hash.
+"""
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.authentication import BasicAuthentication
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import SimpleRateThrottle
+from _Project_TodoList.db_routers import pin_if_recent_write
+
+THROTTLE_CACHE_ALIAS = "throttle"
+
+# Balde de fichas en Redis: KEYS[1] = balde; ARGV = capacidad, fichas por segundo, hora actual, vencimiento.
+# Devuelve {1 si se gastó una ficha o 0, fichas restantes como texto (Lua trunca los números a enteros)}.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {allowed, tostring(tokens)}
+"""
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Throttle de balde de fichas. Las subclases definen `scope` y `get_cache_key`.
+    """
+
+    @property
+    def cache(self):
+        return caches[THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request, view):
+        """
+        Consume una ficha del balde de la solicitud; devuelve `False` si el balde está vacío.
+        """
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        capacity = self.num_requests
+        refill_rate = capacity / self.duration  # Fichas por segundo
+        allowed, tokens = self.take_token(capacity, refill_rate, self.timer())
+        # Sin ficha: segundos hasta que se recargue una
+        self.retry_after = None if allowed else (1 - tokens) / refill_rate
+        return allowed
+
+    def take_token(self, capacity, refill_rate, now):
+        """
+        Recarga el balde de `self.key` y gasta una ficha si hay; devuelve `(permitida, fichas restantes)`.
+        """
+        cache = self.cache
+        if hasattr(cache, "eval"):
+            allowed, tokens = cache.eval(
+                TOKEN_BUCKET_SCRIPT, [self.key], [capacity, refill_rate, now, int(self.duration)]
+            )
+            return bool(allowed), float(tokens)
+        if not hasattr(cache, "update"):
+            raise ImproperlyConfigured(
+                f"El caché `{THROTTLE_CACHE_ALIAS}` debe ser un backend de _Project_TodoList.cache_backends."
+            )
+
+        def spend(state):
+            tokens, updated_at = state or (capacity, now)
+            tokens = min(capacity, tokens + max(0, now - updated_at) * refill_rate)
+            if tokens >= 1:
+                return (tokens - 1, now), (True, tokens - 1)
+            return (tokens, now), (False, tokens)
+
+        return cache.update(self.key, spend, self.duration)
+
+    def wait(self):
+        """
+        Devuelve los segundos hasta la próxima ficha disponible (se envía en el encabezado `Retry-After`).
+        """
+        return self.retry_after
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    scope = "login_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginUsernameThrottle(TokenBucketThrottle):
+    scope = "login_username"
+
+    def get_cache_key(self, request, view):
+        username = request.data.get("username") if hasattr(request.data, "get") else None
+        if not username:
+            return None  # Sin usuario el serializador rechaza la solicitud sin calcular hashes
+        return self.cache_format % {"scope": self.scope, "ident": str(username).strip().lower()}
+
+
+class RegisterIPThrottle(TokenBucketThrottle):
+    scope = "register_ip"
+
+    def get_cache_key(self, request, view):
+        if request.method != "POST":
+            return None  # Solo el alta de usuarios calcula el hash de la contraseña
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class BasicAuthIPThrottle(TokenBucketThrottle):
+    scope = "basic_auth_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class BasicAuthThrottle(TokenBucketThrottle):
+    scope = "basic_auth"
+
+    def __init__(self, userid):
+        super().__init__()
+        self.userid = str(userid).strip().lower()
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": f"{self.get_ident(request)}:{self.userid}"}
+
+
+class ThrottledBasicAuthentication(BasicAuthentication):
+    """
+    Autenticación básica que aplica `BasicAuthIPThrottle` (por IP, así rotar nombres de usuario no da intentos
+    ilimitados) y `BasicAuthThrottle` (por IP y usuario) antes de verificar la contraseña.
+
+    DRF autentica antes de evaluar los throttles de la vista, por eso la cuota se controla aquí.
+    Una vez autenticado, las lecturas del usuario van a la primaria si escribió recientemente
+    (sin sesión, `ReadYourWritesMiddleware` no puede saberlo al inicio de la solicitud).
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        if request is not None:
+            for throttle in (BasicAuthIPThrottle(), BasicAuthThrottle(userid)):
+                if not throttle.allow_request(request, None):
+                    raise Throttled(wait=throttle.wait())
+        user, auth = super().authenticate_credentials(userid, password, request)
+        pin_if_recent_write(user.pk)
+        return user, auth
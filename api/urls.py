@@ -5,11 +5,16 @@ Este archivo define las rutas para el registro de usuarios, inicio de sesión, g
 utilizando Django Rest Framework (DRF) y los ViewSets correspondientes.
 
 Rutas registradas:
-- /api/register/ -> Registro de usuarios
-- /api/login/ -> Inicio de sesión
-- /api/tasks/ -> Gestión de tareas (CRUD)
+- /api/register/ -> Registro de usuarios (con ASGI, el hash de la contraseña no ocupa un hilo)
+- /api/login/ -> Inicio de sesión (ídem)
+- /api/tasks/ -> Gestión de tareas (CRUD). Con `?archived=true|all` incluye las tareas archivadas y con
+  `?ordering=` (`created_at`, `updated_at`, `status`, `name`, con `-` para orden descendente) las ordena.
+- /api/tasks/count/ -> Cantidad de tareas activas y archivadas
+- /api/tasks/bulk-status/ -> Cambio de estado masivo de las tareas que cumplen los filtros
+- /api/tasks/stream/ -> Stream (Server-Sent Events) de los cambios en las tareas del usuario (requiere ASGI)
 - /api/logout/ -> Cierre de sesión
-- /api/docs/ -> Documentación de la API generada automáticamente
+- /api/cache-stats/ -> Aciertos y fallos del caché de consultas de tareas del worker (solo para el staff)
+- /api/docs/ -> Documentación de la API (esquema precalculado con `manage.py generate_api_schema`, ver api/schema.py)
 
 Se utiliza el `DefaultRouter` de DRF para registrar las rutas de los ViewSets.
 
@@ -17,8 +22,8 @@ Se utiliza el `DefaultRouter` de DRF para registrar las rutas de los ViewSets.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework.documentation import include_docs_urls
-from api.views import TaskViewSet, RegisterViewSet, LoginViewSet, LogoutViewSet
+from api.schema import docs_urls
+from api.views import TaskViewSet, RegisterViewSet, LoginViewSet, LogoutViewSet, QueryCacheStatsViewSet, task_event_stream
 
 # Crear el router para registrar los ViewSets de la API
 router = DefaultRouter()
@@ -26,12 +31,21 @@ router.register(r'register', RegisterViewSet, basename='apiregister')  # Rutas p
 router.register(r'login', LoginViewSet, basename='apilogin')  # Rutas para el inicio de sesión
 router.register(r'tasks', TaskViewSet, basename='apitasks')  # Rutas para el CRUD de tareas
 router.register(r'logout', LogoutViewSet, basename='apilogout')  # Rutas para el cierre de sesión
+router.register(r'cache-stats', QueryCacheStatsViewSet, basename='apicachestats')  # Estadísticas del caché (staff)
 
 # Definición de las rutas
 urlpatterns = [
+    # Stream de eventos de las tareas (antes del router, que tomaría `stream` como `id` de una tarea)
+    path("api/tasks/stream/", task_event_stream, name="apitasks-stream"),
+
+    # Registro y login con el hash de la contraseña en una vista asíncrona (con ASGI, ver AsyncCreateMixin). El
+    # router conserva sus rutas para el detalle (`register/<pk>/`), `reverse()` y el esquema de la documentación.
+    path("api/register/", RegisterViewSet.as_async_create_view(basename="apiregister")),
+    path("api/login/", LoginViewSet.as_async_create_view(basename="apilogin")),
+
     # Incluye las rutas de la API registradas en el router
     path("api/", include(router.urls)),
 
-    # Ruta para la documentación de la API generada automáticamente por DRF
-    path("api/docs/", include_docs_urls(title="API Documentation")),
+    # Ruta para la documentación de la API (sus vistas e imports se cargan con la primera solicitud)
+    path("api/docs/", docs_urls()),
 ]
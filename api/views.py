@@ -4,35 +4,97 @@ Vistas para la API RESTful de la aplicación ToDo List
 Este archivo contiene los `ViewSets` que manejan el registro, login, logout y CRUD de tareas. Se utiliza Django Rest Framework (DRF) para la creación de estas vistas.
 
 Clases:
+- AsyncCreateMixin: Versión asíncrona del `POST` de un ViewSet, para que el hash de la contraseña no ocupe un hilo.
 - RegisterViewSet: Vista para registrar nuevos usuarios.
 - LoginViewSet: Vista para iniciar sesión de usuarios.
 - TaskViewSet: Vista para la gestión de tareas (listar, crear, actualizar y eliminar).
 - LogoutViewSet: Vista para cerrar sesión de usuarios.
+- QueryCacheStatsViewSet: Aciertos y fallos del caché de consultas de tareas (solo para el staff).
+
+Funciones:
+- task_event_stream: Stream (Server-Sent Events) de los cambios en las tareas del usuario. Es una vista
+  asíncrona: requiere un servidor ASGI.
 
 Autenticación:
 - Se soportan múltiples clases de autenticación como `SessionAuthentication` para navegadores y `BasicAuthentication` para herramientas como Postman.
 """
 
-from rest_framework.authentication import BasicAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, SAFE_METHODS
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.response import Response
-from django.contrib.auth import login, logout
-from .serializers import LoginSerializer, LogoutSerializer, UserSerializer, TasksSerializer
+from rest_framework.settings import api_settings
+from django.contrib.auth import alogin, alogout, login, logout
+from .exceptions import EditConflict, PreconditionFailed
+from .renderers import compact_parsers, compact_renderers
+from .serializers import LoginSerializer, LogoutSerializer, UserSerializer, TasksSerializer, ArchivedTasksSerializer, BulkStatusSerializer
 from django.contrib.auth.models import User
-from app_tasks.models import Tasks
-from django.db.models import Q
-from django.utils.dateparse import parse_date
+from django.db import transaction
+from app_users.backends import aauthenticate
+from django.db.models import F
+from django.utils import timezone
+from app_tasks.models import ArchivedTasks, Tasks
+from app_tasks.cache import bump_user_generation, cached_task_query, get_query_cache_stats
+from app_tasks.events import TASKS_INVALIDATED, get_broker, publish_event
+from app_tasks.filters import ARCHIVED_EXCLUDE, ARCHIVED_INCLUDE, ARCHIVED_ONLY, apply_task_filters, parse_archived, parse_task_filters
+from app_tasks.ordering import DEFAULT_TASK_ORDERING, MAX_TASK_ID, InvalidOrdering, allowed_orderings, order_tasks, parse_ordering
 from rest_framework.permissions import AllowAny
-from django.shortcuts import get_object_or_404
 from rest_framework.authentication import SessionAuthentication
+from .throttling import LoginIPThrottle, LoginUsernameThrottle, RegisterIPThrottle, ThrottledBasicAuthentication
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+import asyncio
 import logging
+import os
+import re
 
 
 logger = logging.getLogger('api')  # Logger para registrar acciones dentro de la API
 
 
-class RegisterViewSet(viewsets.ModelViewSet):
+class AsyncCreateMixin:
+    """
+    Agrega a un ViewSet una vista cuyo `POST` a la lista ejecuta `acreate` (asíncrono) en lugar de `create`.
+
+    Con ASGI, las vistas síncronas de DRF comparten un hilo por worker: un login esperando el hash de PBKDF2 lo
+    ocupaba y demoraba las demás solicitudes. `acreate` espera el pool de hashing con `await` (ver
+    `app_users/hashing.py`) y el event loop sigue atendiendo. La autenticación, los permisos y los throttles son
+    los del ViewSet (`initial`). Con WSGI, y para los demás métodos, se usa la vista síncrona del ViewSet.
+    """
+
+    @classmethod
+    def as_async_create_view(cls, **initkwargs):
+        """
+        Devuelve la vista de la lista (`GET` → `list`, `POST` → `acreate` con ASGI o `create` con WSGI).
+        """
+        actions = {'get': 'list', 'post': 'create'}
+        sync_view = cls.as_view(actions, detail=False, **initkwargs)
+
+        @csrf_exempt
+        async def view(request, *args, **kwargs):
+            if request.method != 'POST' or not isinstance(request, ASGIRequest):
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            self = cls(action_map=actions, detail=False, **initkwargs)
+            self.args, self.kwargs = args, kwargs
+            request = self.initialize_request(request, *args, **kwargs)
+            self.request = request
+            self.headers = self.default_response_headers
+            try:
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+                response = await self.acreate(request, *args, **kwargs)
+            except Exception as exc:
+                response = self.handle_exception(exc)
+            return self.finalize_response(request, response, *args, **kwargs)
+
+        return view
+
+
+class RegisterViewSet(AsyncCreateMixin, viewsets.ModelViewSet):
     """
     Vista para registrar nuevos usuarios.
     
@@ -41,12 +103,14 @@ class RegisterViewSet(viewsets.ModelViewSet):
         - serializer_class: Utiliza `UserSerializer` para validar y crear usuarios.
         - authentication_classes: No se requiere autenticación para registrar un nuevo usuario.
         - permission_classes: Permite acceso a cualquier usuario (autenticado o no).
+        - throttle_classes: Limita las altas por IP antes de calcular el hash de la contraseña.
     """
 
     queryset = User.objects.all()
     serializer_class = UserSerializer
     authentication_classes = []  # No se requiere autenticación para el registro
     permission_classes = [AllowAny]
+    throttle_classes = [RegisterIPThrottle]
 
     def create(self, request, *args, **kwargs):
         """
@@ -61,8 +125,20 @@ class RegisterViewSet(viewsets.ModelViewSet):
             
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    async def acreate(self, request, *args, **kwargs):
+        """
+        Versión asíncrona de `create` (ASGI): el hash de la contraseña se espera sin ocupar un hilo.
+        """
+        serializer = self.get_serializer(data=request.data)
+
+        if await sync_to_async(serializer.is_valid)():  # Consulta si el username ya existe
+            await serializer.asave()
+            return Response({'user': serializer.data}, status=status.HTTP_201_CREATED)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
 
-class LoginViewSet(viewsets.ModelViewSet):
+class LoginViewSet(AsyncCreateMixin, viewsets.ModelViewSet):
     """
     Vista para el inicio de sesión de usuarios.
 
@@ -71,12 +147,14 @@ class LoginViewSet(viewsets.ModelViewSet):
         - http_method_names: Solo permite el método `POST`.
         - authentication_classes: No requiere autenticación para iniciar sesión.
         - permission_classes: Permite acceso a cualquier usuario.
+        - throttle_classes: Limita los intentos por IP y por nombre de usuario antes de verificar la contraseña.
     """
 
     serializer_class = LoginSerializer
     http_method_names = ['post']
     authentication_classes = [] # No se requiere autenticación para el Login
     permission_classes = [AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def create(self, request, *args, **kwargs):
         """
@@ -88,17 +166,39 @@ class LoginViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            user = get_object_or_404(User, username=serializer.validated_data['username'])
-            if user.check_password(serializer.validated_data['password']):
-                login(request, user)
-                return Response({
-                    "message": "Login exitoso",
-                    "Username": user.username,
-                }, status=status.HTTP_200_OK)
-            else:
-                return Response({"detail": "Invalid credentials"}, status=status.HTTP_400_BAD_REQUEST)
+            user = serializer.validated_data['user']  # La contraseña ya fue verificada por el serializador
+            login(request, user)
+            return Response({
+                "message": "Login exitoso",
+                "Username": user.username,
+            }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    async def acreate(self, request, *args, **kwargs):
+        """
+        Versión asíncrona de `create` (ASGI): la contraseña se verifica con `aauthenticate()`, que espera el pool
+        de hashing sin ocupar un hilo.
+        """
+        if request.user.is_authenticated:
+            await alogout(request)
+
+        context = {**self.get_serializer_context(), 'authenticate': False}
+        serializer = self.get_serializer(data=request.data, context=context)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        credentials = serializer.validated_data
+        try:
+            user = serializer.check_user(
+                await aauthenticate(request=request, username=credentials['username'], password=credentials['password'])
+            )
+        except ValidationError as exc:
+            return Response(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+        await alogin(request, user)
+        return Response({
+            "message": "Login exitoso",
+            "Username": user.username,
+        }, status=status.HTTP_200_OK)
+
 
 class TaskViewSet(viewsets.ModelViewSet):
     """
@@ -108,10 +208,14 @@ class TaskViewSet(viewsets.ModelViewSet):
         - serializer_class: Utiliza `TasksSerializer` para validar y gestionar las tareas.
         - permission_classes: Solo permite el acceso a usuarios autenticados.
         - authentication_classes: Soporta `SessionAuthentication` y `BasicAuthentication` dependiendo de la solicitud.
+        - renderer_classes / parser_classes: Además de JSON, acepta y devuelve NDJSON en columnas y MessagePack
+          (ver `api/renderers.py`), según `Accept`/`Content-Type` o `?format=ndjson|msgpack`.
     """
 
     serializer_class = TasksSerializer
     permission_classes = [IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *compact_renderers()]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, *compact_parsers()]
     # authentication_classes = [SessionAuthentication] # Para el navegador
     # authentication_classes = [BasicAuthentication] # Aparece PopUp en Navegador # Para clientes como Postman
     # authentication_classes = [SessionAuthentication, BasicAuthentication]  # Combinar ambas
@@ -121,34 +225,251 @@ class TaskViewSet(viewsets.ModelViewSet):
         Método sobrescrito para determinar la clase de autenticación a usar según el encabezado de la solicitud.
         """        
         if self.request.headers.get('Authorization'): # Si la solicitud contiene el encabezado Authorization, usar BasicAuthentication
-            return [BasicAuthentication()]
+            return [ThrottledBasicAuthentication()]  # Limita los intentos antes de verificar la contraseña
         else: # De lo contrario, usar SessionAuthentication para el navegador
             return [SessionAuthentication()] 
 
+    def get_archived(self):
+        """
+        Devuelve el nivel de almacenamiento pedido con `archived` ("false", "true" o "all").
+        Las tareas archivadas son de solo lectura: en métodos de escritura siempre se usan las activas.
+        Sin solicitud (al generar el esquema de la API) describe las tareas activas.
+        """
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return ARCHIVED_EXCLUDE
+        return parse_archived(self.request.GET)
+
+    def get_sparse_fields(self):
+        """
+        Devuelve la tupla de campos pedidos con `fields=id,name,...`, o `None` si se piden todos.
+        Solo aplica a lecturas. Los nombres se validan contra los campos declarados del serializador.
+        """
+        if self.request is None:  # Generación del esquema de la API: se describen todos los campos
+            return None
+        raw = self.request.GET.get('fields', '')
+        if self.request.method not in SAFE_METHODS or not raw.strip():
+            return None
+        requested = tuple(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+        allowed = self.get_serializer_class().Meta.fields
+        if self.get_archived() == ARCHIVED_INCLUDE:
+            archived_fields = ArchivedTasksSerializer.Meta.fields
+            allowed = [name for name in TasksSerializer.Meta.fields if name in archived_fields]  # Campos comunes a ambos niveles
+        unknown = [name for name in requested if name not in allowed]
+        if unknown:
+            raise ValidationError({"fields": f"Campos desconocidos: {', '.join(unknown)}. Permitidos: {', '.join(allowed)}."})
+        return requested
+
+    def get_ordering(self):
+        """
+        Devuelve el ordenamiento pedido con `ordering=` (ver `app_tasks/ordering.py`).
+        Solo se aceptan ordenamientos respaldados por índices; cualquier otro valor responde 400.
+        """
+        if self.request.method not in SAFE_METHODS:
+            return DEFAULT_TASK_ORDERING
+        try:
+            return parse_ordering(self.request.GET)
+        except InvalidOrdering as exc:
+            raise ValidationError({"ordering": f"Ordenamiento no permitido: {exc}. Permitidos: {', '.join(allowed_orderings())}."})
+
     def get_queryset(self):
         """
         Sobrescribe el método para obtener las tareas del usuario autenticado.
-        También permite filtrar por nombre, descripción y fecha de creación.
+        También permite filtrar por nombre, descripción y fecha de creación, y ordenar con `ordering=`.
+        Con `archived=true` consulta las tareas archivadas en lugar de las activas.
+        Con `fields=` lee de la base de datos solo las columnas pedidas.
         """
-        queryset = Tasks.objects.filter(user=self.request.user)
-        search_query = self.request.GET.get('q', '')
-        date_from = self.request.GET.get('date_from', '')
-        date_to = self.request.GET.get('date_to', '')
+        if self.get_archived() == ARCHIVED_ONLY:
+            queryset = ArchivedTasks.objects.filter(user=self.request.user)
+        else:
+            queryset = Tasks.objects.for_user(self.request.user)  # En el shard del usuario
+        queryset = apply_task_filters(queryset, parse_task_filters(self.request.GET))
+        return self.project_fields(order_tasks(queryset, self.get_ordering()))
 
-        if search_query:
-            queryset = queryset.filter(Q(name__icontains=search_query) | Q(description__icontains=search_query))
+    def get_archived_queryset(self):
+        """
+        Devuelve las tareas archivadas del usuario autenticado con los filtros de búsqueda y el orden aplicados.
+        """
+        queryset = ArchivedTasks.objects.filter(user=self.request.user)
+        queryset = apply_task_filters(queryset, parse_task_filters(self.request.GET))
+        return self.project_fields(order_tasks(queryset, self.get_ordering()))
 
-        if date_from:
-            date_from_parsed = parse_date(date_from)
-            if date_from_parsed:
-                queryset = queryset.filter(created_at__date__gte=date_from_parsed)
+    def project_fields(self, queryset):
+        """
+        Restringe las columnas del `SELECT` a los campos pedidos con `fields=` (el `id` siempre se incluye).
+        """
+        fields = self.get_sparse_fields()
+        return queryset.only(*fields) if fields else queryset
 
-        if date_to:
-            date_to_parsed = parse_date(date_to)
-            if date_to_parsed:
-                queryset = queryset.filter(created_at__date__lte=date_to_parsed)
+    def get_serializer(self, *args, **kwargs):
+        """
+        Método sobrescrito para pasar al serializador los campos pedidos con `fields=`.
+        """
+        kwargs.setdefault('fields', self.get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
 
-        return queryset
+    def get_serializer_class(self):
+        """
+        Método sobrescrito para usar `ArchivedTasksSerializer` al consultar tareas archivadas.
+        """
+        if self.get_archived() == ARCHIVED_ONLY:
+            return ArchivedTasksSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        """
+        Método sobrescrito para servir los listados repetidos (mismo usuario y filtros) desde el caché de consultas.
+        El caché se invalida al escribir cualquier tarea del usuario (ver `app_tasks/cache.py`).
+
+        - archived=false (por defecto): solo tareas activas.
+        - archived=true: solo tareas archivadas (no se cachean, se consultan con poca frecuencia).
+        - archived=all: tareas activas seguidas de las archivadas, por ejemplo para exportar.
+        """
+        archived = self.get_archived()
+        if archived == ARCHIVED_ONLY:
+            return super().list(request, *args, **kwargs)
+
+        fields = self.get_sparse_fields()
+        params = ("api", *parse_task_filters(request.GET), self.get_ordering(), fields)
+        tasks = cached_task_query(request.user.id, params, lambda: list(self.get_queryset()))
+        data = self.get_serializer(tasks, many=True).data
+        if archived == ARCHIVED_INCLUDE:
+            data += ArchivedTasksSerializer(self.get_archived_queryset(), many=True, fields=fields).data
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    def count(self, request, *args, **kwargs):
+        """
+        Devuelve la cantidad de tareas del usuario (con los filtros aplicados) en cada nivel de almacenamiento.
+        """
+        active = apply_task_filters(Tasks.objects.for_user(request.user), parse_task_filters(request.GET)).count()
+        archived = self.get_archived_queryset().count()
+        return Response({"active": active, "archived": archived, "total": active + archived})
+
+    @action(detail=False, methods=['get'])
+    def batch(self, request, *args, **kwargs):
+        """
+        Devuelve varias tareas activas del usuario a partir de una lista de ids (`ids=3,1,7`), con una única
+        consulta `WHERE user = ? AND id IN (...)` en lugar de una solicitud por tarea.
+
+        Las tareas se devuelven en `results` en el orden de los ids pedidos (sin repetidos), y los ids que no
+        existen, son de otro usuario o están archivados se informan en `missing`. Se aceptan hasta
+        `TASKS_BATCH_MAX_IDS` ids; también admite `fields=`. Con `archived=true|all` responde 400: solo se leen
+        tareas activas.
+        """
+        if self.get_archived() != ARCHIVED_EXCLUDE:
+            raise ValidationError({"archived": "La consulta por ids solo devuelve tareas activas."})
+        ids = self.get_batch_ids()
+        tasks = self.project_fields(Tasks.objects.for_user(request.user)).in_bulk(ids)
+        data = self.get_serializer([tasks[pk] for pk in ids if pk in tasks], many=True).data
+        return Response({"results": data, "missing": [pk for pk in ids if pk not in tasks]})
+
+    def get_batch_ids(self):
+        """
+        Devuelve los ids pedidos con `ids=` sin repetidos y en orden, o responde 400 si faltan, no son números
+        (solo dígitos ASCII) entre 1 y 2**63 - 1, o superan `TASKS_BATCH_MAX_IDS`.
+        """
+        raw = [value.strip() for value in self.request.GET.get('ids', '').split(',') if value.strip()]
+        if not raw:
+            raise ValidationError({"ids": "Indique los ids de las tareas separados por comas (ids=1,2,3)."})
+        # `str.isdigit()` acepta dígitos Unicode ("²") que `int()` rechaza
+        invalid = [value for value in raw if not re.fullmatch(r"\d+", value, re.ASCII) or not 0 < int(value) <= MAX_TASK_ID]
+        if invalid:
+            raise ValidationError({"ids": f"Ids inválidos: {', '.join(invalid)}."})
+        ids = list(dict.fromkeys(map(int, raw)))
+        if len(ids) > settings.TASKS_BATCH_MAX_IDS:
+            raise ValidationError({"ids": f"Se pueden pedir hasta {settings.TASKS_BATCH_MAX_IDS} tareas por solicitud."})
+        return ids
+
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request, *args, **kwargs):
+        """
+        Cambia el estado de todas las tareas que cumplen los filtros (`q`, `date_from`, `date_to`) con un único
+        `UPDATE ... WHERE user = ?`, sin cargar ni validar cada tarea. También actualiza `updated_at`.
+
+        Como `update()` no envía señales, se invalidan explícitamente los cachés del usuario y se publica un
+        evento `invalidated` en su stream.
+        Devuelve la cantidad de tareas modificadas.
+        """
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data['status']
+
+        queryset = self.get_queryset().exclude(status=target)  # Las que ya tienen el estado no se reescriben
+        updated = queryset.update(status=target, updated_at=timezone.now(), version=F('version') + 1)
+        if updated:
+            bump_user_generation(request.user.id)
+            publish_event(request.user.id, TASKS_INVALIDATED)
+        logger.info(f"Cambio de estado masivo a '{target}' de {updated} tareas por el usuario: {request.user}")
+        return Response({"updated": updated, "status": target}, status=status.HTTP_200_OK)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Método sobrescrito para enviar la `ETag` (versión) de la tarea, que se usa en `If-Match` al modificarla.
+        """
+        instance = self.get_object()
+        headers = {"ETag": instance.etag} if isinstance(instance, Tasks) else {}
+        return Response(self.get_serializer(instance).data, headers=headers)
+
+    def update(self, request, *args, **kwargs):
+        """
+        Método sobrescrito (PUT y PATCH) con control de concurrencia optimista, sin bloquear la fila:
+
+        - Con `If-Match: "<versión>"` (la `ETag` de la tarea), si la tarea ya no está en esa versión responde
+          412 (PRECONDITION FAILED) con la `ETag` actual, sin escribir.
+        - La escritura es un `UPDATE ... WHERE id = ? AND version = ?` (ver `Tasks.save_if_version`). Si otra
+          escritura se adelanta entre la lectura y el `UPDATE`, responde 412 (o 409 si no se envió `If-Match`)
+          en lugar de sobrescribirla.
+
+        La respuesta incluye la nueva `ETag`.
+        """
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        has_precondition = self.check_if_match(instance)
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        expected_version = instance.version
+        for name, value in serializer.validated_data.items():
+            setattr(instance, name, value)
+        if not instance.save_if_version(expected_version):
+            logger.info(f"Modificación concurrente rechazada de la tarea {instance.pk} por el usuario: {request.user}")
+            if has_precondition:
+                current = Tasks.objects.for_user(request.user).filter(pk=instance.pk).values_list('version', flat=True).first()
+                raise PreconditionFailed(etag=f'"{current}"' if current is not None else None)
+            raise EditConflict()
+        logger.info(f"Tarea {instance.pk} modificada por el usuario: {request.user}")
+        return Response(serializer.data, headers={"ETag": instance.etag})
+
+    def check_if_match(self, instance):
+        """
+        Verifica el encabezado `If-Match` contra la versión leída de la tarea. Devuelve `True` si la solicitud
+        lo incluye y coincide, `False` si no lo incluye, o responde 412 si no coincide. Se aceptan `*` y las
+        `ETag` débiles (`W/"3"`): la `ETag` depende solo de la versión, no de la codificación del cuerpo.
+        """
+        header = self.request.headers.get('If-Match')
+        if header is None:
+            return False
+        tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+        if '*' not in tags and instance.etag not in tags:
+            raise PreconditionFailed(etag=instance.etag)
+        return True
+
+    def create(self, request, *args, **kwargs):
+        """
+        Método sobrescrito para aceptar también una lista de tareas (por ejemplo, un cuerpo NDJSON de varias filas).
+        Se validan todas y se crean en una única transacción: si alguna es inválida no se crea ninguna y se
+        responde 400 con los errores de cada posición. Se aceptan hasta `TASKS_BULK_CREATE_MAX_ITEMS` tareas.
+        """
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        if len(request.data) > settings.TASKS_BULK_CREATE_MAX_ITEMS:
+            raise ValidationError(f"Se pueden crear hasta {settings.TASKS_BULK_CREATE_MAX_ITEMS} tareas por solicitud.")
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        # Todas las tareas del usuario están en la misma base (su shard, si hay shards)
+        with transaction.atomic(using=Tasks.objects.for_user(request.user).db):
+            serializer.save(user=request.user)
+        logger.info(f"{len(serializer.data)} tareas creadas en lote por el usuario: {request.user}")
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def perform_create(self, serializer):
         """
@@ -181,7 +502,7 @@ class LogoutViewSet(viewsets.ModelViewSet):
         Método sobrescrito para determinar la clase de autenticación a usar según el encabezado de la solicitud.
         """
         if self.request.headers.get('Authorization'): # Si la solicitud contiene el encabezado Authorization, usar BasicAuthentication
-            return [BasicAuthentication()]
+            return [ThrottledBasicAuthentication()]  # Limita los intentos antes de verificar la contraseña
         else: # De lo contrario, usar SessionAuthentication para el navegador            
             return [SessionAuthentication()]
 
@@ -198,3 +519,107 @@ class LogoutViewSet(viewsets.ModelViewSet):
         """
         logout(request)
         return Response({"message": "Logout exitoso (GET)"}, status=status.HTTP_200_OK)
+
+
+class QueryCacheStatsViewSet(viewsets.ViewSet):
+    """
+    Vista con los aciertos, fallos y la tasa de aciertos del caché de consultas de tareas (ver `app_tasks/cache.py`).
+
+    Los contadores son de cada proceso: la respuesta incluye el `pid` del worker que la atendió.
+
+    Atributos:
+        - permission_classes: Solo permite el acceso a usuarios del staff.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get_authenticators(self):
+        """
+        Método sobrescrito para determinar la clase de autenticación a usar según el encabezado de la solicitud.
+        """
+        if self.request.headers.get('Authorization'):
+            return [ThrottledBasicAuthentication()]  # Limita los intentos antes de verificar la contraseña
+        return [SessionAuthentication()]
+
+    def list(self, request):
+        """
+        Devuelve las estadísticas del caché de consultas de este proceso.
+        """
+        return Response({"pid": os.getpid(), **get_query_cache_stats()})
+
+
+async def authenticate_stream(request):
+    """
+    Devuelve el usuario de la sesión o de la autenticación básica (con sus throttles), o `None`.
+    Lanza las excepciones de DRF (`AuthenticationFailed`, `Throttled`) si las credenciales no son válidas.
+    """
+    user = await request.auser()
+    if user.is_authenticated:
+        return user
+    result = await sync_to_async(ThrottledBasicAuthentication().authenticate)(request)
+    return result[0] if result else None
+
+
+def parse_last_event_id(request):
+    """
+    Devuelve el `id` del último evento recibido por el cliente (cabecera `Last-Event-ID`), o `None`.
+    """
+    try:
+        return int(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        return None
+
+
+@require_GET
+async def task_event_stream(request):
+    """
+    Envía por Server-Sent Events las altas, modificaciones y bajas de las tareas del usuario autenticado.
+
+    - Cada evento tiene `id`, tipo (`created`, `updated`, `deleted` o `invalidated`) y datos en JSON.
+    - Al reconectarse con `Last-Event-ID` se reenvían los eventos perdidos; si ya no están disponibles se
+      envía `reset` y el cliente debe volver a leer `/api/tasks/`.
+    - Sin eventos durante `TASK_EVENTS_HEARTBEAT` segundos se envía un comentario para mantener la conexión.
+    - Si el cliente no lee a tiempo y su cola se llena, se envía `overflow` y se cierra la conexión.
+
+    La conexión no ocupa un hilo mientras espera eventos: por eso la vista es asíncrona y solo se sirve con ASGI.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"detail": "El stream de eventos requiere un servidor ASGI."}, status=501)
+    try:
+        user = await authenticate_stream(request)
+    except APIException as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+    if user is None:
+        response = JsonResponse({"detail": "Las credenciales de autenticación no se proveyeron."}, status=401)
+        response["WWW-Authenticate"] = 'Basic realm="api"'
+        return response
+
+    broker = get_broker()
+    subscription, replay = broker.subscribe(user.pk, parse_last_event_id(request))
+    heartbeat = settings.TASK_EVENTS_HEARTBEAT
+
+    async def events():
+        try:
+            yield f"retry: {int(heartbeat * 1000)}\n\n"
+            if replay is None:
+                yield "event: reset\ndata: {}\n\n"
+            for event in replay or ():
+                yield event.to_sse()
+            while True:
+                try:
+                    event = await subscription.get(heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event is None:
+                    logger.info(f"Stream de eventos desbordado, se desconecta al usuario: {user}")
+                    yield "event: overflow\ndata: {}\n\n"
+                    return
+                yield event.to_sse()
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # Evita que un proxy (nginx) acumule los eventos
+    return response
@@ -0,0 +1,80 @@
+"""
+Comando de generación de la hoja de estilos con el CLI standalone de Tailwind
+
+Uso:
+    python manage.py build_css            # Escribe TAILWIND_OUTPUT con las clases usadas en las plantillas
+    python manage.py build_css --check    # Falla si el archivo no coincide con las plantillas actuales (CI)
+
+Ejecuta el ejecutable standalone de Tailwind v4 (`TAILWIND_CLI`, sin Node.js; lo instala el paquete
+`tailwindcss-bin` de requirements.txt) con `TAILWIND_INPUT` como entrada. Las clases se buscan en los patrones de
+`TAILWIND_CONTENT` y en las plantillas y módulos de los paquetes de `TAILWIND_CONTENT_PACKAGES`, que se agregan a
+la entrada como directivas `@source`. El resultado, minificado, se guarda en el repositorio: el despliegue no
+necesita el CLI. Se debe ejecutar después
+de cambiar clases en las plantillas; luego `collectstatic` publica el archivo con hash y sus variantes comprimidas.
+"""
+
+import shutil
+import subprocess
+import tempfile
+from importlib.util import find_spec
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def content_globs():
+    """
+    Devuelve los patrones de archivos que recorre Tailwind para encontrar las clases usadas.
+    """
+    globs = [str(Path(settings.BASE_DIR) / pattern) for pattern in settings.TAILWIND_CONTENT]
+    for package in settings.TAILWIND_CONTENT_PACKAGES:
+        spec = find_spec(package)
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for location in spec.submodule_search_locations:
+            globs += [str(Path(location) / "**" / "*.html"), str(Path(location) / "**" / "*.py")]
+    return globs
+
+
+class Command(BaseCommand):
+    help = "Genera la hoja de estilos con las clases de Tailwind usadas en las plantillas (CLI standalone)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Solo verifica que el archivo esté actualizado.")
+
+    def handle(self, *args, **options):
+        cli = shutil.which(settings.TAILWIND_CLI)
+        if cli is None:
+            raise CommandError(
+                f"No se encontró el CLI de Tailwind ({settings.TAILWIND_CLI}). Descargue el ejecutable standalone "
+                "con `pip install -r requirements.txt` (paquete tailwindcss-bin) o indique su ruta en TAILWIND_CLI."
+            )
+        content = self.run_cli(cli)
+
+        output = Path(settings.TAILWIND_OUTPUT)
+        if options["check"]:
+            if not output.exists() or output.read_bytes() != content:
+                raise CommandError(f"{output} está desactualizado. Ejecute `python manage.py build_css`.")
+            self.stdout.write(self.style.SUCCESS(f"{output} está actualizado."))
+            return
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(content)
+        self.stdout.write(self.style.SUCCESS(f"Hoja de estilos guardada en {output} ({len(content)} bytes)."))
+
+    def run_cli(self, cli):
+        """
+        Ejecuta el CLI sobre una copia temporal de la entrada con los `@source` de `content_globs()` y devuelve la
+        hoja de estilos generada.
+        """
+        sources = "".join(f'@source "{pattern}";\n' for pattern in content_globs())
+        with tempfile.TemporaryDirectory() as directory:
+            source = Path(directory) / "input.css"
+            source.write_text(Path(settings.TAILWIND_INPUT).read_text(encoding="utf-8") + sources, encoding="utf-8")
+            target = Path(directory) / "app.css"
+            result = subprocess.run(
+                [cli, "--input", str(source), "--output", str(target), "--minify", "--cwd", directory],
+                capture_output=True, text=True,
+            )
+            if result.returncode != 0 or not target.exists():
+                raise CommandError(f"El CLI de Tailwind falló:\n{result.stderr}")
+            return target.read_bytes()
@@ -0,0 +1,42 @@
+"""
+Comando de perfil del arranque de un worker
+
+Uso:
+    python manage.py profile_startup                 # Importaciones por aplicación y módulos más costosos
+    python manage.py profile_startup --top 30
+    python manage.py profile_startup --warmup        # Además, mide cada paso del precalentamiento
+
+Las importaciones se miden en un intérprete nuevo (`python -X importtime`), desde `django.setup()` hasta cargar
+el URLconf. Ver `_Project_TodoList/startup.py`.
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from _Project_TodoList.startup import app_import_times, profile_imports, warm_up
+
+
+class Command(BaseCommand):
+    help = "Muestra el tiempo de importación de cada aplicación al iniciar un worker y, opcionalmente, del precalentamiento."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=15, help="Cantidad de módulos más costosos a mostrar.")
+        parser.add_argument("--warmup", action="store_true", help="Ejecuta y mide el precalentamiento (STARTUP_WARMUP).")
+
+    def handle(self, *args, **options):
+        timings = profile_imports()
+        total = sum(timing.own_ms for timing in timings)
+        app_names = [config.name for config in apps.get_app_configs()]
+
+        self.stdout.write(f"Importaciones al iniciar: {len(timings)} módulos, {total:.1f} ms\n")
+        self.stdout.write("Por aplicación (INSTALLED_APPS, incluye lo que cada una importó primero):")
+        for app, elapsed in sorted(app_import_times(timings, app_names).items(), key=lambda item: -item[1]):
+            self.stdout.write(f"  {elapsed:8.1f} ms  {app}")
+
+        self.stdout.write("\nMódulos más costosos (tiempo propio):")
+        for timing in sorted(timings, key=lambda timing: -timing.own_ms)[: options["top"]]:
+            self.stdout.write(f"  {timing.own_ms:8.1f} ms  {timing.module}  (importado por {timing.parent or '-'})")
+
+        if options["warmup"]:
+            self.stdout.write("\nPrecalentamiento:")
+            for name, count, elapsed in warm_up():
+                self.stdout.write(f"  {elapsed:8.1f} ms  {name} ({count})")
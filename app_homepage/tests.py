@@ -1,3 +1,221 @@
-from django.test import TestCase
+"""
+Pruebas de la aplicación de la página de inicio y del arranque de los workers
 
-# Create your tests here.
+Clases:
+- StartupWarmupTest: Pruebas del precalentamiento y del perfil de importaciones (`_Project_TodoList/startup.py`).
+- StaticAssetsTest: Pruebas de la hoja de estilos precompilada y de los archivos estáticos con hash.
+- CompressionMiddlewareTest: Pruebas de la compresión de las respuestas (`_Project_TodoList/compression.py`).
+"""
+
+import brotli
+import gzip
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.template import engines
+from django.templatetags.static import static
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from _Project_TodoList.compression import CompressionMiddleware, negotiate_encoding
+from _Project_TodoList.startup import ImportTiming, app_import_times, warm_up
+from app_tasks.models import Tasks
+
+
+class StartupWarmupTest(TestCase):
+    """
+    Pruebas del precalentamiento de los workers y del perfil de importaciones.
+    """
+
+    def test_warm_up_compiles_project_templates(self):
+        """
+        Verifica que el precalentamiento deje las plantillas del proyecto en el loader con caché.
+        """
+        loader = engines["django"].engine.template_loaders[0]
+        loader.reset()
+        steps = {name: count for name, count, _ in warm_up()}
+        self.assertEqual(set(steps), {"rutas", "plantillas", "traducciones", "drf", "bases de datos"})
+        for name in ["base.html", "app_tasks/task_list.html", "rest_framework/api.html"]:
+            self.assertIn(name, loader.get_template_cache)
+
+    def test_app_import_times_counts_first_importer(self):
+        """
+        Verifica que cada módulo se atribuya a la aplicación que lo importó primero, sin contarlo dos veces.
+        """
+        timings = [
+            ImportTiming("rest_framework.compat", 5.0, 40.0, "rest_framework.serializers"),
+            ImportTiming("rest_framework.serializers", 1.0, 41.0, "api.views"),
+            ImportTiming("api.views", 2.0, 43.0, "api.urls"),
+            ImportTiming("api.urls", 1.0, 44.0, None),
+            ImportTiming("app_tasks.models", 3.0, 3.0, None),
+        ]
+        totals = app_import_times(timings, ["rest_framework", "api", "app_tasks"])
+        self.assertEqual(totals, {"rest_framework": 41.0, "api": 44.0, "app_tasks": 3.0})
+
+    def test_profile_startup_command(self):
+        """
+        Verifica que el comando muestre las importaciones por aplicación y los pasos del precalentamiento.
+        """
+        out = StringIO()
+        call_command("profile_startup", "--top", "3", "--warmup", stdout=out)
+        self.assertIn("app_tasks", out.getvalue())
+        self.assertIn("plantillas", out.getvalue())
+
+
+class StaticAssetsTest(TestCase):
+    """
+    Pruebas de la hoja de estilos generada con `build_css` y de `collectstatic` con nombres con hash y variantes comprimidas.
+    """
+
+    @skipUnless(shutil.which(settings.TAILWIND_CLI), "El CLI standalone de Tailwind no está instalado.")
+    def test_stylesheet_is_up_to_date(self):
+        """
+        Verifica que `assets/css/app.css` corresponda a las clases usadas en las plantillas actuales.
+        """
+        call_command("build_css", "--check", stdout=StringIO(), stderr=StringIO())
+
+    def test_build_css_requires_the_cli(self):
+        """
+        Verifica que, sin el CLI de Tailwind, `build_css` falle con un mensaje claro sin tocar la hoja de estilos.
+        """
+        output = Path(settings.TAILWIND_OUTPUT)
+        content = output.read_bytes()
+        with override_settings(TAILWIND_CLI="tailwindcss-no-instalado"):
+            with self.assertRaisesMessage(CommandError, "No se encontró el CLI de Tailwind"):
+                call_command("build_css", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(output.read_bytes(), content)
+
+    def test_base_template_uses_local_stylesheet(self):
+        """
+        Verifica que las páginas usen la hoja de estilos local en lugar del compilador de Tailwind del CDN.
+        """
+        response = self.client.get(reverse("login"))
+        self.assertContains(response, static("css/app.css"))
+        self.assertNotContains(response, "cdn.tailwindcss.com")
+
+    def test_collectstatic_serves_hashed_and_compressed_files(self):
+        """
+        Verifica que `collectstatic` genere el nombre con hash y las variantes gzip y brotli, y que se sirvan con
+        caché de un año según `Accept-Encoding`.
+        """
+        with tempfile.TemporaryDirectory() as static_root, override_settings(STATIC_ROOT=static_root):
+            call_command("collectstatic", "--noinput", verbosity=0)
+            self.assertFalse((Path(static_root) / "css" / "tailwind.css").exists())  # Entrada de build_css
+            url = static("css/app.css")
+            self.assertRegex(url, r"^/static/css/app\.[0-9a-f]{12}\.css$")
+
+            response = self.client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+            self.assertIn("Accept-Encoding", response["Vary"])
+            self.assertEqual(response["Content-Type"], "text/css")
+            content = gzip.decompress(b"".join(response.streaming_content))
+
+            response = self.client.get(url, headers={"Accept-Encoding": "gzip, deflate, br"})
+            self.assertEqual(response["Content-Encoding"], "br")
+            self.assertEqual(brotli.decompress(b"".join(response.streaming_content)), content)
+
+            response = self.client.get(url)
+            self.assertFalse(response.has_header("Content-Encoding"))
+            self.assertEqual(b"".join(response.streaming_content), content)
+
+            for refused in ["gzip;q=0.0", "gzip;q=0.000, identity"]:
+                response = self.client.get(url, headers={"Accept-Encoding": refused})
+                self.assertFalse(response.has_header("Content-Encoding"))
+                self.assertEqual(b"".join(response.streaming_content), content)
+
+            response = self.client.get(url, headers={"If-Modified-Since": response["Last-Modified"]})
+            self.assertEqual(response.status_code, 304)
+            self.assertIn("Accept-Encoding", response["Vary"])
+            self.assertEqual(response["Cache-Control"], "public, max-age=31536000, immutable")
+
+            response = self.client.get("/static/css/app.css")
+            self.assertEqual(response["Cache-Control"], "no-cache")
+            self.assertEqual(self.client.get("/static/../manage.py").status_code, 404)
+
+
+class CompressionMiddlewareTest(TestCase):
+    """
+    Pruebas de la negociación, los límites de tamaño y tipo y la compresión en streaming.
+    """
+
+    def compress_response(self, response, accept_encoding="gzip"):
+        request = RequestFactory().get("/", headers={"Accept-Encoding": accept_encoding})
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_negotiate_encoding(self):
+        """
+        Verifica que se respeten los valores `q`, el comodín y la preferencia del servidor ante empates.
+        """
+        encodings = ["br", "gzip"]
+        self.assertEqual(negotiate_encoding("gzip, deflate, br", encodings), "br")
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip", encodings), "gzip")
+        self.assertEqual(negotiate_encoding("*", encodings), "br")
+        self.assertEqual(negotiate_encoding("*;q=0, gzip", encodings), "gzip")
+        self.assertIsNone(negotiate_encoding("gzip;q=0, identity", encodings))
+        self.assertIsNone(negotiate_encoding("", encodings))
+        self.assertEqual(negotiate_encoding("br, gzip", ["gzip"]), "gzip")  # Sin el paquete brotli
+
+    def test_api_task_list_is_compressed(self):
+        """
+        Verifica que una lista grande de `/api/tasks/` se envíe comprimida y se pueda descomprimir.
+        """
+        user = User.objects.create_user(username="compress", password="password123")
+        for index in range(30):
+            Tasks.objects.create(name=f"Tarea {index}", description="Descripción de la tarea " * 3, user=user)
+        self.client.force_login(user)
+        response = self.client.get("/api/tasks/", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 30)
+
+        response = self.client.get("/api/tasks/")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(response.json()), 30)
+
+    def test_brotli_is_preferred(self):
+        """
+        Verifica que, si el cliente acepta brotli, las respuestas normales y en streaming se envíen con `br`.
+        """
+        content = json.dumps([{"id": index, "name": f"Tarea {index}"} for index in range(200)]).encode()
+        response = self.compress_response(HttpResponse(content, content_type="application/json"), "gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), content)
+
+        chunks = [content[index:index + 1000] for index in range(0, len(content), 1000)]
+        response = StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson")
+        response = self.compress_response(response, "br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(b"".join(response.streaming_content)), content)
+
+    def test_small_and_excluded_responses_are_not_compressed(self):
+        """
+        Verifica que no se compriman las respuestas chicas, los tipos fuera de la lista ni las ya comprimidas.
+        """
+        small = self.compress_response(HttpResponse(b"x" * 100, content_type="application/json"))
+        self.assertFalse(small.has_header("Content-Encoding"))
+        image = self.compress_response(HttpResponse(b"x" * 5000, content_type="image/png"))
+        self.assertFalse(image.has_header("Content-Encoding"))
+        events = StreamingHttpResponse(iter([b"data: x\n\n"] * 1000), content_type="text/event-stream")
+        self.assertFalse(self.compress_response(events).has_header("Content-Encoding"))
+        encoded = HttpResponse(b"x" * 5000, content_type="text/css", headers={"Content-Encoding": "br"})
+        self.assertEqual(self.compress_response(encoded)["Content-Encoding"], "br")
+
+    def test_streaming_response_is_compressed_by_chunks(self):
+        """
+        Verifica que una respuesta en streaming se comprima parte por parte y que la ETag pase a ser débil.
+        """
+        chunks = [json.dumps({"id": index, "name": f"Tarea {index}"}).encode() + b"\n" for index in range(200)]
+        response = StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson", headers={"ETag": '"abc"'})
+        response = self.compress_response(response, "br;q=0, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        parts = list(response.streaming_content)
+        self.assertGreater(len(parts), 1)
+        self.assertEqual(gzip.decompress(b"".join(parts)), b"".join(chunks))
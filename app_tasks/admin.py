@@ -1,12 +1,180 @@
 # Register your models here.
-from django.contrib import admin
-from .models import Tasks
+from django.contrib import admin, messages
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+from .cache import bump_user_generation
+from .events import TASKS_INVALIDATED, publish_event
+from .models import ArchivedTasks, Tasks
+from .retention import delete_in_chunks
+from .sharding import is_sharded, shard_aliases
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador para tablas muy grandes.
+
+    - count: Cuenta como máximo `max_count` filas (`COUNT(*)` sobre una subconsulta con `LIMIT`). Es exacto
+      hasta ese tope (también tras archivar o eliminar tareas) y no recorre el resto de la tabla; por encima
+      del tope solo se ofrecen las primeras `max_count` filas y se acota con los filtros, la búsqueda o las fechas.
+    - page: Primero lee solo los `id` de la página (recorriendo únicamente el índice) y luego trae las filas
+      con `id IN (...)`, en lugar de un `OFFSET` sobre las filas completas. El `OFFSET` nunca supera `max_count`.
+    """
+
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        return self.object_list.values("pk")[:self.max_count].count()
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        ids = list(self.object_list.values_list("pk", flat=True)[bottom:bottom + self.per_page])
+        return self._get_page(list(self.object_list.filter(pk__in=ids)), number, self)
+
+
+class TaskShardListFilter(admin.SimpleListFilter):
+    """
+    Filtro que elige el shard listado. Con shards, el listado muestra un shard a la vez (por defecto el primero):
+    paginar y ordenar sobre varias bases a la vez obligaría a leer todas las páginas anteriores de cada una.
+    """
+
+    title = "shard"
+    parameter_name = "shard"
+
+    def lookups(self, request, model_admin):
+        return [(alias, alias) for alias in shard_aliases()]
+
+    def has_output(self):
+        return is_sharded()
+
+    def value(self):
+        value = super().value()
+        shards = shard_aliases()
+        return value if value in shards else (shards[0] if shards else None)
+
+    def choices(self, changelist):
+        # Sin la opción "Todos": siempre se lista un único shard
+        for lookup, title in self.lookup_choices:
+            yield {
+                "selected": self.value() == lookup,
+                "query_string": changelist.get_query_string({self.parameter_name: lookup}),
+                "display": title,
+            }
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.using(self.value())
+        return queryset
 
 
 class TasksAdmin(admin.ModelAdmin):
     model = Tasks
     list_display = ["id", "name", "user", "status", "description", "created_at", "updated_at"]
-    search_fields = ["name", "created_at"]  # Filtros de búsqueda
+    list_select_related = ["user"]  # Trae el usuario con un JOIN en lugar de una consulta por fila
+    list_filter = [TaskShardListFilter, "status"]
+    search_fields = ["name", "=user__username"]  # Filtros de búsqueda (las fechas se filtran con date_hierarchy)
+    date_hierarchy = "created_at"  # Navegación por fechas usando el índice de `created_at`
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # Evita un segundo COUNT(*) sobre toda la tabla al filtrar
+    actions = ["mark_completed", "mark_in_progress", "mark_not_started", "delete_selected_in_chunks"]
+
+    def get_list_select_related(self, request):
+        """
+        Con shards la tabla de usuarios está en otra base: no se puede hacer el JOIN (ver `get_queryset`).
+        """
+        return [] if is_sharded() else super().get_list_select_related(request)
+
+    def get_queryset(self, request):
+        """
+        Con shards, los usuarios se traen con una consulta adicional a `default` para toda la página.
+        """
+        queryset = super().get_queryset(request)
+        return queryset.prefetch_related("user") if is_sharded() else queryset
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Con shards, la búsqueda exacta por usuario resuelve primero los `id` en `default` (sin JOIN).
+        """
+        if not is_sharded():
+            return super().get_search_results(request, queryset, search_term)
+        user_ids = list(User.objects.filter(username=search_term.strip()).values_list("pk", flat=True))
+        matches = Q(name__icontains=search_term) | Q(user_id__in=user_ids)
+        return queryset.filter(matches), False
+
+    def get_object(self, request, object_id, from_field=None):
+        """
+        Con shards, busca la tarea en cada shard: los `id` son únicos entre todos ellos.
+        """
+        if not is_sharded():
+            return super().get_object(request, object_id, from_field)
+        queryset = self.get_queryset(request)
+        for alias in shard_aliases():
+            task = queryset.using(alias).filter(pk=object_id).first()
+            if task is not None:
+                return task
+        return None
+
+    def get_actions(self, request):
+        """
+        Quita la acción `delete_selected` de Django, que carga todas las tareas para confirmar; se reemplaza
+        por `delete_selected_in_chunks`.
+        """
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def update_status(self, request, queryset, status):
+        """
+        Cambia el estado de las tareas seleccionadas con un único UPDATE y luego invalida los cachés (y los streams) de sus usuarios.
+        """
+        user_ids = list(queryset.values_list("user_id", flat=True).distinct())
+        updated = queryset.exclude(status=status).update(status=status, updated_at=timezone.now(), version=F("version") + 1)
+        for user_id in user_ids:
+            bump_user_generation(user_id)
+            publish_event(user_id, TASKS_INVALIDATED)
+        self.message_user(request, f"Tareas actualizadas: {updated}.", messages.SUCCESS)
+
+    @admin.action(description="Marcar como finalizadas", permissions=["change"])
+    def mark_completed(self, request, queryset):
+        self.update_status(request, queryset, "completed")
+
+    @admin.action(description="Marcar como en progreso", permissions=["change"])
+    def mark_in_progress(self, request, queryset):
+        self.update_status(request, queryset, "in_progress")
+
+    @admin.action(description="Marcar como no iniciadas", permissions=["change"])
+    def mark_not_started(self, request, queryset):
+        self.update_status(request, queryset, "not_started")
+
+    @admin.action(description="Eliminar tareas seleccionadas (en lotes)", permissions=["delete"])
+    def delete_selected_in_chunks(self, request, queryset):
+        deleted = 0
+        for deleted in delete_in_chunks(queryset):
+            pass
+        self.message_user(request, f"Tareas eliminadas: {deleted}.", messages.SUCCESS)
 
 
 admin.site.register(Tasks, TasksAdmin)  # Parámetros: El Modelo y su Clase Registradora
+
+
+class ArchivedTasksAdmin(admin.ModelAdmin):
+    model = ArchivedTasks
+    list_display = ["id", "name", "user", "status", "created_at", "updated_at", "archived_at"]
+    search_fields = ["name"]  # Filtros de búsqueda
+    list_select_related = ["user"]
+    actions = ["delete_selected_in_chunks"]
+
+    @admin.action(description="Eliminar tareas archivadas seleccionadas (en lotes)", permissions=["delete"])
+    def delete_selected_in_chunks(self, request, queryset):
+        deleted = 0
+        for deleted in delete_in_chunks(queryset):
+            pass
+        self.message_user(request, f"Tareas archivadas eliminadas: {deleted}.", messages.SUCCESS)
+
+
+admin.site.register(ArchivedTasks, ArchivedTasksAdmin)
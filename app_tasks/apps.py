@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AppTasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app_tasks"
+
+    def ready(self):
+        from . import signals  # noqa: F401  Registra los receptores de señales de `Tasks`
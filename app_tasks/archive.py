@@ -0,0 +1,72 @@
+"""
+Archivado de tareas finalizadas
+
+Mueve las tareas con estado `completed` cuya última actualización es más antigua que
+`TASKS_ARCHIVE_AFTER_DAYS` desde `Tasks` hacia `ArchivedTasks`.
+
+El movimiento se hace en lotes acotados por `id`: cada lote es una transacción corta (copiar, eliminar de la
+tabla activa y descartar las copias de las tareas que no se eliminaron), con una pausa opcional entre lotes para
+no acaparar el lock de escritura de SQLite. Se puede interrumpir y reanudar en cualquier momento. Con shards,
+cada shard se archiva por separado.
+
+La eliminación vuelve a aplicar el criterio (finalizada y sin cambios desde el corte): una tarea reabierta o
+editada después de leer el lote sigue activa y su copia se descarta, en lugar de perder la versión vigente.
+
+Funciones:
+- archive_completed_tasks: Archiva las tareas elegibles y devuelve el progreso lote a lote.
+"""
+
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import router, transaction
+from django.utils import timezone
+from .models import ArchivedTasks, Tasks
+from .sharding import task_databases
+
+ARCHIVED_FIELDS = ["id", "name", "description", "status", "created_at", "updated_at", "user_id"]
+
+
+def archive_completed_tasks(older_than_days=None, batch_size=500, sleep=0.0, now=None):
+    """
+    Archiva las tareas finalizadas antiguas en lotes. Es un generador: produce el total archivado tras cada lote.
+
+    - older_than_days: Antigüedad mínima (por `updated_at`); por defecto `TASKS_ARCHIVE_AFTER_DAYS`.
+    - batch_size: Tareas por lote (por transacción).
+    - sleep: Segundos de pausa entre lotes.
+    """
+    if older_than_days is None:
+        older_than_days = settings.TASKS_ARCHIVE_AFTER_DAYS
+    cutoff = (now or timezone.now()) - timedelta(days=older_than_days)
+
+    archive_alias = router.db_for_write(ArchivedTasks)
+    archived = 0
+    for alias in task_databases():  # Cada shard (o `default`) se archiva por separado
+        eligible = Tasks.objects.using(alias).filter(status="completed", updated_at__lt=cutoff).order_by("id")
+        last_id = 0
+        while True:
+            rows = list(eligible.filter(id__gt=last_id).values(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                break
+            ids = [row["id"] for row in rows]
+            # Sin shards ambas tablas están en la misma base y el lote es una única transacción. Con shards, la
+            # transacción del archivo se confirma antes que la eliminación: si el proceso se interrumpe entre
+            # ambas, quedan copias de tareas aún activas (que la próxima ejecución actualiza), nunca tareas perdidas
+            with transaction.atomic(using=alias), transaction.atomic(using=archive_alias):
+                # Si una ejecución interrumpida dejó una copia, se reemplaza por la versión actual
+                ArchivedTasks.objects.using(archive_alias).bulk_create(
+                    [ArchivedTasks(**row) for row in rows],
+                    update_conflicts=True, unique_fields=["id"], update_fields=ARCHIVED_FIELDS[1:],
+                )
+                # Se vuelve a aplicar el criterio: no se eliminan las tareas reabiertas o editadas desde la lectura.
+                # `delete()` envía `post_delete` por tarea: invalida los cachés de cada usuario afectado
+                eligible.filter(id__in=ids).delete()
+                kept = list(Tasks.objects.using(alias).filter(id__in=ids).values_list("id", flat=True))
+                if kept:
+                    ArchivedTasks.objects.using(archive_alias).filter(id__in=kept).delete()
+
+            archived += len(rows) - len(kept)
+            last_id = rows[-1]["id"]
+            yield archived
+            if sleep:
+                time.sleep(sleep)
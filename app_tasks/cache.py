@@ -0,0 +1,141 @@
+"""
+Utilidades de caché para la aplicación de tareas
+
+Este archivo centraliza las claves y versiones usadas para cachear contenido derivado de las tareas.
+
+Cada usuario tiene un número de generación ("versión") que forma parte de todas las claves cacheadas de sus
+tareas. Cualquier escritura sobre `Tasks` incrementa la generación del usuario (ver `signals.py`), por lo que las
+entradas anteriores quedan inalcanzables sin necesidad de recorrer ni borrar claves: la invalidación es O(1) y
+las entradas viejas se descartan solas al vencer o al alcanzar el tamaño máximo del caché.
+
+Funciones:
+- get_user_generation: Devuelve la generación actual de las tareas de un usuario.
+- bump_user_generation: Invalida todo lo cacheado para las tareas de un usuario.
+- cached_task_query: Devuelve el resultado cacheado de una consulta de tareas, o la ejecuta y lo guarda.
+- get_query_cache_stats: Devuelve los aciertos y fallos del caché de consultas de este proceso (los expone
+  `/api/cache-stats/` para el staff).
+"""
+
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+
+# Alias del caché de fragmentos de filas de la tabla de tareas (ver `CACHES` en settings.py)
+TASK_ROWS_CACHE = "task_rows"
+
+# Alias del caché de resultados de consultas; su backend es configurable (memoria local, archivos o red)
+TASK_QUERY_CACHE = "task_queries"
+
+# Los contadores de generación viven junto a los resultados, para que con un backend de red la
+# invalidación sea visible para todos los procesos
+GENERATION_CACHE = TASK_QUERY_CACHE
+
+_MISSING = object()
+
+
+def _generation_key(user_id):
+    return f"tasks:generation:{user_id}"
+
+
+def get_user_generation(user_id):
+    """
+    Devuelve la generación actual de las tareas del usuario.
+
+    Si el contador no existe (primer uso o desalojado del caché) se inicializa con la hora actual en
+    microsegundos, que siempre es mayor que cualquier generación anterior: así una clave vieja nunca
+    vuelve a ser válida aunque el contador se haya perdido.
+    """
+    cache = caches[GENERATION_CACHE]
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns() // 1_000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_user_generation(user_id):
+    """
+    Incrementa la generación de las tareas del usuario, invalidando todas sus entradas cacheadas.
+    """
+    cache = caches[GENERATION_CACHE]
+    key = _generation_key(user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:  # El contador no existía: se crea directamente con un valor nuevo
+        get_user_generation(user_id)
+        return cache.incr(key)
+
+
+class QueryCacheStats:
+    """
+    Contadores de aciertos y fallos del caché de consultas, por proceso y seguros entre hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+query_cache_stats = QueryCacheStats()
+
+
+def get_query_cache_stats():
+    """
+    Devuelve los aciertos, fallos y la tasa de aciertos del caché de consultas en este proceso.
+    """
+    return query_cache_stats.snapshot()
+
+
+def _query_key(user_id, generation, params):
+    digest = hashlib.md5(repr(params).encode(), usedforsecurity=False).hexdigest()
+    return f"tasks:query:{user_id}:{generation}:{digest}"
+
+
+def cached_task_query(user_id, params, loader):
+    """
+    Devuelve la lista de tareas de una consulta, leyéndola del caché si ya se ejecutó en esta generación.
+
+    - user_id: Usuario propietario de las tareas consultadas.
+    - params: Tupla normalizada que identifica la consulta (filtros, cursor, tamaño de página...).
+    - loader: Función sin argumentos que ejecuta la consulta y devuelve una lista.
+
+    Los resultados con más de `TASKS_QUERY_CACHE_MAX_ROWS` filas no se guardan, para acotar el tamaño
+    de cada entrada.
+    """
+    cache = caches[TASK_QUERY_CACHE]
+    key = _query_key(user_id, get_user_generation(user_id), params)
+    result = cache.get(key, _MISSING)
+    if result is not _MISSING:
+        query_cache_stats.record(hit=True)
+        return result
+
+    query_cache_stats.record(hit=False)
+    result = loader()
+    if len(result) <= settings.TASKS_QUERY_CACHE_MAX_ROWS:
+        cache.set(key, result)
+    return result
@@ -0,0 +1,277 @@
+"""
+Eventos de cambios en las tareas (pub/sub) para el stream SSE de la API
+
+Cada alta, modificación o baja de una tarea publica un `TaskEvent` para su usuario (ver `signals.py`), una vez
+confirmada la transacción. Las conexiones SSE abiertas (`/api/tasks/stream/`) se suscriben a los eventos de su
+usuario y los reciben en una cola propia y acotada:
+
+- Si un cliente lento llena su cola, se lo desconecta (evento `overflow`) en lugar de acumular memoria; al
+  reconectarse con `Last-Event-ID` recupera lo que se perdió desde el historial.
+- El historial guarda los últimos `TASK_EVENTS_HISTORY` eventos de cada usuario con una conexión abierta en el
+  proceso, o cerrada hace menos de `TASK_EVENTS_HISTORY_TTL` segundos (el plazo para reconectarse). Los
+  procesos sin conexiones (por ejemplo los workers WSGI que solo publican) no guardan nada. Si el cliente pide
+  reanudar desde un evento que no está en el historial (ya descartado, de antes de que el proceso empezara a
+  guardar los de su usuario o de otro proceso), recibe un evento `reset` y debe volver a leer `/api/tasks/`.
+
+El broker es configurable con `TASK_EVENTS_BROKER`:
+- `InProcessBroker` (por defecto): reparte los eventos dentro del proceso; alcanza con un único worker ASGI.
+- `RedisBroker`: publica en un canal de Redis y cada proceso reparte a sus propias conexiones (requiere `redis`).
+
+Clases:
+- TaskEvent: Evento publicado.
+- Subscription: Cola acotada de una conexión.
+- InProcessBroker / RedisBroker: Brokers de eventos.
+
+Funciones:
+- get_broker: Devuelve el broker configurado (uno por proceso).
+- task_event_data: Datos publicados para el cambio de una tarea.
+- publish_event: Publica un evento para un usuario.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+# Tipos de evento
+TASK_CREATED = "created"
+TASK_UPDATED = "updated"
+TASK_DELETED = "deleted"
+TASKS_INVALIDATED = "invalidated"  # Cambios masivos (`update()`): el cliente debe volver a leer la lista
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    id: int
+    user_id: int
+    type: str
+    data: dict = field(default_factory=dict)
+
+    def to_sse(self):
+        """
+        Devuelve el evento en el formato de Server-Sent Events.
+        """
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    """
+    Cola acotada de eventos de una conexión. Se llena desde cualquier hilo y se lee desde el event loop
+    de la conexión. Si se llena, la suscripción queda desbordada y la conexión debe cerrarse.
+    """
+
+    def __init__(self, user_id, maxsize, loop=None):
+        self.user_id = user_id
+        self.loop = loop or asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # La conexión ya terminó y su event loop se cerró
+            pass
+
+    def _put(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.queue.get_nowait()  # Hace lugar para la marca de desborde
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout):
+        """
+        Devuelve el próximo evento, `None` si la suscripción se desbordó, o lanza `TimeoutError`.
+        """
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InProcessBroker:
+    """
+    Broker de eventos en memoria del proceso, seguro entre hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+        # Historial de los usuarios con conexiones abiertas o cerradas hace menos de `TASK_EVENTS_HISTORY_TTL`
+        self._history = {}
+        # Usuarios sin conexiones abiertas que conservan su historial, con la hora en que se cerró la última
+        # (en orden de cierre: los primeros son los que vencen antes)
+        self._idle_since = OrderedDict()
+        # Ids crecientes; empiezan en la hora actual para no repetir los de un proceso anterior
+        self._first_id = time.time_ns() // 1_000
+        self._ids = itertools.count(self._first_id)
+        self._last_id = self._first_id - 1  # Último id repartido por este proceso
+        # Id desde el que el historial de cada usuario está completo: no se puede reanudar desde antes
+        self._floor = {}
+
+    def next_id(self):
+        return next(self._ids)
+
+    def publish(self, user_id, event_type, data=None):
+        event = TaskEvent(self.next_id(), user_id, event_type, data or {})
+        self.dispatch(event)
+        return event
+
+    def dispatch(self, event):
+        """
+        Guarda el evento en el historial del usuario y lo entrega a sus suscripciones de este proceso.
+        """
+        with self._lock:
+            self._last_id = max(self._last_id, event.id)
+            self._expire_idle_history()
+            history = self._history.get(event.user_id)
+            if history is not None:
+                if len(history) == history.maxlen:
+                    self._floor[event.user_id] = history[0].id
+                history.append(event)
+            subscriptions = list(self._subscriptions.get(event.user_id, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def subscribe(self, user_id, last_event_id=None):
+        """
+        Suscribe una conexión a los eventos del usuario. Devuelve `(suscripción, eventos a reenviar)`;
+        los eventos a reenviar son `None` si no se puede reanudar desde `last_event_id` (hay que reiniciar).
+        """
+        subscription = Subscription(user_id, settings.TASK_EVENTS_BUFFER)
+        with self._lock:
+            self._expire_idle_history()
+            self._subscriptions[user_id].add(subscription)
+            self._idle_since.pop(user_id, None)
+            if user_id not in self._history:
+                # A partir de aquí se guardan los eventos del usuario: los anteriores no se pueden reenviar
+                self._history[user_id] = deque(maxlen=settings.TASK_EVENTS_HISTORY)
+                self._floor[user_id] = self._last_id
+            history = list(self._history[user_id])
+            floor = self._floor[user_id]
+        if last_event_id is None:
+            return subscription, []
+        if last_event_id < floor:
+            return subscription, None  # Eventos ya descartados, o de antes de que se guardaran los del usuario
+        return subscription, [event for event in history if event.id > last_event_id]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+                    self._idle_since[subscription.user_id] = time.monotonic()
+
+    def _expire_idle_history(self):
+        """
+        Descarta el historial de los usuarios cuya última conexión se cerró hace `TASK_EVENTS_HISTORY_TTL`
+        segundos o más. Se llama con `_lock` tomado.
+        """
+        deadline = time.monotonic() - settings.TASK_EVENTS_HISTORY_TTL
+        while self._idle_since:
+            user_id, idle_since = next(iter(self._idle_since.items()))
+            if idle_since > deadline:
+                break
+            del self._idle_since[user_id]
+            self._history.pop(user_id, None)
+            self._floor.pop(user_id, None)
+
+    def subscriber_count(self, user_id=None):
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscriptions.get(user_id, ()))
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Broker que reparte los eventos entre procesos mediante un canal de Redis (`TASK_EVENTS_REDIS_URL`).
+
+    `publish` envía el evento al canal; un hilo por proceso escucha el canal y lo entrega a las suscripciones
+    locales con `dispatch`, de modo que todos los procesos (incluido el que publica) ven el mismo flujo.
+    """
+
+    channel = "tasks:events"
+    id_key = "tasks:events:id"
+
+    def __init__(self):
+        super().__init__()
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroker requiere el paquete `redis`.") from exc
+        self._redis = redis.Redis.from_url(settings.TASK_EVENTS_REDIS_URL)
+        self._first_id = int(self._redis.get(self.id_key) or 0) + 1
+        self._last_id = self._first_id - 1
+        self._listener = threading.Thread(target=self._listen, name="task-events-redis", daemon=True)
+        self._listener.start()
+
+    def next_id(self):
+        # Ids compartidos entre procesos, para que `Last-Event-ID` sea válido en cualquier worker
+        return self._redis.incr(self.id_key)
+
+    def publish(self, user_id, event_type, data=None):
+        event = TaskEvent(self.next_id(), user_id, event_type, data or {})
+        self._redis.publish(self.channel, json.dumps([event.id, user_id, event_type, event.data]))
+        return event
+
+    def _listen(self):
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.channel)
+        for message in pubsub.listen():
+            event_id, user_id, event_type, data = json.loads(message["data"])
+            self.dispatch(TaskEvent(event_id, user_id, event_type, data))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Devuelve el broker configurado en `TASK_EVENTS_BROKER`, creado una vez por proceso.
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.TASK_EVENTS_BROKER)()
+    return _broker
+
+
+def reset_broker():
+    global _broker
+    with _broker_lock:
+        _broker = None
+
+
+def task_event_data(task, event_type):
+    """
+    Devuelve los datos publicados para el alta, modificación o baja de una tarea.
+    """
+    if event_type == TASK_DELETED:
+        return {"id": task.pk}
+    return {
+        "id": task.pk,
+        "name": task.name,
+        "description": task.description,
+        "status": task.status,
+        "version": task.version,
+        "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+    }
+
+
+def publish_event(user_id, event_type=TASKS_INVALIDATED, data=None):
+    """
+    Publica un evento para las conexiones del usuario. Sin datos, `invalidated` indica un cambio sobre varias
+    tareas (por ejemplo un cambio de estado masivo).
+    """
+    return get_broker().publish(user_id, event_type, data)
@@ -0,0 +1,54 @@
+"""
+Campos de modelo personalizados de la aplicación de tareas
+
+Campos:
+- StatusField: Estado de una tarea guardado como entero pequeño.
+"""
+
+from django.db import models
+from django.utils.functional import cached_property
+
+# Código entero de cada estado en la base de datos. El orden sigue el flujo de trabajo de una tarea,
+# de modo que `ORDER BY status` ordena de "no iniciado" a "finalizado".
+# No cambiar los códigos existentes: están guardados en cada fila (ver migración 0008).
+STATUS_CODES = {
+    "not_started": 1,
+    "in_progress": 2,
+    "completed": 3,
+}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+class StatusField(models.PositiveSmallIntegerField):
+    """
+    Estado de una tarea guardado como `smallint` en la base de datos y expuesto como texto en Python.
+
+    En Python (modelos, formularios, serializadores, filtros del ORM) el valor sigue siendo
+    "not_started", "in_progress" o "completed"; la conversión al código entero ocurre solo al leer
+    y escribir la base de datos. Así cada fila y cada índice que incluye el estado ocupan 2 bytes
+    en lugar del texto completo, sin cambios en la API ni en `TaskForm`.
+    """
+
+    description = "Estado de la tarea (entero pequeño)"
+
+    @cached_property
+    def validators(self):
+        # Los validadores de rango de `IntegerField` compararían el texto con un entero
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        return STATUS_NAMES.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, int):
+            return STATUS_NAMES.get(value, value)
+        return value
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return STATUS_CODES[value]
+        except KeyError:
+            raise ValueError(f"Estado desconocido: {value!r}.") from None
@@ -0,0 +1,68 @@
+"""
+Filtros de búsqueda de tareas
+
+Este archivo concentra la lectura y aplicación de los filtros de búsqueda que comparten la vista web
+(`TaskListView`) y la API (`TaskViewSet`): contenido (`q`) y rango de fechas de creación (`date_from`, `date_to`).
+
+También interpreta el parámetro `archived` de la API, que elige el nivel de almacenamiento consultado.
+
+Los filtros se normalizan en una tupla (`TaskFilters`), de modo que dos solicitudes equivalentes producen
+exactamente el mismo valor; esa tupla se usa también como parte de las claves del caché de consultas.
+"""
+
+from collections import namedtuple
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+TaskFilters = namedtuple("TaskFilters", ["q", "date_from", "date_to"])
+
+# Valores del parámetro `archived`: solo tareas activas (por defecto), solo archivadas, o ambas
+ARCHIVED_EXCLUDE, ARCHIVED_ONLY, ARCHIVED_INCLUDE = "false", "true", "all"
+
+
+def _parse_date(value):
+    """
+    Convierte una fecha `YYYY-MM-DD` en `date`; devuelve `None` si está vacía o no es válida.
+    """
+    try:
+        return parse_date(value) if value else None
+    except ValueError:  # Formato correcto pero fecha inexistente, por ejemplo 2024-02-30
+        return None
+
+
+def parse_task_filters(data):
+    """
+    Lee los filtros desde un diccionario de parámetros (`request.GET` o `request.POST`).
+
+    Las fechas inválidas se ignoran, igual que antes de centralizar los filtros.
+    """
+    return TaskFilters(
+        q=data.get("q", ""),
+        date_from=_parse_date(data.get("date_from", "")),
+        date_to=_parse_date(data.get("date_to", "")),
+    )
+
+
+def parse_archived(data):
+    """
+    Lee el parámetro `archived` ("false", "true" o "all"); cualquier otro valor equivale a "false".
+    """
+    value = str(data.get("archived", "")).lower()
+    return value if value in (ARCHIVED_ONLY, ARCHIVED_INCLUDE) else ARCHIVED_EXCLUDE
+
+
+def apply_task_filters(queryset, filters):
+    """
+    Aplica los filtros normalizados al queryset de tareas (activas o archivadas).
+    """
+    # Filtrar por contenido (nombre o descripción)
+    if filters.q:
+        queryset = queryset.filter(Q(name__icontains=filters.q) | Q(description__icontains=filters.q))
+
+    # Filtrar por fecha de creación (desde / hasta)
+    if filters.date_from:
+        queryset = queryset.filter(created_at__date__gte=filters.date_from)
+    if filters.date_to:
+        queryset = queryset.filter(created_at__date__lte=filters.date_to)
+
+    return queryset
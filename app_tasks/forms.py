@@ -6,3 +6,16 @@ class TaskForm(forms.ModelForm):
     class Meta:
         model = Tasks
         fields = ["name", "description", "status"]
+
+
+class TaskUpdateForm(TaskForm):
+    """
+    Formulario de modificación: envía oculta la versión de la tarea que se está editando, para no sobrescribir
+    cambios hechos desde otra pestaña o por la API mientras el formulario estaba abierto. Si no se envía, se
+    compara con la versión leída al procesar la solicitud.
+    """
+    version = forms.IntegerField(widget=forms.HiddenInput, min_value=1, required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["version"].initial = self.instance.version
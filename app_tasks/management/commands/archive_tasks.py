@@ -0,0 +1,27 @@
+"""
+Comando de archivado de tareas finalizadas
+
+Uso:
+    python manage.py archive_tasks
+    python manage.py archive_tasks --older-than-days 30 --batch-size 1000 --sleep 0.1
+
+Pensado para ejecutarse periódicamente (cron o similar). Ver `app_tasks/archive.py`.
+"""
+
+from django.core.management.base import BaseCommand
+from app_tasks.archive import archive_completed_tasks
+
+
+class Command(BaseCommand):
+    help = "Mueve las tareas finalizadas antiguas a la tabla de tareas archivadas, en lotes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=None, help="Antigüedad mínima (por defecto TASKS_ARCHIVE_AFTER_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=500, help="Tareas por lote (una transacción por lote).")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Segundos de pausa entre lotes.")
+
+    def handle(self, *args, **options):
+        archived = 0
+        for archived in archive_completed_tasks(options["older_than_days"], options["batch_size"], options["sleep"]):
+            self.stdout.write(f"Tareas archivadas: {archived}")
+        self.stdout.write(self.style.SUCCESS(f"Archivado finalizado. Total: {archived}."))
@@ -0,0 +1,116 @@
+"""
+Comando de medición de la compresión de las respuestas (bytes ahorrados contra CPU)
+
+Uso:
+    python manage.py benchmark_compression
+    python manage.py benchmark_compression --tasks 20 100 1000 --repeat 20
+
+Genera tareas en memoria con nombres y descripciones de largo variable y arma las mismas respuestas que el
+proyecto: la lista JSON de `/api/tasks/` (con `TasksSerializer`) y las filas HTML de `task_list.html`. Para cada
+una informa, con gzip y brotli (si está instalado) en varios niveles, el tamaño comprimido, el porcentaje
+ahorrado y el tiempo de compresión por respuesta, y también el de la compresión por partes de las respuestas en
+streaming. No usa ni modifica la base de datos. Ver `_Project_TodoList/compression.py`.
+"""
+
+import random
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from _Project_TodoList import compression
+from api.serializers import TasksSerializer
+from app_tasks.models import Tasks
+
+WORDS = (
+    "revisar enviar preparar informe reunión cliente presupuesto equipo proyecto entrega documentación "
+    "pruebas corregir error actualizar servidor llamar proveedor factura compras agenda semana mensual"
+).split()
+LEVELS = {"gzip": [1, 5, 6, 9], "br": [1, 4, 5, 11]}
+STREAM_CHUNK_TASKS = 25  # Tareas por parte en la compresión en streaming
+
+
+def make_tasks(rng, count):
+    """
+    Devuelve `count` tareas en memoria (sin guardar) con nombres y descripciones de largo variable.
+    """
+    user = User(pk=1, username="benchmark")
+    now = timezone.now()
+    tasks = []
+    for pk in range(1, count + 1):
+        created = now - timedelta(minutes=rng.randrange(60 * 24 * 365))
+        task = Tasks(
+            pk=pk,
+            user=user,
+            name=" ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+            description=" ".join(rng.choices(WORDS, k=rng.randint(0, 40))).capitalize(),
+            status=rng.choice(["not_started", "in_progress", "completed"]),
+            created_at=created,
+            updated_at=created + timedelta(minutes=rng.randrange(60 * 24 * 30)),
+        )
+        tasks.append(task)
+    return tasks
+
+
+class Command(BaseCommand):
+    help = "Compara tamaño y tiempo de CPU de gzip y brotli en distintos niveles sobre respuestas de tareas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, nargs="+", default=[25, 100, 1000], help="Tareas por respuesta.")
+        parser.add_argument("--repeat", type=int, default=10, help="Repeticiones de cada medición (se informa la mejor).")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla del generador de datos.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        levels = {encoding: LEVELS[encoding] for encoding in compression.available_encodings()}
+        if "br" not in levels:
+            self.stdout.write(self.style.WARNING("brotli no está instalado: solo se mide gzip."))
+        configured = {encoding: compression.level(encoding) for encoding in levels}
+        self.stdout.write(f"Niveles configurados: {configured}")
+
+        for count in options["tasks"]:
+            tasks = make_tasks(rng, count)
+            payloads = {
+                "JSON /api/tasks/": self.render_json(tasks),
+                "HTML task_list": render_to_string("app_tasks/task_rows.html", {"tasks": tasks}).encode(),
+            }
+            for label, content in payloads.items():
+                self.stdout.write(f"\n{label}, {count} tareas: {len(content) / 1024:.1f} KiB sin comprimir")
+                for encoding, encoding_levels in levels.items():
+                    for compression_level in encoding_levels:
+                        size, elapsed = self.measure(content, encoding, compression_level, options["repeat"])
+                        marker = "  <- configurado" if compression_level == configured[encoding] else ""
+                        self.stdout.write(
+                            f"  {encoding:<4} nivel {compression_level:>2}: {size / 1024:8.1f} KiB "
+                            f"({(1 - size / len(content)) * 100:5.1f}% ahorrado)  {elapsed:7.3f} ms  "
+                            f"{len(content) / 1024 / 1024 / (elapsed / 1000):7.1f} MiB/s{marker}"
+                        )
+                chunk_size = -(-len(content) // max(1, count // STREAM_CHUNK_TASKS))
+                chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+                for encoding in levels:
+                    size, elapsed = self.measure_stream(chunks, encoding, options["repeat"])
+                    self.stdout.write(
+                        f"  {encoding:<4} streaming ({len(chunks)} partes, nivel {configured[encoding]}): "
+                        f"{size / 1024:8.1f} KiB ({(1 - size / len(content)) * 100:5.1f}% ahorrado)  {elapsed:7.3f} ms"
+                    )
+
+    def render_json(self, tasks):
+        return JSONRenderer().render(TasksSerializer(tasks, many=True).data)
+
+    def measure(self, content, encoding, compression_level, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            compressed = compression.compress(content, encoding, compression_level)
+            timings.append((time.perf_counter() - start) * 1000)
+        return len(compressed), min(timings)
+
+    def measure_stream(self, chunks, encoding, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            size = sum(map(len, compression.compress_sequence(chunks, encoding)))
+            timings.append((time.perf_counter() - start) * 1000)
+        return size, min(timings)
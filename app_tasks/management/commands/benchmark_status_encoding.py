@@ -0,0 +1,87 @@
+"""
+Comando de medición del estado de las tareas guardado como texto o como entero
+
+Uso:
+    python manage.py benchmark_status_encoding
+    python manage.py benchmark_status_encoding --rows 500000 --users 1000 --repeat 5
+
+Crea dos bases SQLite en memoria con la misma tabla de tareas (mismas filas y mismos índices),
+una con `status` como texto (`varchar(20)`, el esquema anterior a la migración 0008) y otra como
+`smallint`, y compara el tamaño de la tabla y de los índices y el tiempo de las consultas por estado.
+No usa ni modifica la base de datos configurada en `settings.DATABASES`.
+"""
+
+import random
+import sqlite3
+import time
+from django.core.management.base import BaseCommand
+from app_tasks.fields import STATUS_CODES
+
+SCHEMAS = {
+    "texto": "varchar(20)",
+    "entero": "smallint unsigned",
+}
+
+
+class Command(BaseCommand):
+    help = "Compara tamaño y velocidad de consulta del estado de las tareas guardado como texto o como entero."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200000, help="Cantidad de tareas a generar.")
+        parser.add_argument("--users", type=int, default=500, help="Cantidad de usuarios entre los que se reparten.")
+        parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de cada consulta (se informa la mejor).")
+        parser.add_argument("--seed", type=int, default=0, help="Semilla del generador de datos.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        names = list(STATUS_CODES)
+        rows = [
+            (f"Tarea {i}", rng.randrange(options["users"]) + 1, rng.choice(names))
+            for i in range(options["rows"])
+        ]
+
+        results = {}
+        for label, column_type in SCHEMAS.items():
+            encode = (lambda name: name) if label == "texto" else STATUS_CODES.__getitem__
+            results[label] = self.measure(column_type, [(name, user, encode(status)) for name, user, status in rows],
+                                          encode, options["users"], options["repeat"])
+
+        self.stdout.write(f"Tareas: {options['rows']}, usuarios: {options['users']}")
+        for metric in results["texto"]:
+            before, after = results["texto"][metric], results["entero"][metric]
+            change = (1 - after / before) * 100 if before else 0.0
+            self.stdout.write(f"{metric:<32} texto={before:>12.3f}  entero={after:>12.3f}  ({change:.1f}% menos)")
+
+    def measure(self, column_type, rows, encode, users, repeat):
+        db = sqlite3.connect(":memory:")
+        db.execute(
+            f"CREATE TABLE tasks (id integer PRIMARY KEY, name text NOT NULL, "
+            f"status {column_type} NOT NULL, user_id integer NOT NULL)"
+        )
+        db.executemany("INSERT INTO tasks (name, user_id, status) VALUES (?, ?, ?)", rows)
+        db.execute("CREATE INDEX tasks_user_status_id_idx ON tasks (user_id, status, id)")
+        db.commit()
+        db.execute("ANALYZE")
+
+        sizes = dict(db.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+        completed = encode("completed")
+        queries = {
+            "escaneo por estado (ms)": ("SELECT COUNT(*) FROM tasks NOT INDEXED WHERE status = ?", (completed,)),
+            "índice usuario+estado (ms)": (
+                "SELECT id FROM tasks WHERE user_id = ? AND status = ? ORDER BY status, id",
+                (users // 2, completed),
+            ),
+        }
+        metrics = {
+            "tabla (KiB)": sizes.get("tasks", 0) / 1024,
+            "índice usuario+estado (KiB)": sizes.get("tasks_user_status_id_idx", 0) / 1024,
+        }
+        for label, (sql, params) in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                db.execute(sql, params).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            metrics[label] = min(timings)
+        db.close()
+        return metrics
@@ -0,0 +1,39 @@
+"""
+Comando de retención y eliminación de tareas en lotes
+
+Uso:
+    python manage.py purge_tasks                          # Retención: tareas archivadas más antiguas que TASKS_RETENTION_DAYS
+    python manage.py purge_tasks --older-than-days 180
+    python manage.py purge_tasks --user juan --chunk-size 1000 --sleep 0.05   # Elimina al usuario y sus tareas
+
+Ver `app_tasks/retention.py`.
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from app_tasks.retention import delete_user_in_chunks, purge_archived_tasks
+
+
+class Command(BaseCommand):
+    help = "Elimina tareas archivadas vencidas, o un usuario con todas sus tareas, en lotes cortos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username del usuario a eliminar junto con sus tareas.")
+        parser.add_argument("--older-than-days", type=int, default=None, help="Retención de las tareas archivadas (por defecto TASKS_RETENTION_DAYS).")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Tareas por lote (una transacción por lote).")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Segundos de pausa entre lotes.")
+
+    def handle(self, *args, **options):
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"No existe el usuario {options['user']}.")
+            progress = delete_user_in_chunks(user, options["chunk_size"], options["sleep"])
+        else:
+            progress = purge_archived_tasks(options["older_than_days"], options["chunk_size"], options["sleep"])
+
+        deleted = 0
+        for deleted in progress:
+            self.stdout.write(f"Tareas eliminadas: {deleted}")
+        self.stdout.write(self.style.SUCCESS(f"Eliminación finalizada. Total de tareas eliminadas: {deleted}."))
@@ -0,0 +1,63 @@
+"""
+Comando de rebalanceo de tareas entre shards
+
+Uso:
+    python manage.py rebalance_task_shards --user juan --to tasks_shard_2
+    python manage.py rebalance_task_shards --all --from default          # Reparte las tareas existentes al activar shards
+    python manage.py rebalance_task_shards --all --from tasks_shard_1 --to tasks_shard_3 --chunk-size 1000 --sleep 0.05
+
+Mueve las tareas de cada usuario sin detener el servicio (ver `move_user_tasks` en `app_tasks/sharding.py`).
+Sin `--to`, cada usuario va al shard que le corresponde por su `id`.
+"""
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from app_tasks.models import Tasks
+from app_tasks.sharding import move_user_tasks, shard_aliases, task_databases
+
+
+class Command(BaseCommand):
+    help = "Mueve las tareas de uno o varios usuarios a otro shard, en lotes y sin detener el servicio."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", action="append", default=[], help="Username a mover (se puede repetir).")
+        parser.add_argument("--all", action="store_true", help="Mueve a todos los usuarios con tareas en el origen (--from).")
+        parser.add_argument("--from", dest="source", help="Base de origen (por defecto el shard actual de cada usuario).")
+        parser.add_argument("--to", dest="target", help="Shard de destino (por defecto el que corresponde al id del usuario).")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Tareas por lote.")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Segundos de pausa entre lotes.")
+        parser.add_argument("--grace", type=float, default=2.0, help="Segundos de espera entre el cambio de shard y la puesta al día.")
+
+    def handle(self, *args, **options):
+        shards = shard_aliases()
+        if not shards:
+            raise CommandError("No hay shards configurados (TASKS_SHARDS).")
+        source, target = options["source"], options["target"]
+        for alias in filter(None, [source, target]):
+            if alias not in task_databases() and alias != "default":
+                raise CommandError(f"Base desconocida: {alias}. Shards: {', '.join(shards)}.")
+        if target == "default":
+            raise CommandError("El destino debe ser un shard.")
+
+        if options["all"]:
+            if not source:
+                raise CommandError("--all requiere --from.")
+            user_ids = Tasks.objects.using(source).values_list("user_id", flat=True).distinct()
+            users = User.objects.filter(pk__in=list(user_ids)).order_by("pk")
+        elif options["user"]:
+            users = User.objects.filter(username__in=options["user"]).order_by("pk")
+            missing = set(options["user"]) - {user.username for user in users}
+            if missing:
+                raise CommandError(f"No existen los usuarios: {', '.join(sorted(missing))}.")
+        else:
+            raise CommandError("Indique --user o --all.")
+
+        moved = 0
+        for user in users:
+            destination = target or shards[user.pk % len(shards)]
+            for phase, count in move_user_tasks(
+                user, destination, source, options["chunk_size"], options["sleep"], options["grace"],
+            ):
+                self.stdout.write(f"{user.username} -> {destination}: {phase} {count}")
+            moved += 1
+        self.stdout.write(self.style.SUCCESS(f"Rebalanceo finalizado. Usuarios procesados: {moved}."))
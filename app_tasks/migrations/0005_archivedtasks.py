@@ -0,0 +1,70 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_tasks", "0004_alter_tasks_options_alter_tasks_description_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTasks",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("name", models.TextField(max_length=100, verbose_name="nombre")),
+                (
+                    "description",
+                    models.TextField(
+                        blank=True, max_length=300, verbose_name="descripción"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("not_started", "No iniciado"),
+                            ("in_progress", "En progreso"),
+                            ("completed", "Finalizado"),
+                        ],
+                        max_length=20,
+                        verbose_name="estado",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="fecha de creación")),
+                (
+                    "updated_at",
+                    models.DateTimeField(verbose_name="fecha de actualización"),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="fecha de archivado"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_tasks",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="usuario",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tarea archivada",
+                "verbose_name_plural": "Tareas archivadas",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "created_at"], name="archived_user_created_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_tasks", "0005_archivedtasks"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tasks",
+            index=models.Index(fields=["created_at"], name="tasks_created_idx"),
+        ),
+    ]
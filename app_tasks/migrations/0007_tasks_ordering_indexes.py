@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_tasks", "0006_tasks_created_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tasks",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="tasks_user_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasks",
+            index=models.Index(
+                fields=["user", "updated_at", "id"], name="tasks_user_updated_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasks",
+            index=models.Index(
+                fields=["user", "status", "id"], name="tasks_user_status_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasks",
+            index=models.Index(
+                fields=["user", "name", "id"], name="tasks_user_name_id_idx"
+            ),
+        ),
+    ]
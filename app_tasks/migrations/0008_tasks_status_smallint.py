@@ -0,0 +1,104 @@
+# Cambia `Tasks.status` de texto a entero pequeño (ver `app_tasks/fields.py`).
+#
+# La conversión se hace en una columna nueva, por rangos de `CHUNK_SIZE` ids, cada uno en su propia transacción
+# corta: la migración no es atómica (`atomic = False`), así que los bloqueos duran lo que tarda un rango y no
+# toda la tabla. Luego la columna de texto se elimina y la nueva toma su nombre. Si la conversión se interrumpe,
+# los rangos ya confirmados quedan convertidos y al reanudarla solo se completan las filas sin código. La
+# migración es reversible: hacia atrás se vuelve a completar la columna de texto por rangos.
+
+import app_tasks.fields
+from django.db import migrations, models, transaction
+
+# Copia congelada de `app_tasks.fields.STATUS_CODES`: la migración no debe depender del código actual
+STATUS_CODES = {
+    "not_started": 1,
+    "in_progress": 2,
+    "completed": 3,
+}
+CHUNK_SIZE = 5000
+
+
+def id_ranges(tasks):
+    """
+    Produce rangos `[inicio, fin)` de `CHUNK_SIZE` ids que cubren toda la tabla.
+    """
+    bounds = tasks.aggregate(low=models.Min("id"), high=models.Max("id"))
+    if bounds["low"] is None:
+        return
+    for start in range(bounds["low"], bounds["high"] + 1, CHUNK_SIZE):
+        yield start, start + CHUNK_SIZE
+
+
+def encode_status(apps, schema_editor):
+    # Cada base (`default` o un shard de tareas) convierte sus propias filas
+    alias = schema_editor.connection.alias
+    tasks = apps.get_model("app_tasks", "Tasks").objects.using(alias)
+    for start, end in id_ranges(tasks):
+        with transaction.atomic(using=alias):
+            chunk = tasks.filter(id__gte=start, id__lt=end, status_code__isnull=True)
+            for name, code in STATUS_CODES.items():
+                chunk.filter(status=name).update(status_code=code)
+            # Valores fuera de las opciones (no deberían existir) pasan a "no iniciado"
+            chunk.update(status_code=STATUS_CODES["not_started"])
+
+
+def decode_status(apps, schema_editor):
+    # Cada base (`default` o un shard de tareas) convierte sus propias filas
+    alias = schema_editor.connection.alias
+    tasks = apps.get_model("app_tasks", "Tasks").objects.using(alias)
+    for start, end in id_ranges(tasks):
+        with transaction.atomic(using=alias):
+            chunk = tasks.filter(id__gte=start, id__lt=end)
+            for name, code in STATUS_CODES.items():
+                chunk.filter(status_code=code).update(status=name)
+
+
+class Migration(migrations.Migration):
+    # Cada rango de ids se confirma por separado (ver el comentario del inicio)
+    atomic = False
+
+    dependencies = [
+        ("app_tasks", "0007_tasks_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="tasks",
+            name="tasks_user_status_id_idx",
+        ),
+        migrations.AddField(
+            model_name="tasks",
+            name="status_code",
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        # No es `elidable`: es el único paso que lleva los estados a la columna nueva
+        migrations.RunPython(encode_status, decode_status, hints={"model_name": "tasks"}),
+        migrations.RemoveField(
+            model_name="tasks",
+            name="status",
+        ),
+        migrations.RenameField(
+            model_name="tasks",
+            old_name="status_code",
+            new_name="status",
+        ),
+        migrations.AlterField(
+            model_name="tasks",
+            name="status",
+            field=app_tasks.fields.StatusField(
+                choices=[
+                    ("not_started", "No iniciado"),
+                    ("in_progress", "En progreso"),
+                    ("completed", "Finalizado"),
+                ],
+                default="not_started",
+                verbose_name="estado",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tasks",
+            index=models.Index(
+                fields=["user", "status", "id"], name="tasks_user_status_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_tasks", "0008_tasks_status_smallint"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskIdBlock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.BigIntegerField(unique=True)),
+                ("end", models.BigIntegerField()),
+                ("reserved_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TaskShardAssignment",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="task_shard",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="usuario",
+                    ),
+                ),
+                ("shard", models.CharField(max_length=64, verbose_name="shard")),
+                (
+                    "moved_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="fecha de asignación"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Shard de tareas",
+                "verbose_name_plural": "Shards de tareas",
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-19 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_tasks", "0009_tasks_sharding"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tasks",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=1, editable=False, verbose_name="versión"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Quita la restricción de clave foránea de `Tasks.user` solo en los shards de tareas (ver `app_tasks/sharding.py`):
+# allí no existe la tabla de usuarios, que queda en `default`. En `default` (con o sin shards) la restricción se
+# conserva. El estado del modelo no cambia, por eso es un `RunPython` y no un `AlterField`.
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def shard_user_fields(apps, schema_editor):
+    """
+    Devuelve `(modelo, campo con restricción, campo sin restricción)`, o `None` si la base no es un shard.
+    """
+    if schema_editor.connection.alias not in getattr(settings, "TASKS_SHARD_ALIASES", []):
+        return None
+    model = apps.get_model("app_tasks", "Tasks")
+    constrained = model._meta.get_field("user")
+    unconstrained = models.ForeignKey(
+        constrained.related_model, on_delete=models.CASCADE, db_constraint=False, verbose_name="usuario",
+    )
+    unconstrained.set_attributes_from_name("user")
+    unconstrained.model = model
+    return model, constrained, unconstrained
+
+
+def drop_constraint(apps, schema_editor):
+    fields = shard_user_fields(apps, schema_editor)
+    if fields:
+        model, constrained, unconstrained = fields
+        schema_editor.alter_field(model, constrained, unconstrained)
+
+
+def restore_constraint(apps, schema_editor):
+    fields = shard_user_fields(apps, schema_editor)
+    if fields:
+        model, constrained, unconstrained = fields
+        schema_editor.alter_field(model, unconstrained, constrained)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app_tasks", "0010_tasks_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_constraint, restore_constraint, hints={"model_name": "tasks"}),
+    ]
@@ -4,10 +4,44 @@ Modelo Tasks para la aplicación de gestión de tareas
 Este modelo representa una tarea que puede ser asignada a un usuario autenticado.
 Cada tarea tiene un nombre, una descripción opcional, un estado y marcas de tiempo de creación y actualización.
 Las tareas están vinculadas a los usuarios a través de una relación de clave foránea (ForeignKey).
+
+Las tareas finalizadas antiguas se mueven al modelo ArchivedTasks (tabla separada), para que la tabla de
+tareas activas y sus índices se mantengan pequeños (ver `app_tasks/archive.py`).
+
+Con `TASKS_SHARDS` configurado, las tareas de cada usuario viven en una base de datos (shard) propia;
+`TaskShardAssignment` y `TaskIdBlock` guardan en `default` la ubicación de cada usuario y los rangos de `id`
+reservados (ver `app_tasks/sharding.py`). Las consultas de tareas usan `Tasks.objects.for_user(user)`.
+
+Cada tarea tiene una `version` que aumenta con cada modificación. Las ediciones de la API y del formulario usan
+`save_if_version` (control de concurrencia optimista): la escritura se aplica solo si nadie modificó la tarea
+desde que se leyó, sin bloquear la fila.
 """
 
-from django.db import models
+from django.db import models, router
+from django.db.models.signals import post_save
 from django.contrib.auth.models import User
+from django.utils import timezone
+from .fields import StatusField
+
+
+class TasksQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """
+        Devuelve las tareas del usuario, consultadas en el shard donde están guardadas
+        (sin shards, la base la eligen los routers: primaria o réplica).
+        """
+        from .sharding import is_sharded, shard_for_user
+        queryset = self.using(shard_for_user(user)) if is_sharded() else self
+        return queryset.filter(user=user)
+
+    def create(self, **kwargs):
+        """
+        Sobrescribir `create` para guardar la tarea en el shard de su usuario (también desde `ModelSerializer`).
+        """
+        from .sharding import is_sharded, shard_for_user
+        if is_sharded() and self._db is None:
+            return self.using(shard_for_user(kwargs.get("user") or kwargs.get("user_id"))).create(**kwargs)
+        return super().create(**kwargs)
 
 
 class Tasks(models.Model):
@@ -17,9 +51,10 @@ class Tasks(models.Model):
     Atributos:
         - name: Nombre de la tarea (obligatorio).
         - description: Descripción de la tarea (opcional).
-        - status: Estado de la tarea, con opciones predefinidas.
+        - status: Estado de la tarea, con opciones predefinidas (guardado como entero, ver `app_tasks/fields.py`).
         - created_at: Fecha de creación de la tarea (automática).
         - updated_at: Fecha de última actualización de la tarea (automática).
+        - version: Número de versión, aumenta con cada modificación (base de la `ETag` de la API).
         - user: Relación con el usuario que creó la tarea.
 
     Relación:
@@ -34,22 +69,144 @@ class Tasks(models.Model):
 
     name = models.TextField(max_length=100, verbose_name="nombre")
     description = models.TextField(max_length=300, verbose_name="descripción", blank=True)
-    status = models.CharField( max_length=20, choices=STATUS_CHOICES, default="not_started", verbose_name="estado")
+    status = StatusField(choices=STATUS_CHOICES, default="not_started", verbose_name="estado")  # Guardado como smallint
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="fecha de creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="fecha de actualización")
+    version = models.PositiveIntegerField(default=1, editable=False, verbose_name="versión")
+    # Los shards no tienen la tabla de usuarios: allí la restricción se quita (migración 0011)
     user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="usuario")
 
+    objects = TasksQuerySet.as_manager()
+
+    # Campos que escribe `save_if_version` (los que se editan más la fecha de actualización)
+    VERSIONED_FIELDS = ["name", "description", "status", "updated_at"]
+
     def __str__(self):
         """
         Devuelve el nombre de la tarea como representación en cadena del objeto.
         """
         return self.name
 
+    @property
+    def etag(self):
+        """
+        `ETag` de la tarea: cambia con cada modificación.
+        """
+        return f'"{self.version}"'
+
+    def save_if_version(self, expected_version):
+        """
+        Guarda los cambios solo si la tarea sigue en `expected_version`, con un único
+        `UPDATE ... SET version = version + 1 WHERE id = ? AND version = ?` (sin `SELECT ... FOR UPDATE`).
+
+        Devuelve `False` si otra escritura la modificó (o eliminó) antes; en ese caso no se guarda nada. Si se
+        guardó, actualiza `version` y envía `post_save` igual que `save()` (cachés y stream de eventos).
+        """
+        using = router.db_for_write(Tasks, instance=self)  # Primaria o shard del usuario
+        self.updated_at = timezone.now()
+        values = {name: getattr(self, name) for name in self.VERSIONED_FIELDS}
+        updated = Tasks._base_manager.using(using).filter(pk=self.pk, version=expected_version).update(
+            version=expected_version + 1, **values,
+        )
+        if not updated:
+            return False
+        self.version = expected_version + 1
+        self._state.db = using
+        post_save.send(sender=Tasks, instance=self, created=False, update_fields=None, raw=False, using=using)
+        return True
+
+    def save(self, *args, **kwargs):
+        """
+        Sobrescribir `save` para asignar un `id` único entre todos los shards a las tareas nuevas
+        (con una única base se usa el autoincremental de la tabla).
+        Al modificar una tarea existente incrementa `version`; esta escritura no verifica la versión leída
+        (por ejemplo desde el admin): para rechazar ediciones concurrentes se usa `save_if_version`.
+        """
+        from .sharding import allocate_task_id, is_sharded
+        if self.pk is None and is_sharded():
+            self.pk = allocate_task_id()
+            kwargs["force_insert"] = True
+        if not self._state.adding and not kwargs.get("force_insert"):
+            self.version += 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+
     class Meta:
         """
         Configuraciones adicionales para el modelo:
         - verbose_name: Nombre singular del modelo en la interfaz de administración.
         - verbose_name_plural: Nombre plural del modelo en la interfaz de administración.
+        - indexes: Índice por fecha de creación, usado por la navegación por fechas del admin, y un índice
+          compuesto `(user, campo, id)` por cada ordenamiento permitido (ver `app_tasks/ordering.py`).
         """
         verbose_name = "Tarea"
         verbose_name_plural = "Tareas"
+        indexes = [
+            models.Index(fields=["created_at"], name="tasks_created_idx"),
+            models.Index(fields=["user", "created_at", "id"], name="tasks_user_created_id_idx"),
+            models.Index(fields=["user", "updated_at", "id"], name="tasks_user_updated_id_idx"),
+            models.Index(fields=["user", "status", "id"], name="tasks_user_status_id_idx"),
+            models.Index(fields=["user", "name", "id"], name="tasks_user_name_id_idx"),
+        ]
+
+
+class ArchivedTasks(models.Model):
+    """
+    Modelo que representa las tareas finalizadas archivadas.
+
+    Tiene los mismos campos que `Tasks` (conservando el `id` original) más la fecha de archivado.
+    Solo se accede a estas tareas de forma explícita (por ejemplo con `archived=true` en la API).
+    """
+
+    id = models.BigIntegerField(primary_key=True)  # Mismo id que tenía la tarea activa
+    name = models.TextField(max_length=100, verbose_name="nombre")
+    description = models.TextField(max_length=300, verbose_name="descripción", blank=True)
+    status = models.CharField(max_length=20, choices=Tasks.STATUS_CHOICES, verbose_name="estado")
+    created_at = models.DateTimeField(verbose_name="fecha de creación")
+    updated_at = models.DateTimeField(verbose_name="fecha de actualización")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_tasks", verbose_name="usuario")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="fecha de archivado")
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        """
+        Configuraciones adicionales para el modelo:
+        - verbose_name: Nombre singular del modelo en la interfaz de administración.
+        - verbose_name_plural: Nombre plural del modelo en la interfaz de administración.
+        - indexes: Índice por usuario y fecha de creación, usado por los filtros de búsqueda.
+        """
+        verbose_name = "Tarea archivada"
+        verbose_name_plural = "Tareas archivadas"
+        indexes = [
+            models.Index(fields=["user", "created_at"], name="archived_user_created_idx"),
+        ]
+
+
+class TaskShardAssignment(models.Model):
+    """
+    Shard asignado a un usuario. Sin fila, el shard se calcula a partir del `id` del usuario;
+    el comando `rebalance_task_shards` crea o actualiza la fila al mover las tareas.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="task_shard", verbose_name="usuario")
+    shard = models.CharField(max_length=64, verbose_name="shard")
+    moved_at = models.DateTimeField(auto_now=True, verbose_name="fecha de asignación")
+
+    class Meta:
+        verbose_name = "Shard de tareas"
+        verbose_name_plural = "Shards de tareas"
+
+
+class TaskIdBlock(models.Model):
+    """
+    Rango de `id` de tareas reservado por un proceso. Los procesos asignan los `id` de su rango en
+    memoria, de modo que los `id` son únicos entre shards con una escritura en `default` cada
+    `TASKS_SHARD_ID_BLOCK_SIZE` tareas.
+    """
+
+    start = models.BigIntegerField(unique=True)
+    end = models.BigIntegerField()
+    reserved_at = models.DateTimeField(auto_now_add=True)
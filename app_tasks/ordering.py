@@ -0,0 +1,107 @@
+"""
+Ordenamiento y paginación por cursor de las tareas
+
+El parámetro `ordering` solo acepta los ordenamientos de `TASK_ORDERINGS`. Cada uno se completa con el `id`
+como desempate (en la misma dirección), de modo que el orden es determinista entre páginas, y tiene un índice
+compuesto `(user, campo, id)` en `Tasks.Meta.indexes`: la base de datos recorre el índice en lugar de ordenar.
+
+El cursor de la página siguiente codifica el par (valor del campo, id) de la última tarea de la página, y la
+página siguiente se obtiene con `WHERE (campo, id) < (valor, id)` (o `>` en orden ascendente).
+
+Funciones:
+- parse_ordering: Valida el parámetro `ordering`.
+- order_tasks: Aplica el ordenamiento con el desempate por `id`.
+- encode_cursor / decode_cursor: Codifican el cursor de una tarea.
+- filter_after_cursor: Filtra las tareas posteriores al cursor según el ordenamiento.
+"""
+
+import base64
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from .fields import STATUS_CODES
+
+# Ordenamientos permitidos (cada uno respaldado por un índice compuesto)
+TASK_ORDERINGS = ("created_at", "updated_at", "status", "name")
+DEFAULT_TASK_ORDERING = "-created_at"
+DATETIME_ORDERINGS = ("created_at", "updated_at")
+MAX_TASK_ID = 2**63 - 1
+
+
+class InvalidOrdering(ValueError):
+    """
+    El valor de `ordering` no está en la lista de ordenamientos permitidos.
+    """
+
+
+def allowed_orderings():
+    return [prefix + field for field in TASK_ORDERINGS for prefix in ("", "-")]
+
+
+def parse_ordering(data):
+    """
+    Devuelve el ordenamiento pedido (`created_at`, `-created_at`, ...) o el ordenamiento por defecto.
+    Lanza `InvalidOrdering` si el valor no está permitido.
+    """
+    ordering = data.get("ordering", "").strip() or DEFAULT_TASK_ORDERING
+    if ordering not in allowed_orderings():
+        raise InvalidOrdering(ordering)
+    return ordering
+
+
+def _split(ordering):
+    return ordering.lstrip("-"), ordering.startswith("-")
+
+
+def order_tasks(queryset, ordering):
+    """
+    Ordena el queryset por el campo pedido y, como desempate, por `id` en la misma dirección.
+    """
+    field, descending = _split(ordering)
+    prefix = "-" if descending else ""
+    return queryset.order_by(prefix + field, prefix + "id")
+
+
+def encode_cursor(task, ordering):
+    """
+    Devuelve el cursor opaco (base64 de JSON) con el valor del campo de orden y el `id` de la tarea.
+    """
+    field, _ = _split(ordering)
+    value = getattr(task, field)
+    if field in DATETIME_ORDERINGS:
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, task.id]).encode()).decode()
+
+
+def decode_cursor(cursor, ordering):
+    """
+    Decodifica el cursor; devuelve `(valor, id)` o `None` si no es válido para el ordenamiento.
+    El cursor llega del cliente: cada valor se verifica antes de usarlo en una consulta (fechas válidas,
+    estados conocidos, nombres de texto e `id` dentro del rango de un entero de 64 bits).
+    """
+    field, _ = _split(ordering)
+    try:
+        value, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if field in DATETIME_ORDERINGS:
+            value = parse_datetime(value)
+        elif field == "status":
+            value = value if value in STATUS_CODES else None
+        elif not isinstance(value, str):
+            value = None
+    except (ValueError, TypeError):
+        return None
+    if value is None or type(task_id) is not int or not 0 < task_id <= MAX_TASK_ID:
+        return None
+    return value, task_id
+
+
+def filter_after_cursor(queryset, ordering, cursor):
+    """
+    Filtra las tareas que van después de `cursor` (par `(valor, id)`) en el ordenamiento dado.
+    """
+    field, descending = _split(ordering)
+    value, task_id = cursor
+    lookup = "lt" if descending else "gt"
+    return queryset.filter(
+        Q(**{f"{field}__{lookup}": value}) | Q(**{field: value, f"id__{lookup}": task_id})
+    )
@@ -0,0 +1,67 @@
+"""
+Retención y eliminación de tareas en lotes
+
+Eliminar un usuario con `on_delete=CASCADE` hace que el collector de Django cargue todas sus tareas y las borre
+en una única transacción larga, que retiene el lock de escritura de SQLite durante segundos. Estas funciones
+borran por rangos de `id` acotados, con una transacción corta por lote y una pausa opcional entre lotes.
+
+Todas son generadores: producen el total eliminado tras cada lote, para informar el progreso.
+
+Funciones:
+- delete_in_chunks: Elimina un queryset en lotes por rango de `id`.
+- purge_archived_tasks: Elimina las tareas archivadas más antiguas que `TASKS_RETENTION_DAYS`.
+- delete_user_in_chunks: Elimina las tareas (activas y archivadas) de un usuario en lotes y luego al usuario.
+"""
+
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import ArchivedTasks, Tasks
+
+
+def delete_in_chunks(queryset, chunk_size=500, sleep=0.0):
+    """
+    Elimina las filas del queryset en lotes de hasta `chunk_size` filas contiguas por `id`.
+    """
+    queryset = queryset.order_by("id")
+    deleted = 0
+    last_id = None
+    while True:
+        pending = queryset if last_id is None else queryset.filter(id__gt=last_id)
+        ids = list(pending.values_list("id", flat=True)[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic(using=queryset.db):
+            queryset.filter(id__gte=ids[0], id__lte=ids[-1]).delete()
+        deleted += len(ids)
+        last_id = ids[-1]
+        yield deleted
+        if sleep:
+            time.sleep(sleep)
+
+
+def purge_archived_tasks(older_than_days=None, chunk_size=500, sleep=0.0, now=None):
+    """
+    Elimina las tareas archivadas hace más de `older_than_days` días (por defecto `TASKS_RETENTION_DAYS`).
+    """
+    if older_than_days is None:
+        older_than_days = settings.TASKS_RETENTION_DAYS
+    cutoff = (now or timezone.now()) - timedelta(days=older_than_days)
+    yield from delete_in_chunks(ArchivedTasks.objects.filter(archived_at__lt=cutoff), chunk_size, sleep)
+
+
+def delete_user_in_chunks(user, chunk_size=500, sleep=0.0):
+    """
+    Elimina las tareas activas y archivadas del usuario en lotes y, al final, el propio usuario.
+
+    Cuando se elimina el usuario ya no le quedan tareas, por lo que el `CASCADE` no tiene nada que recorrer.
+    """
+    deleted = 0
+    for queryset in (Tasks.objects.for_user(user), ArchivedTasks.objects.filter(user=user)):
+        done = 0
+        for done in delete_in_chunks(queryset, chunk_size, sleep):
+            yield deleted + done
+        deleted += done
+    user.delete()
@@ -0,0 +1,226 @@
+"""
+Particionado (sharding) de las tareas por usuario
+
+Con `TASKS_SHARD_ALIASES` vacío (por defecto) todas las tareas están en `default` y estas funciones no cambian
+nada. Con shards configurados (ver `TASKS_SHARDS` en settings), las tareas de cada usuario se guardan completas
+en un único shard, de modo que toda consulta de tareas (siempre filtrada por usuario) toca una sola base:
+
+- Ubicación: `TaskShardAssignment` (en `default`) si el usuario fue movido; si no, `id del usuario % shards`.
+- Consultas: `Tasks.objects.for_user(user)`; las escrituras de una tarea las enruta `TaskShardRouter`.
+- Identificadores: cada proceso reserva rangos de `id` en `TaskIdBlock`, así los `id` son únicos entre shards
+  (los cursores, el admin y el archivado dependen de ello, y una tarea conserva su `id` al cambiar de shard).
+- Rebalanceo: `move_user_tasks` copia las tareas a otro shard, cambia la asignación y borra el origen.
+
+Clases:
+- TaskShardRouter: Router de Django para el modelo `Tasks` (`DATABASE_ROUTERS`).
+
+Funciones:
+- shard_aliases / task_databases: Shards configurados / bases que contienen tareas.
+- shard_for_user: Shard de las tareas de un usuario.
+- allocate_task_id: Próximo `id` de tarea único entre shards.
+- move_user_tasks: Mueve las tareas de un usuario a otro shard sin detener el servicio.
+"""
+
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+from .cache import bump_user_generation
+from .models import ArchivedTasks, TaskIdBlock, Tasks, TaskShardAssignment
+from .retention import delete_in_chunks
+
+# Campos copiados al mover una tarea entre shards (el `id` se conserva)
+MOVED_FIELDS = ["name", "description", "status", "created_at", "updated_at", "version", "user"]
+
+
+def shard_aliases():
+    return list(getattr(settings, "TASKS_SHARD_ALIASES", []))
+
+
+def is_sharded():
+    return bool(shard_aliases())
+
+
+def task_databases():
+    """
+    Devuelve los alias de las bases que contienen tareas activas.
+    """
+    return shard_aliases() or [DEFAULT_DB_ALIAS]
+
+
+def shard_for_user(user):
+    """
+    Devuelve el alias de la base con las tareas del usuario (instancia o `id`).
+
+    La asignación se lee siempre de la primaria (`default`): después de un rebalanceo todas las solicitudes
+    deben ver la ubicación nueva de inmediato.
+    """
+    shards = shard_aliases()
+    if not shards:
+        return DEFAULT_DB_ALIAS
+    user_id = getattr(user, "pk", user)
+    if user_id is None:  # Usuario anónimo: no tiene tareas
+        return shards[0]
+    assigned = (
+        TaskShardAssignment.objects.using(DEFAULT_DB_ALIAS)
+        .filter(user_id=user_id).values_list("shard", flat=True).first()
+    )
+    if assigned in shards:
+        return assigned
+    return shards[user_id % len(shards)]
+
+
+class TaskIdAllocator:
+    """
+    Asigna `id` de tareas desde rangos reservados en `TaskIdBlock`, por proceso y seguro entre hilos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = -1
+
+    def allocate(self):
+        with self._lock:
+            if self._next > self._end:
+                self._next, self._end = self.reserve_block(settings.TASKS_SHARD_ID_BLOCK_SIZE)
+            task_id = self._next
+            self._next += 1
+            return task_id
+
+    def reserve_block(self, size):
+        """
+        Reserva el rango siguiente al último reservado. Si otro proceso reserva el mismo inicio a la vez,
+        la restricción `unique` de `start` rechaza uno de los dos y se reintenta.
+        """
+        while True:
+            try:
+                with transaction.atomic(using=DEFAULT_DB_ALIAS):
+                    blocks = TaskIdBlock.objects.using(DEFAULT_DB_ALIAS)
+                    last_end = blocks.aggregate(end=Max("end"))["end"]
+                    start = (last_end if last_end is not None else max_existing_task_id()) + 1
+                    blocks.create(start=start, end=start + size - 1)
+                return start, start + size - 1
+            except IntegrityError:
+                continue
+
+    def reset(self):
+        with self._lock:
+            self._next = 0
+            self._end = -1
+
+
+task_id_allocator = TaskIdAllocator()
+
+
+def allocate_task_id():
+    return task_id_allocator.allocate()
+
+
+def max_existing_task_id():
+    """
+    Devuelve el mayor `id` de tarea existente (activas en cualquier base y archivadas), o 0.
+    """
+    ids = [
+        Tasks.objects.using(alias).aggregate(id=Max("id"))["id"] or 0
+        for alias in dict.fromkeys([DEFAULT_DB_ALIAS, *shard_aliases()])
+    ]
+    ids.append(ArchivedTasks.objects.using(DEFAULT_DB_ALIAS).aggregate(id=Max("id"))["id"] or 0)
+    return max(ids)
+
+
+class TaskShardRouter:
+    """
+    Router que envía las lecturas y escrituras de una tarea concreta (o de las tareas de un usuario
+    concreto) a su shard. Las consultas sin instancia deben indicar la base con `for_user()` o `using()`.
+    Los demás modelos los decide el router siguiente de `DATABASE_ROUTERS`.
+    """
+
+    def db_for_read(self, model, **hints):
+        return self.shard_for_instance(model, hints.get("instance"))
+
+    def db_for_write(self, model, **hints):
+        return self.shard_for_instance(model, hints.get("instance"))
+
+    def shard_for_instance(self, model, instance):
+        if model is not Tasks or instance is None or not is_sharded():
+            return None
+        if isinstance(instance, Tasks) and instance.user_id is not None:
+            return shard_for_user(instance.user_id)
+        if isinstance(instance, User):  # Relación inversa: `user.tasks_set`
+            return shard_for_user(instance.pk)
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Los shards solo contienen la tabla de tareas; `default` la conserva para funcionar sin shards
+        if db in shard_aliases():
+            return app_label == "app_tasks" and model_name == "tasks"
+        return None
+
+
+def _upsert(alias, tasks):
+    Tasks.objects.using(alias).bulk_create(
+        tasks, update_conflicts=True, unique_fields=["id"], update_fields=MOVED_FIELDS,
+    )
+
+
+def move_user_tasks(user, target, source=None, chunk_size=500, sleep=0.0, grace=2.0):
+    """
+    Mueve las tareas del usuario al shard `target` mientras el servicio sigue atendiendo solicitudes.
+    Es un generador: produce `(fase, cantidad)` para informar el progreso.
+
+    1. Copia: las tareas se copian al destino por lotes de `id` (las escrituras siguen yendo al origen).
+    2. Cambio: se asigna el destino al usuario; las solicitudes nuevas leen y escriben en el destino.
+    3. Puesta al día: tras `grace` segundos (para las solicitudes que ya estaban en curso), se copian las tareas
+       creadas o modificadas en el origen durante la copia y se quitan del destino las que se eliminaron,
+       salvo que el destino tenga una versión más reciente.
+    4. Limpieza: se eliminan las tareas del origen por lotes.
+
+    - source: Base de origen; por defecto el shard actual del usuario (`default` al repartir los datos iniciales).
+    """
+    source = source or shard_for_user(user)
+    if target not in task_databases():
+        raise ValueError(f"Shard desconocido: {target}.")
+    if source == target:
+        return
+
+    started = timezone.now()
+    source_tasks = Tasks.objects.using(source).filter(user=user).order_by("id")
+    copied_ids = []
+    last_id = 0
+    while True:
+        chunk = list(source_tasks.filter(id__gt=last_id)[:chunk_size])
+        if not chunk:
+            break
+        _upsert(target, chunk)
+        copied_ids.extend(task.id for task in chunk)
+        last_id = chunk[-1].id
+        yield "copiadas", len(copied_ids)
+        if sleep:
+            time.sleep(sleep)
+
+    switched = timezone.now()
+    TaskShardAssignment.objects.using(DEFAULT_DB_ALIAS).update_or_create(user=user, defaults={"shard": target})
+    bump_user_generation(user.pk)
+    yield "asignadas", 1
+    if grace:
+        time.sleep(grace)
+
+    changed = list(source_tasks.filter(updated_at__gte=started))
+    newer = set(
+        Tasks.objects.using(target)
+        .filter(id__in=[task.id for task in changed], updated_at__gte=switched)
+        .values_list("id", flat=True)
+    )
+    _upsert(target, [task for task in changed if task.id not in newer])
+    remaining = set(source_tasks.values_list("id", flat=True))
+    removed = [task_id for task_id in copied_ids if task_id not in remaining]
+    Tasks.objects.using(target).filter(id__in=removed, updated_at__lt=switched).delete()
+    bump_user_generation(user.pk)
+    yield "actualizadas", len(changed) + len(removed)
+
+    for deleted in delete_in_chunks(source_tasks, chunk_size, sleep):
+        yield "eliminadas del origen", deleted
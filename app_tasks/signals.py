@@ -0,0 +1,60 @@
+"""
+Señales de la aplicación de tareas
+
+Mantiene coherentes los cachés derivados de `Tasks`: cada alta, modificación o baja de una tarea incrementa la
+generación de su usuario (ver `app_tasks/cache.py`) y, al confirmarse la transacción, publica el cambio para el
+stream de eventos (ver `app_tasks/events.py`).
+
+Con shards, además, elimina las tareas de un usuario al eliminarlo: el `CASCADE` de Django solo recorre la
+base del usuario (`default`), no el shard donde están sus tareas.
+"""
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from .cache import bump_user_generation
+from .events import TASK_CREATED, TASK_DELETED, TASK_UPDATED, publish_event, task_event_data
+from .models import Tasks
+from .sharding import is_sharded
+
+
+@receiver(post_save, sender=Tasks)
+@receiver(post_delete, sender=Tasks)
+def invalidate_user_task_caches(sender, instance, **kwargs):
+    """
+    Invalida los fragmentos y resultados cacheados de las tareas del usuario propietario.
+    """
+    bump_user_generation(instance.user_id)
+
+
+@receiver(post_save, sender=Tasks)
+def publish_task_saved(sender, instance, created, **kwargs):
+    """
+    Publica el alta o modificación de la tarea cuando se confirma la transacción en su base de datos.
+    """
+    event_type = TASK_CREATED if created else TASK_UPDATED
+    publish_on_commit(instance, event_type, kwargs.get("using"))
+
+
+@receiver(post_delete, sender=Tasks)
+def publish_task_deleted(sender, instance, **kwargs):
+    """
+    Publica la baja de la tarea cuando se confirma la transacción en su base de datos.
+    """
+    publish_on_commit(instance, TASK_DELETED, kwargs.get("using"))
+
+
+def publish_on_commit(task, event_type, using):
+    # Los datos se toman ahora: después de eliminar, Django deja la pk de la instancia en None
+    user_id, data = task.user_id, task_event_data(task, event_type)
+    transaction.on_commit(lambda: publish_event(user_id, event_type, data), using=using)
+
+
+@receiver(pre_delete, sender=User)
+def delete_sharded_user_tasks(sender, instance, **kwargs):
+    """
+    Elimina las tareas del usuario en su shard antes de eliminar al usuario.
+    """
+    if is_sharded():
+        Tasks.objects.for_user(instance).delete()
@@ -10,13 +10,43 @@ Clases:
 - TaskCreateViewTest: Pruebas para la creación de tareas.
 - TaskUpdateViewTest: Pruebas para la actualización de tareas.
 - TaskDeleteViewTest: Pruebas para la eliminación de tareas.
+- PurgeTasksCommandTest: Pruebas de la retención y eliminación de tareas en lotes.
+- TasksAdminTest: Pruebas del listado y las acciones masivas del admin de tareas.
+- StatusFieldTest: Pruebas del estado guardado como entero pequeño.
+- TaskEventsTest: Pruebas de la publicación de eventos de tareas y del broker en memoria.
+- ShardedTasksTest: Pruebas del particionado de tareas por usuario en varias bases SQLite.
 """
 
-from django.test import TestCase
+import asyncio
+import base64
+import importlib
+import json
+import os
+import shutil
+import tempfile
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
+from django.core.cache import caches
+from django.core.cache.utils import make_template_fragment_key
 from django.contrib.auth.models import User
-from .models import Tasks
-from datetime import datetime
+from .admin import EstimatedCountPaginator
+from .models import ArchivedTasks, Tasks
+from .cache import get_user_generation
+from .ordering import DEFAULT_TASK_ORDERING, decode_cursor, encode_cursor
+from .fields import STATUS_CODES
+from .forms import TaskForm
+from .models import TaskShardAssignment
+from .sharding import shard_for_user, task_id_allocator
+from .events import InProcessBroker, get_broker, reset_broker
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 class TaskListViewTest(TestCase):
     """
@@ -78,7 +108,7 @@ class TaskListViewTest(TestCase):
         Tasks.objects.create(user=self.user, name="TestTask 1", description="Tarea para el Test", status="completed")
         url = reverse("tasks_list")
         response = self.client.get(url)
-        self.assertEqual(response.context["tasks"].count(), 3)  # Verifica que se crean 3 tareas
+        self.assertEqual(len(response.context["tasks"]), 3)  # Verifica que se crean 3 tareas
 
     def test_search_filter(self):
         """
@@ -91,6 +121,135 @@ class TaskListViewTest(TestCase):
         self.assertContains(response, 'Task 1') # Confirma que el término de búsqueda 'Task 1' aparece en los resultados.
         self.assertNotContains(response, 'Task 2') # Asegura que otras tareas no relacionadas, como 'Task 2', no aparezcan en los resultados.
 
+    def test_search_filter_get(self):
+        """
+        Verifica que el filtro de búsqueda funcione con parámetros GET (resultados enlazables y cacheables).
+        """
+        self.client.login(username='admin', password='admin')
+        response = self.client.get(reverse('tasks_list'), {'q': 'Task 2'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Task 2')
+        self.assertNotContains(response, 'Task 1')
+        self.assertEqual(response.context["filters"]["q"], 'Task 2')  # El formulario conserva el término buscado
+
+    def test_keyset_pagination(self):
+        """
+        Verifica que la lista se pagine por cursor y que la página siguiente continúe donde terminó la anterior.
+        """
+        self.client.login(username='admin', password='admin')
+        for i in range(30):
+            Tasks.objects.create(name=f'Paginated {i}', user=self.user)
+
+        response = self.client.get(reverse('tasks_list'))
+        first_page = response.context["tasks"]
+        self.assertEqual(len(first_page), 25)  # Nunca se renderizan más tareas que `paginate_by`
+        self.assertEqual(decode_cursor(response.context["next_cursor"], DEFAULT_TASK_ORDERING)[1], first_page[-1].id)
+
+        response = self.client.get(reverse('tasks_list'), {'after': response.context["next_cursor"]})
+        second_page = response.context["tasks"]
+        self.assertEqual(len(second_page), 7)  # 32 tareas del usuario en total
+        self.assertIsNone(response.context["next_cursor"])
+        self.assertFalse({task.id for task in first_page} & {task.id for task in second_page})
+
+    def test_ordering_by_name_with_cursor(self):
+        """
+        Verifica que `ordering` ordene por el campo pedido, que el cursor respete ese orden
+        y que un ordenamiento no permitido se reemplace por el ordenamiento por defecto.
+        """
+        self.client.login(username='admin', password='admin')
+        for i in range(30):
+            Tasks.objects.create(name=f'Sorted {i:02d}', user=self.user)
+        expected = list(Tasks.objects.filter(user=self.user).order_by('name', 'id').values_list('id', flat=True))
+
+        response = self.client.get(reverse('tasks_list'), {'ordering': 'name'})
+        first_page = [task.id for task in response.context["tasks"]]
+        self.assertEqual(response.context["filters"]["ordering"], 'name')
+        self.assertIn('ordering=name', response.context["next_page_query"])  # La página siguiente conserva el orden
+
+        response = self.client.get(reverse('tasks_list'), {'ordering': 'name', 'after': response.context["next_cursor"]})
+        second_page = [task.id for task in response.context["tasks"]]
+        self.assertEqual(first_page + second_page, expected)
+
+        response = self.client.get(reverse('tasks_list'), {'ordering': 'description'})
+        self.assertEqual(response.context["filters"]["ordering"], DEFAULT_TASK_ORDERING)
+
+    def test_tampered_cursor_is_ignored(self):
+        """
+        Verifica que un cursor manipulado (estado desconocido, tipos inválidos o `id` fuera de rango) se ignore
+        y se muestre la primera página, en lugar de fallar con un error 500.
+        """
+        self.client.login(username='admin', password='admin')
+        cursors = {
+            'status': [['bogus', 1], [{}, 1], [[], 1], ['completed', True], ['completed', 2**64]],
+            'name': [[{}, 1], [[], 1], [1, 1]],
+        }
+        for ordering, values in cursors.items():
+            first_page = list(self.client.get(reverse('tasks_list'), {'ordering': ordering}).context["tasks"])
+            for value in values:
+                cursor = base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+                self.assertIsNone(decode_cursor(cursor, ordering))
+                response = self.client.get(reverse('tasks_list'), {'ordering': ordering, 'after': cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(list(response.context["tasks"]), first_page)
+        self.assertEqual(decode_cursor(encode_cursor(Tasks(id=5, status='completed'), 'status'), 'status'), ('completed', 5))
+
+    def test_fragment_mode_returns_only_rows(self):
+        """
+        Verifica que el modo fragmento devuelva solo las filas de la tabla y el marcador de página siguiente.
+        """
+        self.client.login(username='admin', password='admin')
+        response = self.client.get(reverse('tasks_list'), {'fragment': 'rows', 'q': 'Task 1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'app_tasks/task_rows.html')
+        self.assertTemplateNotUsed(response, 'base.html')  # Sin cabecera ni formulario de búsqueda
+        self.assertContains(response, 'Task 1')
+        self.assertNotContains(response, 'Task 2')
+        self.assertContains(response, 'id="next-page-marker"')
+        self.assertEqual(response['X-Next-Cursor'], '')  # No hay página siguiente
+
+    def test_cached_rows_are_invalidated_on_save_and_delete(self):
+        """
+        Verifica que las filas cacheadas se invaliden al modificar o eliminar una tarea.
+        """
+        self.client.login(username='admin', password='admin')
+        self.client.get(reverse('tasks_list'))  # Llena el caché de filas
+
+        generation = get_user_generation(self.user.id)
+        self.task1.name = 'Task 1 renamed'
+        self.task1.save()
+        self.assertGreater(get_user_generation(self.user.id), generation)  # La señal incrementa la generación
+        self.assertContains(self.client.get(reverse('tasks_list')), 'Task 1 renamed')
+
+        self.task2.delete()
+        self.assertNotContains(self.client.get(reverse('tasks_list')), 'Task 2')
+
+    def test_cached_rows_survive_other_writes(self):
+        """
+        Verifica que crear o modificar otra tarea no invalide las filas cacheadas de las demás: la clave de cada
+        fila es su id y su fecha de actualización.
+        """
+        self.client.login(username='admin', password='admin')
+        self.client.get(reverse('tasks_list'))  # Llena el caché de filas
+        key = make_template_fragment_key('task_row', [self.task1.pk, self.task1.updated_at])
+        self.assertIsNotNone(caches['task_rows'].get(key))
+        caches['task_rows'].set(key, '<tr><td>Fila cacheada</td></tr>')
+
+        Tasks.objects.create(name='Otra tarea', user=self.user)
+        self.task2.name = 'Task 2 renamed'
+        self.task2.save()
+        response = self.client.get(reverse('tasks_list'))
+        self.assertContains(response, 'Fila cacheada')  # La fila de task1 no se volvió a renderizar
+        self.assertContains(response, 'Task 2 renamed')
+
+    def test_rows_share_a_single_csrf_token(self):
+        """
+        Verifica que las filas no incluyan su propio token CSRF y usen el formulario único de la página.
+        """
+        self.client.login(username='admin', password='admin')
+        response = self.client.get(reverse('tasks_list'))
+        self.assertContains(response, 'csrfmiddlewaretoken', count=2)  # Formulario de eliminación y logout
+        self.assertContains(response, 'form="delete-task-form"', count=2)
+
     def test_no_logged_user_should_redirect(self):
         """
         Verifica que un usuario no autenticado sea redirigido al intentar acceder a la lista de tareas.
@@ -154,6 +313,29 @@ class TaskUpdateViewTest(TestCase):
         self.assertEqual(self.task.description, 'Updated description')
         self.assertEqual(self.task.status, 'in_progress')
 
+    def test_stale_form_does_not_overwrite_changes(self):
+        """
+        Verifica que el formulario envíe la versión de la tarea y que, si la tarea cambió desde que se abrió,
+        se responda 412 sin sobrescribir el cambio.
+        """
+        self.client.login(username='testuser', password='12345')
+        url = reverse('tasks_update', kwargs={'pk': self.task.pk})
+        response = self.client.get(url)
+        self.assertContains(response, 'name="version" value="1"')
+
+        self.task.name = 'Changed elsewhere'
+        self.task.save()
+        response = self.client.post(url, {'name': 'Stale', 'description': '', 'status': 'completed', 'version': 1})
+        self.assertEqual(response.status_code, 412)
+        self.assertContains(response, 'La tarea fue modificada', status_code=412)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.name, self.task.version), ('Changed elsewhere', 2))
+
+        response = self.client.post(url, {'name': 'Fresh', 'description': '', 'status': 'completed', 'version': 2})
+        self.assertEqual(response.status_code, 302)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.name, self.task.version), ('Fresh', 3))
+
 
 class TaskDeleteViewTest(TestCase):
     """
@@ -185,3 +367,394 @@ class TaskDeleteViewTest(TestCase):
         self.client.login(username='testuser', password='12345')
         response = self.client.post(reverse('tasks_delete', kwargs={'pk': self.other_task.pk}))
         self.assertEqual(response.status_code, 404)
+
+
+class PurgeTasksCommandTest(TestCase):
+    """
+    Pruebas del comando `purge_tasks` (retención de archivadas y eliminación de usuarios en lotes).
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial: Crear dos usuarios, uno con varias tareas activas y archivadas.
+        """
+        self.user = User.objects.create_user(username='testuser', password='12345')
+        self.other_user = User.objects.create_user(username='otheruser', password='12345')
+        for i in range(7):
+            Tasks.objects.create(name=f'Task {i}', user=self.user)
+        Tasks.objects.create(name='Other Task', user=self.other_user)
+        now = timezone.now()
+        ArchivedTasks.objects.create(id=1000, name='Expired', status='completed', created_at=now, updated_at=now, user=self.user)
+        ArchivedTasks.objects.create(id=1001, name='Recent', status='completed', created_at=now, updated_at=now, user=self.other_user)
+        ArchivedTasks.objects.filter(id=1000).update(archived_at=now - timedelta(days=400))
+
+    def test_delete_user_in_chunks(self):
+        """
+        Verifica que se eliminen el usuario y todas sus tareas, informando el progreso lote a lote.
+        """
+        out = StringIO()
+        call_command('purge_tasks', '--user', 'testuser', '--chunk-size', '3', stdout=out)
+        self.assertFalse(User.objects.filter(username='testuser').exists())
+        self.assertEqual(Tasks.objects.count(), 1)  # Solo queda la tarea del otro usuario
+        self.assertEqual(ArchivedTasks.objects.count(), 1)
+        self.assertIn('Tareas eliminadas: 3', out.getvalue())
+        self.assertIn('Total de tareas eliminadas: 8', out.getvalue())
+
+    def test_retention_purges_only_expired_archived_tasks(self):
+        """
+        Verifica que la retención elimine solo las tareas archivadas más antiguas que el plazo configurado.
+        """
+        call_command('purge_tasks', stdout=StringIO())
+        self.assertEqual(list(ArchivedTasks.objects.values_list('name', flat=True)), ['Recent'])
+        self.assertEqual(Tasks.objects.count(), 8)
+
+
+class TasksAdminTest(TestCase):
+    """
+    Pruebas del admin de tareas para tablas grandes.
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial: Crear un superusuario y tareas de varios usuarios.
+        """
+        self.admin = User.objects.create_superuser(username='admin', password='admin')
+        self.client.force_login(self.admin)
+        for i in range(5):
+            user = User.objects.create_user(username=f'user{i}', password='12345')
+            Tasks.objects.create(name=f'Task {i}', user=user)
+        self.url = reverse('admin:app_tasks_tasks_changelist')
+
+    def count_changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """
+        Verifica que la cantidad de consultas no dependa de la cantidad de filas (sin consulta por usuario)
+        y que el conteo de tareas esté acotado con `LIMIT`.
+        """
+        self.count_changelist_queries()  # Primera solicitud: carga el usuario en el caché
+        baseline = self.count_changelist_queries()
+        for i in range(5):
+            Tasks.objects.create(name=f'More {i}', user=User.objects.create_user(username=f'more{i}', password='12345'))
+        self.assertEqual(self.count_changelist_queries(), baseline)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        counts = [query['sql'] for query in queries if 'COUNT(' in query['sql'] and 'app_tasks_tasks' in query['sql']]
+        self.assertTrue(counts)
+        self.assertTrue(all('LIMIT 10000' in sql for sql in counts))
+
+    def test_paginator_count_is_exact_below_the_cap(self):
+        """
+        Verifica que el conteo no sobrestime tras eliminar tareas (no hay páginas vacías) y que se detenga
+        en `max_count`.
+        """
+        tasks = [Tasks.objects.create(name=f'Paged {i}', user=self.admin) for i in range(5)]
+        Tasks.objects.filter(pk__in=[task.pk for task in tasks[:3]]).delete()
+        queryset = Tasks.objects.order_by('-id')
+        self.assertEqual(EstimatedCountPaginator(queryset, 2).count, queryset.count())
+        paginator = EstimatedCountPaginator(queryset, 2)
+        paginator.max_count = 1
+        self.assertEqual(paginator.count, 1)
+
+    def test_bulk_action_updates_in_one_query(self):
+        """
+        Verifica que la acción masiva de estado modifique las tareas seleccionadas con un único UPDATE.
+        """
+        ids = list(Tasks.objects.values_list('pk', flat=True))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, {'action': 'mark_completed', '_selected_action': ids})
+        self.assertEqual(Tasks.objects.filter(status='completed').count(), 5)
+        self.assertEqual(len([query for query in queries if query['sql'].startswith('UPDATE "app_tasks_tasks"')]), 1)
+
+
+class StatusFieldTest(TestCase):
+    """
+    Pruebas de `StatusField`: entero en la base de datos, texto en Python y en los formularios.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='admin')
+        self.task = Tasks.objects.create(name='Encoded', status='in_progress', user=self.user)
+
+    def test_status_is_stored_as_small_integer(self):
+        """
+        Verifica que la columna guarde el código entero y que el modelo y los filtros usen el texto.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT status FROM app_tasks_tasks WHERE id = %s', [self.task.id])
+            self.assertEqual(cursor.fetchone()[0], STATUS_CODES['in_progress'])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'in_progress')
+        self.assertEqual(self.task.get_status_display(), 'En progreso')
+        self.assertTrue(Tasks.objects.filter(status__in=['in_progress', 'completed']).exists())
+        self.assertEqual(list(Tasks.objects.values_list('status', flat=True)), ['in_progress'])
+
+    def test_task_form_uses_string_values(self):
+        """
+        Verifica que `TaskForm` siga aceptando los valores de texto y rechace los códigos o valores desconocidos.
+        """
+        form = TaskForm(data={'name': 'Form', 'description': '', 'status': 'completed'}, instance=self.task)
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, 'completed')
+
+        for value in ['3', 'archived']:
+            form = TaskForm(data={'name': 'Form', 'description': '', 'status': value})
+            self.assertFalse(form.is_valid())
+
+
+class StatusMigrationTest(TransactionTestCase):
+    """
+    Pruebas de la migración 0008, que convierte `status` a entero por rangos de ids.
+    """
+
+    migrate_from = [('app_tasks', '0007_tasks_ordering_indexes')]
+    migrate_to = [('app_tasks', '0008_tasks_status_smallint')]
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())  # Deja el esquema actual para las demás pruebas
+
+    def test_status_is_converted_in_short_transactions(self):
+        """
+        Verifica que cada rango de ids se convierta en su propia transacción (la migración no es atómica) y que
+        los valores fuera de las opciones pasen a "no iniciado".
+        """
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        old_apps = executor.loader.project_state(self.migrate_from).apps
+        user = old_apps.get_model('auth', 'User').objects.create(username='migration')
+        statuses = ['not_started', 'in_progress', 'completed', 'completed', 'desconocido']
+        old_tasks = old_apps.get_model('app_tasks', 'Tasks')
+        for index, value in enumerate(statuses):
+            old_tasks.objects.create(name=f'Tarea {index}', status=value, user=user)
+
+        migration = importlib.import_module('app_tasks.migrations.0008_tasks_status_smallint')
+        self.assertFalse(migration.Migration.atomic)
+        executor = MigrationExecutor(connection)
+        with patch.object(migration, 'CHUNK_SIZE', 2), \
+                patch.object(migration.transaction, 'atomic', wraps=migration.transaction.atomic) as atomic:
+            executor.migrate(self.migrate_to)
+        self.assertEqual(atomic.call_count, 3)  # 5 filas en rangos de 2 ids
+
+        new_tasks = executor.loader.project_state(self.migrate_to).apps.get_model('app_tasks', 'Tasks')
+        codes = list(new_tasks.objects.order_by('id').values_list('status', flat=True))
+        self.assertEqual(codes, ['not_started', 'in_progress', 'completed', 'completed', 'not_started'])
+
+
+class TaskEventsTest(TestCase):
+    """
+    Pruebas de los eventos de tareas: publicación al confirmar la transacción, reanudación y desborde.
+    """
+
+    def setUp(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        self.user = User.objects.create_user(username='admin', password='admin')
+
+    def resume(self, broker, last_event_id=None):
+        """
+        Abre y cierra una conexión del usuario; devuelve los eventos a reenviar desde `last_event_id`.
+        """
+        async def connect():
+            subscription, events = broker.subscribe(self.user.id, last_event_id)
+            broker.unsubscribe(subscription)
+            return events
+
+        return asyncio.run(connect())
+
+    def test_task_changes_publish_events_on_commit(self):
+        """
+        Verifica que el alta, la modificación y la baja publiquen un evento cada una, solo al confirmar.
+        """
+        broker = get_broker()
+        self.resume(broker)  # El usuario se desconecta: sus eventos se guardan para cuando se reconecte
+        start = broker.next_id()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            task = Tasks.objects.create(name='Evento', user=self.user)
+            self.assertEqual(len(broker._history.get(self.user.id, ())), 0)
+        self.assertEqual(len(callbacks), 1)
+        task_id = task.id
+        with self.captureOnCommitCallbacks(execute=True):
+            task.status = 'completed'
+            task.save()
+            task.delete()
+
+        events = self.resume(broker, start)
+        self.assertEqual([event.type for event in events], ['created', 'updated', 'deleted'])
+        self.assertEqual(events[1].data['status'], 'completed')
+        self.assertEqual(events[2].data, {'id': task_id})
+
+    @override_settings(TASK_EVENTS_HISTORY=2)
+    def test_resume_requires_events_in_history(self):
+        """
+        Verifica que se reenvíe lo posterior a `Last-Event-ID` y que se pida reiniciar si ya se descartó.
+        """
+        broker = InProcessBroker()
+        self.resume(broker)
+        first, second, third = [broker.publish(self.user.id, 'updated', {'n': n}) for n in range(3)]
+
+        self.assertEqual(self.resume(broker, second.id), [third])
+        self.assertEqual(self.resume(broker, first.id), [second, third])
+        self.assertIsNone(self.resume(broker, first.id - 1))  # `first` ya no está en el historial
+        self.assertIsNone(self.resume(broker, 0))  # Anterior al inicio del proceso
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    def test_history_is_kept_only_for_connected_users(self):
+        """
+        Verifica que no se guarden eventos de usuarios sin conexiones en el proceso, y que el historial de un
+        usuario desconectado se descarte al vencer `TASK_EVENTS_HISTORY_TTL` (al reconectarse recibe `reset`).
+        """
+        broker = InProcessBroker()
+        other = broker.publish(self.user.id + 1, 'updated', {'n': 0})
+        self.assertEqual(broker._history, {})
+
+        self.resume(broker)
+        event = broker.publish(self.user.id, 'updated', {'n': 1})
+        self.assertEqual(list(broker._history[self.user.id]), [event])
+
+        with override_settings(TASK_EVENTS_HISTORY_TTL=0):
+            broker.publish(self.user.id, 'updated', {'n': 2})
+            self.assertEqual(broker._history, {})
+            self.assertIsNone(self.resume(broker, event.id))
+        self.assertIsNone(self.resume(broker, other.id))  # Eventos que este proceso no guardó
+
+    @override_settings(TASK_EVENTS_BUFFER=2)
+    def test_slow_subscriber_overflows(self):
+        """
+        Verifica que una conexión que no lee a tiempo reciba la marca de desborde sin acumular eventos.
+        """
+        broker = InProcessBroker()
+
+        async def slow_reader():
+            subscription, _ = broker.subscribe(self.user.id)
+            for n in range(5):
+                broker.publish(self.user.id, 'updated', {'n': n})
+            await asyncio.sleep(0)  # Deja que el event loop entregue los eventos
+            received = [await subscription.get(1), await subscription.get(1)]
+            broker.unsubscribe(subscription)
+            return subscription, received
+
+        subscription, received = asyncio.run(slow_reader())
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(received[0].data, {'n': 1})  # Se descarta el más antiguo para dejar lugar a la marca
+        self.assertIsNone(received[1])
+
+
+SHARDS = ['tasks_shard_1', 'tasks_shard_2']
+
+
+@override_settings(TASKS_SHARD_ALIASES=SHARDS, TASKS_SHARD_ID_BLOCK_SIZE=10)
+class ShardedTasksTest(TransactionTestCase):
+    """
+    Pruebas del particionado de `Tasks` por usuario con dos shards en archivos SQLite temporales.
+    """
+
+    # "__all__" se resuelve en `setUpClass`, cuando los shards ya están registrados (el runner no los conoce:
+    # solo crea la base de prueba de `default`; los shards son archivos temporales propios de esta clase)
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.shard_dir = tempfile.mkdtemp()
+        for alias in SHARDS:
+            connections.settings[alias] = {
+                **connections.settings['default'],
+                'NAME': os.path.join(cls.shard_dir, f'{alias}.sqlite3'),
+            }
+        super().setUpClass()
+        for alias in SHARDS:
+            call_command('migrate', database=alias, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in SHARDS:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        shutil.rmtree(cls.shard_dir)
+
+    def setUp(self):
+        """
+        Configuración inicial:
+        - Crear dos usuarios, uno en cada shard según su `id`.
+        """
+        task_id_allocator.reset()
+        self.first = User.objects.create_user(username='first', password='12345')
+        self.second = User.objects.create_user(username='second', password='12345')
+        self.tasks = {
+            user: [Tasks.objects.create(name=f'{user.username} {i}', user=user) for i in range(3)]
+            for user in (self.first, self.second)
+        }
+
+    def test_user_constraint_is_dropped_only_on_shards(self):
+        """
+        Verifica que `default` conserve la clave foránea de `Tasks.user` y que los shards no la tengan.
+        """
+        def user_foreign_keys(alias):
+            with connections[alias].cursor() as cursor:
+                constraints = connections[alias].introspection.get_constraints(cursor, Tasks._meta.db_table)
+            return [name for name, info in constraints.items() if info['foreign_key'] and info['columns'] == ['user_id']]
+
+        self.assertTrue(user_foreign_keys('default'))
+        for alias in SHARDS:
+            self.assertEqual(user_foreign_keys(alias), [])
+
+    def test_tasks_are_stored_in_the_user_shard(self):
+        """
+        Verifica que cada usuario tenga sus tareas solo en su shard, con `id` únicos entre shards.
+        """
+        self.assertNotEqual(shard_for_user(self.first), shard_for_user(self.second))
+        for user, tasks in self.tasks.items():
+            shard = shard_for_user(user)
+            self.assertEqual(Tasks.objects.using(shard).filter(user=user).count(), 3)
+            self.assertFalse(Tasks.objects.filter(user=user).exists())  # Nada en `default`
+        ids = [task.id for tasks in self.tasks.values() for task in tasks]
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_views_and_api_use_the_user_shard(self):
+        """
+        Verifica que la lista web, la API y la edición lean y escriban en el shard del usuario.
+        """
+        self.client.login(username='second', password='12345')
+        response = self.client.get(reverse('tasks_list'))
+        self.assertEqual({task.name for task in response.context['tasks']}, {'second 0', 'second 1', 'second 2'})
+
+        response = self.client.get(reverse('apitasks-list'))
+        self.assertEqual(len(response.json()), 3)
+        response = self.client.post(reverse('apitasks-list'), {'name': 'API', 'status': 'not_started'})
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Tasks.objects.using(shard_for_user(self.second)).filter(name='API').exists())
+
+        other = self.tasks[self.first][0]
+        response = self.client.post(reverse('tasks_update', args=[other.pk]), {'name': 'Hack', 'status': 'completed'})
+        self.assertEqual(response.status_code, 404)  # Tarea de otro usuario (en otro shard)
+
+    def test_rebalance_moves_tasks_and_keeps_ids(self):
+        """
+        Verifica que el comando mueva las tareas al shard de destino conservando los `id`.
+        """
+        source, target = shard_for_user(self.first), shard_for_user(self.second)
+        ids = sorted(task.id for task in self.tasks[self.first])
+        call_command('rebalance_task_shards', user=['first'], target=target, grace=0, stdout=StringIO())
+
+        self.assertEqual(shard_for_user(self.first), target)
+        self.assertEqual(TaskShardAssignment.objects.get(user=self.first).shard, target)
+        self.assertEqual(sorted(Tasks.objects.using(target).filter(user=self.first).values_list('id', flat=True)), ids)
+        self.assertFalse(Tasks.objects.using(source).filter(user=self.first).exists())
+        self.assertEqual(Tasks.objects.for_user(self.first).count(), 3)
+
+    def test_deleting_user_deletes_sharded_tasks(self):
+        """
+        Verifica que eliminar un usuario elimine sus tareas en el shard.
+        """
+        shard, user_id = shard_for_user(self.first), self.first.pk
+        self.first.delete()
+        self.assertFalse(Tasks.objects.using(shard).filter(user_id=user_id).exists())
@@ -10,68 +10,172 @@ Vistas:
 - TaskDeleteView: Permite a los usuarios autenticados eliminar sus propias tareas.
 """
 
+from django.http import HttpResponseRedirect
 from django.views.generic import ListView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from .models import Tasks
-from .forms import TaskForm
+from .forms import TaskForm, TaskUpdateForm
+from .cache import cached_task_query
+from .filters import apply_task_filters, parse_task_filters
+from .ordering import (
+    DEFAULT_TASK_ORDERING, InvalidOrdering, decode_cursor, encode_cursor, filter_after_cursor, order_tasks, parse_ordering,
+)
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.utils.dateparse import parse_date
-from django.db.models import Q
+from urllib.parse import urlencode
 import logging
 
 logger = logging.getLogger('app_tasks')
 
+# Ordenamientos ofrecidos en el formulario de búsqueda de la lista de tareas
+ORDERING_LABELS = [
+    ("-created_at", "Más recientes"),
+    ("created_at", "Más antiguas"),
+    ("-updated_at", "Actualizadas recientemente"),
+    ("updated_at", "Actualizadas hace más tiempo"),
+    ("status", "Estado (no iniciadas primero)"),
+    ("-status", "Estado (finalizadas primero)"),
+    ("name", "Nombre (A-Z)"),
+    ("-name", "Nombre (Z-A)"),
+]
+
 
 class TaskListView(LoginRequiredMixin, ListView):
     """
     Vista para listar las tareas del usuario autenticado, con soporte para búsquedas y filtrado por fechas.
 
     - Filtra las tareas del usuario autenticado por nombre, descripción y fecha de creación.
-    - Sobrescribe el método `post` para manejar la búsqueda.
+    - Los filtros se reciben como parámetros GET (`q`, `date_from`, `date_to`), por lo que los resultados
+      pueden guardarse como marcador y cachearse. Se mantiene el método `post` por compatibilidad.
+    - Ordena según `ordering` (ver `app_tasks/ordering.py`), con el `id` como desempate.
+    - Pagina por cursor (keyset): cada página es un `WHERE (campo, id) < cursor ... LIMIT n`,
+      de modo que el costo de una página profunda es el mismo que el de la primera.
+    - Con `?fragment=rows` devuelve solo las filas del `<tbody>` (más un marcador con la página siguiente),
+      para cargar más resultados o refrescarlos sin volver a renderizar la página completa.
     """
     model = Tasks
     template_name = "app_tasks/task_list.html"
     context_object_name = "tasks"
+    paginate_by = 25  # Cantidad máxima de tareas renderizadas por página
+    cursor_param = "after"  # Parámetro con el cursor de la última tarea de la página anterior
+    next_cursor = None
+    fragment_param = "fragment"
+    fragment_template_name = "app_tasks/task_rows.html"  # Solo las filas de la tabla
 
     def post(self, request, *args, **kwargs):
         """
         Sobrescribir el método POST para manejar la lógica de búsqueda y filtrado.
+        Se conserva por compatibilidad con formularios antiguos; el formulario actual usa GET.
+        """
+        return self.get(request, *args, **kwargs)
+
+    def get_request_data(self):
+        """
+        Devuelve los parámetros de la solicitud (GET, o POST si la solicitud es POST).
+        """
+        return self.request.POST if self.request.method == "POST" else self.request.GET
+
+    def get_filter_params(self):
+        """
+        Devuelve los parámetros de búsqueda y orden tal como los envió el usuario, para el formulario.
+        """
+        data = self.get_request_data()
+        return {
+            "q": data.get("q", ""),
+            "date_from": data.get("date_from", ""),
+            "date_to": data.get("date_to", ""),
+            "ordering": self.get_ordering(),
+        }
+
+    def get_ordering(self):
+        """
+        Sobrescribir `get_ordering` para aceptar solo los ordenamientos permitidos; cualquier otro valor
+        se reemplaza por el ordenamiento por defecto.
         """
-        self.object_list = self.get_queryset()  # Obtener el queryset con los filtros aplicados
-        context = self.get_context_data()
-        return self.render_to_response(context)
+        try:
+            return parse_ordering(self.get_request_data())
+        except InvalidOrdering:
+            return DEFAULT_TASK_ORDERING
 
     def get_queryset(self):
         """
         Sobrescribir `get_queryset` para obtener las tareas del usuario autenticado y aplicar los filtros de búsqueda.
         """
-        queryset = Tasks.objects.filter(user=self.request.user)
+        queryset = Tasks.objects.for_user(self.request.user)
+        queryset = apply_task_filters(queryset, self.get_task_filters())
+        return order_tasks(queryset, self.get_ordering())
 
-        # Parámetros de búsqueda (nombre, descripción y fechas)
-        search_query = self.request.POST.get("q", "")
-        date_from = self.request.POST.get("date_from", "")
-        date_to = self.request.POST.get("date_to", "")
+    def get_task_filters(self):
+        """
+        Devuelve los filtros de búsqueda normalizados (ver `app_tasks/filters.py`).
+        """
+        return parse_task_filters(self.get_request_data())
 
-        # Filtrar por contenido (nombre o descripción)
-        if search_query:
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) | Q(description__icontains=search_query)
-            )
+    def is_fragment_request(self):
+        """
+        Indica si la solicitud pide solo las filas de la tabla (`?fragment=rows`).
+        """
+        return self.request.GET.get(self.fragment_param) == "rows"
 
-        # Filtrar por fecha de creación (desde)
-        if date_from:
-            date_from_parsed = parse_date(date_from)
-            if date_from_parsed:
-                queryset = queryset.filter(created_at__date__gte=date_from_parsed)
+    def get_template_names(self):
+        """
+        Sobrescribir `get_template_names` para usar la plantilla parcial de filas en el modo fragmento.
+        """
+        if self.is_fragment_request():
+            return [self.fragment_template_name]
+        return super().get_template_names()
 
-        # Filtrar por fecha de creación (hasta)
-        if date_to:
-            date_to_parsed = parse_date(date_to)
-            if date_to_parsed:
-                queryset = queryset.filter(created_at__date__lte=date_to_parsed)
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Sobrescribir `render_to_response` para exponer el cursor siguiente también como encabezado HTTP,
+        útil para clientes que consumen el fragmento sin parsear el marcador.
+        """
+        response = super().render_to_response(context, **response_kwargs)
+        if self.is_fragment_request():
+            response["X-Next-Cursor"] = self.next_cursor or ""
+        return response
 
-        return queryset
+    def get_cursor(self):
+        """
+        Devuelve el cursor de la solicitud como par `(valor, id)`, o `None` si no existe o no es válido.
+        """
+        cursor = self.get_request_data().get(self.cursor_param, "")
+        return decode_cursor(cursor, self.get_ordering()) if cursor else None
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Sobrescribir `paginate_queryset` para paginar por cursor en lugar de por desplazamiento (OFFSET).
+
+        Se lee una fila extra para saber si existe una página siguiente sin ejecutar un `COUNT(*)`.
+        """
+        ordering = self.get_ordering()
+        cursor = self.get_cursor()
+        if cursor is not None:
+            queryset = filter_after_cursor(queryset, ordering, cursor)
+
+        # Páginas idénticas (mismo usuario, filtros, orden y cursor) se sirven desde el caché de consultas
+        params = ("list", *self.get_task_filters(), ordering, cursor, page_size)
+        rows = cached_task_query(self.request.user.id, params, lambda: list(queryset[:page_size + 1]))
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = encode_cursor(rows[-1], ordering) if has_next else None
+        return (None, None, rows, has_next)
+
+    def get_context_data(self, **kwargs):
+        """
+        Agrega al contexto los filtros activos, los ordenamientos disponibles y la query string de la página siguiente.
+        """
+        context = super().get_context_data(**kwargs)
+        filters = self.get_filter_params()
+        context["filters"] = filters
+        context["orderings"] = ORDERING_LABELS
+        context["next_cursor"] = self.next_cursor
+        context["next_page_query"] = None
+        if self.next_cursor is not None:
+            params = {key: value for key, value in filters.items() if value}
+            params[self.cursor_param] = self.next_cursor
+            context["next_page_query"] = urlencode(params)
+        return context
 
 
 class TaskCreateView(LoginRequiredMixin, CreateView):
@@ -107,12 +211,37 @@ class TaskUpdateView(LoginRequiredMixin, UpdateView):
     Vista para actualizar una tarea existente.
     
     - Permite a los usuarios autenticados actualizar únicamente sus tareas.
+    - Si la tarea cambió desde que se abrió el formulario (otra pestaña, la API), no la sobrescribe: vuelve a
+      mostrar el formulario con un error y responde 412 (PRECONDITION FAILED).
     """
     model = Tasks
-    form_class = TaskForm
+    form_class = TaskUpdateForm
     template_name = "app_tasks/update_task.html"
     success_url = reverse_lazy("tasks_list") # Redirige a la lista de tareas después de actualizar
 
+    def form_valid(self, form):
+        """
+        Guarda con `save_if_version` (`UPDATE ... WHERE id = ? AND version = ?`, sin bloquear la fila) usando
+        la versión enviada en el formulario.
+        """
+        self.object = form.instance
+        expected_version = form.cleaned_data["version"] or self.object.version
+        if not self.object.save_if_version(expected_version):
+            logger.info(f"Modificación concurrente rechazada de la tarea {self.object.pk} por {self.request.user}")
+            form.add_error(None, "La tarea fue modificada mientras la editaba. Recargue la página para ver los cambios.")
+            response = self.form_invalid(form)
+            response.status_code = 412
+            return response
+        logger.info(f"Tarea {self.object.pk} modificada por {self.request.user}")
+        return HttpResponseRedirect(self.get_success_url())
+
+    def get_queryset(self):
+        """
+        Sobrescribir `get_queryset` para que el usuario autenticado solo pueda actualizar sus propias tareas
+        (consultadas en su shard).
+        """
+        return Tasks.objects.for_user(self.request.user)
+
 
 class TaskDeleteView(LoginRequiredMixin, DeleteView):
     """
@@ -128,4 +257,4 @@ class TaskDeleteView(LoginRequiredMixin, DeleteView):
         """
         Sobrescribir `get_queryset` para asegurar que el usuario autenticado solo pueda eliminar sus propias tareas.
         """
-        return Tasks.objects.filter(user=self.request.user)
+        return Tasks.objects.for_user(self.request.user)
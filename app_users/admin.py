@@ -1,3 +1,59 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.models import User
+from app_tasks.retention import delete_user_in_chunks
 
-# Register your models here.
+
+class ChunkedDeleteUserAdmin(UserAdmin):
+    """
+    Administración de usuarios cuyas eliminaciones (acción masiva y botón "Eliminar" del formulario) borran las
+    tareas en lotes cortos (ver `app_tasks/retention.py`) en lugar del `CASCADE` en una única transacción larga.
+    """
+
+    actions = ["delete_users_in_chunks"]
+
+    def get_actions(self, request):
+        """
+        Quita la acción `delete_selected` de Django, que borra con `CASCADE`; se reemplaza por
+        `delete_users_in_chunks`.
+        """
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    @admin.action(description="Eliminar usuarios seleccionados y sus tareas (en lotes)", permissions=["delete"])
+    def delete_users_in_chunks(self, request, queryset):
+        """
+        Elimina cada usuario borrando antes sus tareas en lotes cortos (ver `app_tasks/retention.py`),
+        en lugar del `CASCADE` en una única transacción larga.
+        """
+        for user in queryset:
+            deleted = 0
+            for deleted in delete_user_in_chunks(user):
+                pass
+            self.message_user(request, f"Usuario {user.username} eliminado junto con {deleted} tareas.", messages.SUCCESS)
+
+    def delete_view(self, request, object_id, extra_context=None):
+        """
+        Igual que la vista de Django pero sin envolverla en una transacción: `delete_model` confirma cada lote
+        por separado, y dentro de una transacción externa todo volvería a ser un único commit largo.
+        """
+        return self._delete_view(request, object_id, extra_context)
+
+    def delete_model(self, request, obj):
+        """
+        Eliminación desde el formulario del usuario: borra sus tareas en lotes y luego el usuario.
+        """
+        for _ in delete_user_in_chunks(obj):
+            pass
+
+    def delete_queryset(self, request, queryset):
+        """
+        Eliminación masiva (si otra acción la usa): cada usuario pasa por `delete_model`.
+        """
+        for user in queryset:
+            self.delete_model(request, user)
+
+
+admin.site.unregister(User)
+admin.site.register(User, ChunkedDeleteUserAdmin)  # Parámetros: El Modelo y su Clase Registradora
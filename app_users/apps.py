@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AppUsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app_users"
+
+    def ready(self):
+        from . import signals  # Registra los receptores de señales de `User`
+        signals.connect_last_login_receiver()
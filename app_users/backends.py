@@ -0,0 +1,139 @@
+"""
+Backend de autenticación con caché para la aplicación de usuarios
+
+`AuthenticationMiddleware` resuelve el usuario de la sesión en cada solicitud con una consulta a `auth_user`.
+`CachedModelBackend` guarda ese usuario en el caché, de modo que las solicitudes siguientes no consultan la
+base de datos. Las entradas se invalidan al guardar o eliminar el usuario (incluido el cambio de contraseña,
+que pasa por `save()`), ver `app_users/signals.py`.
+
+La autenticación con credenciales (`django.contrib.auth.authenticate`) pasa por el mismo backend: igual que
+`ModelBackend`, pero el cálculo de PBKDF2 se hace en el pool de hashing (ver `app_users/hashing.py`).
+
+`django.contrib.auth.aauthenticate` (Django 5.1) solo ejecuta `authenticate` en un hilo, que queda bloqueado
+mientras se calcula el hash. `aauthenticate` de este módulo espera el pool con `await` en los backends que
+definen `aauthenticate`, como `CachedModelBackend`.
+
+Clases:
+- CachedModelBackend: `ModelBackend` de Django con `get_user` cacheado y hashing en el pool.
+
+Funciones:
+- aauthenticate: Versión asíncrona de `authenticate()` que no ocupa un hilo durante el hash.
+"""
+
+import inspect
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import _clean_credentials, load_backend
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+from django.views.decorators.debug import sensitive_variables
+from .hashing import ahash_password, averify_password, hash_password, verify_password
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    """
+    Elimina del caché el usuario indicado; la próxima solicitud lo vuelve a leer de la base de datos.
+    """
+    caches[settings.AUTH_USER_CACHE_ALIAS].delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    Backend de autenticación que cachea el usuario autenticado de cada sesión.
+
+    La carga del usuario a partir del id guardado en la sesión se cachea. La autenticación con credenciales
+    (`authenticate`) siempre consulta la base de datos y verifica la contraseña en el pool de hashing.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """
+        Igual que `ModelBackend.authenticate` (incluida la actualización del hash cuando cambian el algoritmo o
+        las iteraciones), con la verificación y el cálculo de hashes en el pool. Propaga `PasswordHashingBusy`
+        si el pool está lleno.
+        """
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            hash_password(password)  # Igual costo que un usuario existente, para no revelar qué usuarios existen
+            return None
+        is_correct, must_update = verify_password(password, user.password)
+        if is_correct and must_update:
+            user.password = hash_password(password)
+            user._password = None  # Actualizar el hash no es un cambio de contraseña
+            user.save(update_fields=["password"])
+        if is_correct and self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        """
+        Versión asíncrona de `authenticate`: las consultas usan el ORM asíncrono y el hash se espera con `await`.
+        """
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await User._default_manager.aget(**{User.USERNAME_FIELD: username})
+        except User.DoesNotExist:
+            await ahash_password(password)  # Igual costo que un usuario existente
+            return None
+        is_correct, must_update = await averify_password(password, user.password)
+        if is_correct and must_update:
+            user.password = await ahash_password(password)
+            user._password = None
+            await user.asave(update_fields=["password"])
+        if is_correct and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user(self, user_id):
+        """
+        Sobrescribir `get_user` para leer el usuario del caché antes de consultar `auth_user`.
+        """
+        cache = caches[settings.AUTH_USER_CACHE_ALIAS]
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+
+@sensitive_variables("credentials")
+async def aauthenticate(request=None, **credentials):
+    """
+    Igual que `django.contrib.auth.authenticate`, pero espera `aauthenticate` en los backends que la definen (los
+    demás se ejecutan en un hilo con `sync_to_async`).
+    """
+    for backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = load_backend(backend_path)
+        try:
+            inspect.signature(backend.authenticate).bind(request, **credentials)
+        except TypeError:
+            continue  # El backend no acepta estas credenciales
+        try:
+            if hasattr(backend, "aauthenticate"):
+                user = await backend.aauthenticate(request, **credentials)
+            else:
+                user = await sync_to_async(backend.authenticate)(request, **credentials)
+        except PermissionDenied:
+            break
+        if user is None:
+            continue
+        user.backend = backend_path
+        return user
+
+    await user_login_failed.asend(sender=__name__, credentials=_clean_credentials(credentials), request=request)
@@ -0,0 +1,166 @@
+"""
+Cálculo de hashes de contraseñas en un pool de procesos acotado
+
+PBKDF2 ocupa un núcleo durante cientos de milisegundos por contraseña. El hash y la verificación se ejecutan
+en un `ProcessPoolExecutor` dedicado, de modo que el cálculo no compite por el GIL ni por la CPU del proceso
+que atiende las solicitudes: los demás hilos del worker siguen atendiendo las solicitudes baratas (por ejemplo
+`/api/tasks/`).
+
+Las funciones síncronas dejan al hilo que pidió el hash esperando el resultado. Las variantes `a...` se esperan
+con `await` y no ocupan ningún hilo mientras el pool calcula: las usan el login y el registro de la API con ASGI
+(ver `AsyncCreateMixin` en `api/views.py`), así el event loop sigue atendiendo las demás solicitudes del worker.
+
+La cantidad de trabajos en curso está acotada por un semáforo: si el pool está lleno no se encola nada y se
+lanza `PasswordHashingBusy` de inmediato (la API responde 503), en lugar de acumular esperas sin límite.
+
+Configuración (settings.py):
+- PASSWORD_HASHING_WORKERS: Procesos del pool. Con 0 el hash se calcula en el mismo proceso (sin pool).
+- PASSWORD_HASHING_MAX_PENDING: Máximo de trabajos en curso o en espera antes de rechazar.
+
+Funciones:
+- hash_password / check_password / verify_password: Cálculo y verificación en el pool (bloquean al llamador).
+- ahash_password / acheck_password / averify_password: Las mismas operaciones, para esperar con `await`.
+- hash_passwords_parallel: Calcula muchos hashes repartidos entre los procesos del pool (carga masiva).
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import hashers
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = None
+
+
+class PasswordHashingBusy(Exception):
+    """
+    El pool de hashing está lleno; el llamador debe reintentar más tarde.
+    """
+
+
+def _init_worker(settings_module):
+    """
+    Inicializa Django en cada proceso del pool (necesario con el método de arranque `spawn`).
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+def _get_executor(workers=None):
+    """
+    Devuelve el pool del proceso, creándolo en el primer uso con `workers` procesos (por defecto
+    `PASSWORD_HASHING_WORKERS`). Las llamadas siguientes reutilizan el mismo pool.
+    """
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(settings.PASSWORD_HASHING_MAX_PENDING)
+                _executor = ProcessPoolExecutor(
+                    max_workers=workers or settings.PASSWORD_HASHING_WORKERS,
+                    initializer=_init_worker,
+                    initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "_Project_TodoList.settings"),),
+                )
+    return _executor
+
+
+def _submit(function, *args):
+    """
+    Envía un trabajo al pool reservando un lugar; lanza `PasswordHashingBusy` si no hay lugares libres.
+    """
+    executor = _get_executor()
+    if not _slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    try:
+        future = executor.submit(function, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def _pool_enabled():
+    return settings.PASSWORD_HASHING_WORKERS > 0
+
+
+def _run(function, *args):
+    """
+    Ejecuta `function` en el pool y espera el resultado bloqueando el hilo (sin pool, en el proceso actual).
+    """
+    if not _pool_enabled():
+        return function(*args)
+    return _submit(function, *args).result()
+
+
+async def _arun(function, *args):
+    """
+    Ejecuta `function` en el pool y espera el resultado con `await`. Sin pool se ejecuta en un hilo aparte, no
+    en el hilo compartido de las vistas síncronas.
+    """
+    if not _pool_enabled():
+        return await sync_to_async(function, thread_sensitive=False)(*args)
+    return await asyncio.wrap_future(_submit(function, *args))
+
+
+def hash_password(raw_password):
+    """
+    Devuelve el hash de la contraseña (equivalente a `make_password`).
+    """
+    return _run(hashers.make_password, raw_password)
+
+
+def check_password(raw_password, encoded):
+    """
+    Verifica la contraseña contra su hash (equivalente a `django.contrib.auth.hashers.check_password`).
+    """
+    return _run(hashers.check_password, raw_password, encoded)
+
+
+def verify_password(raw_password, encoded):
+    """
+    Devuelve `(correcta, debe_actualizarse)` (equivalente a `django.contrib.auth.hashers.verify_password`):
+    el segundo valor indica que el hash usa un algoritmo o una cantidad de iteraciones desactualizados.
+    """
+    return _run(hashers.verify_password, raw_password, encoded)
+
+
+async def ahash_password(raw_password):
+    """
+    Igual que `hash_password`, para esperar con `await` sin ocupar el hilo.
+    """
+    return await _arun(hashers.make_password, raw_password)
+
+
+async def acheck_password(raw_password, encoded):
+    """
+    Igual que `check_password`, para esperar con `await` sin ocupar el hilo.
+    """
+    return await _arun(hashers.check_password, raw_password, encoded)
+
+
+async def averify_password(raw_password, encoded):
+    """
+    Igual que `verify_password`, para esperar con `await` sin ocupar el hilo.
+    """
+    return await _arun(hashers.verify_password, raw_password, encoded)
+
+
+def hash_passwords_parallel(raw_passwords, workers=None, chunksize=16):
+    """
+    Devuelve los hashes de una lista de contraseñas, en el mismo orden, repartidos entre los procesos del pool.
+
+    Pensado para procesos por lotes (`manage.py bulk_create_users`): el pool se crea en la primera llamada (con
+    `workers` procesos) y se reutiliza en las siguientes, y no aplica el límite de trabajos pendientes de las
+    solicitudes web. Con `workers=0` calcula los hashes en el proceso actual.
+    """
+    raw_passwords = list(raw_passwords)
+    if workers == 0 or not (workers or _pool_enabled()) or len(raw_passwords) <= 1:
+        return [hashers.make_password(password) for password in raw_passwords]
+    return list(_get_executor(workers).map(hashers.make_password, raw_passwords, chunksize=chunksize))
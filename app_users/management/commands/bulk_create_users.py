@@ -0,0 +1,111 @@
+"""
+Comando de carga masiva de usuarios
+
+Uso:
+    python manage.py bulk_create_users usuarios.csv
+    python manage.py bulk_create_users usuarios.ndjson --batch-size 1000 --workers 8 --skip-existing
+
+El archivo debe tener los campos `username` y `password` (CSV con encabezado, o un objeto JSON por línea).
+A diferencia de `UserSerializer.create`, que hace dos escrituras y un hash en serie por usuario, este comando:
+- Valida cada username con los validadores del campo (caracteres permitidos y largo máximo), ya que
+  `bulk_create` no valida el modelo.
+- Verifica la unicidad de todos los usernames de cada lote con una única consulta.
+- Calcula los hashes de las contraseñas en paralelo, usando todos los núcleos (un único pool para toda la carga).
+- Inserta los usuarios de cada lote con `bulk_create`.
+"""
+
+import csv
+import json
+import os
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from app_users.hashing import hash_passwords_parallel
+
+
+class Command(BaseCommand):
+    help = "Crea usuarios en lote desde un archivo CSV o NDJSON con los campos username y password."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo CSV (con encabezado) o NDJSON.")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Formato del archivo (por defecto, según la extensión).")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Usuarios por lote (consulta de unicidad e INSERT).")
+        parser.add_argument("--workers", type=int, default=None, help="Procesos para calcular hashes (0: sin paralelismo).")
+        parser.add_argument("--skip-existing", action="store_true", help="Omite los usernames existentes en lugar de abortar.")
+        parser.add_argument("--validate-passwords", action="store_true", help="Aplica AUTH_PASSWORD_VALIDATORS a cada contraseña.")
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"No existe el archivo {path}.")
+        file_format = options["format"] or ("ndjson" if path.suffix in (".ndjson", ".jsonl") else "csv")
+
+        # El pool de hashing se crea en el primer lote y se reutiliza en los siguientes
+        workers = os.cpu_count() if options["workers"] is None else options["workers"]
+        username_field = User._meta.get_field("username")
+        created = skipped = 0
+        seen = set()  # Usernames ya procesados en este archivo
+        for batch in self.read_batches(path, file_format, options["batch_size"]):
+            rows = []
+            for line, row in batch:
+                username, password = row.get("username"), row.get("password")
+                if not username or not password:
+                    raise CommandError(f"Línea {line}: faltan username o password.")
+                if username in seen:
+                    raise CommandError(f"Línea {line}: username duplicado en el archivo: {username}.")
+                try:
+                    username_field.run_validators(username)
+                except ValidationError as error:
+                    raise CommandError(f"Línea {line}: username inválido: {' '.join(error.messages)}")
+                if options["validate_passwords"]:
+                    try:
+                        validate_password(password, User(username=username))
+                    except ValidationError as error:
+                        raise CommandError(f"Línea {line}: {' '.join(error.messages)}")
+                seen.add(username)
+                rows.append((username, password))
+
+            # Una sola consulta para todos los usernames del lote
+            existing = set(User.objects.filter(username__in=[username for username, _ in rows]).values_list("username", flat=True))
+            if existing and not options["skip_existing"]:
+                raise CommandError(f"Usuarios existentes: {', '.join(sorted(existing))}. Use --skip-existing para omitirlos.")
+            rows = [(username, password) for username, password in rows if username not in existing]
+            skipped += len(existing)
+
+            hashes = hash_passwords_parallel([password for _, password in rows], workers=workers)
+            with transaction.atomic():
+                User.objects.bulk_create(
+                    [User(username=username, password=encoded) for (username, _), encoded in zip(rows, hashes)],
+                    batch_size=options["batch_size"],
+                )
+            created += len(rows)
+            self.stdout.write(f"Lote procesado: {created} creados, {skipped} omitidos.")
+
+        self.stdout.write(self.style.SUCCESS(f"Usuarios creados: {created}. Omitidos por existir: {skipped}."))
+
+    def read_batches(self, path, file_format, batch_size):
+        """
+        Lee el archivo y devuelve lotes de tuplas (número de línea, fila).
+        """
+        batch = []
+        with path.open(newline="", encoding="utf-8") as file:
+            if file_format == "csv":
+                rows = ((line, row) for line, row in enumerate(csv.DictReader(file), start=2))
+            else:
+                rows = ((line, self.parse_json_line(line, text)) for line, text in enumerate(file, start=1) if text.strip())
+            for item in rows:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def parse_json_line(self, line, text):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as error:
+            raise CommandError(f"Línea {line}: JSON inválido ({error}).")
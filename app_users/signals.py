@@ -0,0 +1,44 @@
+"""
+Señales de la aplicación de usuarios
+
+- Invalida el usuario cacheado por `CachedModelBackend` cuando el usuario cambia o se elimina.
+- Reemplaza la actualización de `last_login` de Django por una versión que escribe como mucho una vez
+  cada `LAST_LOGIN_UPDATE_INTERVAL` segundos por usuario, para reducir la contención de escritura en SQLite.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User, update_last_login
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .backends import invalidate_cached_user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """
+    Invalida el usuario cacheado al modificarlo (datos, permisos o contraseña) o eliminarlo.
+    """
+    invalidate_cached_user(instance.pk)
+
+
+def update_last_login_throttled(sender, user, **kwargs):
+    """
+    Actualiza `last_login` solo si el último valor registrado es más antiguo que el intervalo configurado.
+    """
+    now = timezone.now()
+    interval = timedelta(seconds=settings.LAST_LOGIN_UPDATE_INTERVAL)
+    if user.last_login is None or now - user.last_login >= interval:
+        user.last_login = now
+        user.save(update_fields=["last_login"])
+
+
+def connect_last_login_receiver():
+    """
+    Sustituye el receptor `update_last_login` registrado por `django.contrib.auth`.
+    """
+    user_logged_in.disconnect(update_last_login, dispatch_uid="update_last_login")
+    user_logged_in.connect(update_last_login_throttled, dispatch_uid="update_last_login")
@@ -8,11 +8,28 @@ Clases:
 - RegisterViewTest: Pruebas para la vista de registro de usuarios.
 - LoginViewTest: Pruebas para la vista de inicio de sesión.
 - LogoutViewTest: Pruebas para la vista de cierre de sesión.
+- CachedSessionTest: Pruebas del motor de sesiones cacheado y del usuario autenticado cacheado.
+- PasswordHashingPoolTest: Pruebas del pool de procesos para hashes de contraseñas.
+- BulkCreateUsersCommandTest: Pruebas del comando `bulk_create_users`.
+- UserAdminDeleteTest: Pruebas de la eliminación de usuarios desde el admin.
 """
 
-from django.test import TestCase
+import asyncio
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.urls import reverse
 from django.contrib.auth.models import User
+from unittest.mock import patch
+from app_tasks.models import Tasks
+from app_tasks.retention import delete_user_in_chunks
+from . import hashing
+from .hashing import acheck_password, ahash_password, averify_password, check_password, hash_password, hash_passwords_parallel
 
 
 class RegisterViewTest(TestCase):
@@ -115,3 +132,181 @@ class LogoutViewTest(TestCase):
         response = self.client.post(reverse('logout'))
         self.assertEqual(response.status_code, 302)  # Verifica la redirección tras el logout
         self.assertNotIn('_auth_user_id', self.client.session)  # Verifica que el usuario ha sido desconectado
+
+
+class CachedSessionTest(TestCase):
+    """
+    Pruebas del motor de sesiones `cached_db` y de `CachedModelBackend`.
+
+    Mide cuántas consultas ahorra la configuración cacheada en una solicitud a `/app_tasks/listar/`.
+    """
+
+    def setUp(self):
+        """
+        Configuración inicial: crear un usuario de prueba.
+        """
+        self.user = User.objects.create_user(username='testuser', password='12345Abc!')
+
+    def count_list_queries(self):
+        """
+        Inicia sesión y devuelve las consultas de una solicitud "en caliente" a la lista de tareas.
+        Usa un cliente nuevo porque el middleware de sesiones fija su motor al instanciarse.
+        """
+        client = Client()
+        client.login(username='testuser', password='12345Abc!')
+        client.get(reverse('tasks_list'))  # Primera solicitud: llena los cachés
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse('tasks_list'))
+        return len(queries)
+
+    def test_cached_session_and_user_save_queries(self):
+        """
+        Verifica que la sesión y el usuario se lean del caché:
+        - Sin caché, cada solicitud consulta `django_session` y `auth_user`.
+        - Con la configuración cacheada, esas dos consultas desaparecen.
+        """
+        with override_settings(
+            SESSION_ENGINE='django.contrib.sessions.backends.db',
+            AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'],
+        ):
+            uncached = self.count_list_queries()
+        cached = self.count_list_queries()
+        self.assertEqual(uncached - cached, 2)  # Consultas ahorradas por solicitud
+
+    def test_cached_user_is_invalidated_on_password_change(self):
+        """
+        Verifica que cambiar la contraseña invalide el usuario cacheado y cierre las sesiones existentes.
+        """
+        self.client.login(username='testuser', password='12345Abc!')
+        self.assertEqual(self.client.get(reverse('tasks_list')).status_code, 200)
+
+        self.user.set_password('Another123!')
+        self.user.save()
+        response = self.client.get(reverse('tasks_list'))
+        self.assertEqual(response.status_code, 302)  # El hash de sesión ya no coincide: redirige al login
+
+
+class PasswordHashingPoolTest(TestCase):
+    """
+    Pruebas del pool de procesos que calcula y verifica hashes de contraseñas.
+    """
+
+    def test_hash_and_check_in_pool(self):
+        """
+        Verifica que el hash calculado en el pool sea válido para Django y que la verificación funcione.
+        """
+        encoded = hash_password('12345Abc!')
+        user = User.objects.create(username='pooluser', password=encoded)
+        self.assertTrue(user.check_password('12345Abc!'))
+        self.assertTrue(check_password('12345Abc!', encoded))
+        self.assertFalse(check_password('wrongpassword', encoded))
+
+    def test_parallel_hashing_reuses_the_pool(self):
+        """
+        Verifica que las cargas masivas reutilicen el pool del proceso en lugar de crear uno por llamada.
+        """
+        first = hash_passwords_parallel(['Secret123!', 'Secret456!'])
+        executor = hashing._executor
+        second = hash_passwords_parallel(['Secret789!', 'Secret000!'])
+        self.assertIs(hashing._executor, executor)
+        self.assertTrue(check_password('Secret456!', first[1]))
+        self.assertTrue(check_password('Secret000!', second[1]))
+
+    async def test_async_hashing_does_not_block_the_event_loop(self):
+        """
+        Verifica que, mientras se espera `ahash_password`, el event loop siga ejecutando otras tareas.
+        """
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticker = asyncio.ensure_future(tick())
+        try:
+            encoded = await ahash_password('Secret123!')
+        finally:
+            ticker.cancel()
+        self.assertGreater(ticks, 1)
+        self.assertTrue(await acheck_password('Secret123!', encoded))
+        self.assertEqual(await averify_password('wrongpassword', encoded), (False, False))
+
+
+class BulkCreateUsersCommandTest(TestCase):
+    """
+    Pruebas del comando de carga masiva de usuarios.
+    """
+
+    def write_file(self, suffix, content):
+        file = tempfile.NamedTemporaryFile('w', suffix=suffix, delete=False, encoding='utf-8')
+        file.write(content)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_bulk_create_from_csv(self):
+        """
+        Verifica que los usuarios del CSV se creen con contraseñas válidas y que los existentes se omitan.
+        """
+        User.objects.create_user(username='existing', password='12345Abc!')
+        path = self.write_file('.csv', 'username,password\nbulk1,Secret123!\nbulk2,Secret456!\nexisting,x\n')
+        call_command('bulk_create_users', path, '--skip-existing', '--batch-size', '2', stdout=StringIO())
+
+        self.assertEqual(User.objects.filter(username__startswith='bulk').count(), 2)
+        self.assertTrue(User.objects.get(username='bulk2').check_password('Secret456!'))
+
+    def test_bulk_create_from_ndjson_rejects_existing(self):
+        """
+        Verifica que, sin `--skip-existing`, un username existente aborte la carga del lote.
+        """
+        User.objects.create_user(username='existing', password='12345Abc!')
+        path = self.write_file('.ndjson', '{"username": "bulk1", "password": "Secret123!"}\n{"username": "existing", "password": "x"}\n')
+        with self.assertRaises(CommandError):
+            call_command('bulk_create_users', path, '--workers', '0', stdout=StringIO())
+        self.assertFalse(User.objects.filter(username='bulk1').exists())
+
+    def test_bulk_create_rejects_invalid_usernames(self):
+        """
+        Verifica que se rechacen los usernames que no cumplen los validadores del campo (caracteres no
+        permitidos o más de 150 caracteres), aunque `bulk_create` no valide el modelo.
+        """
+        for username in ['bad name!', 'x' * 151]:
+            path = self.write_file('.csv', f'username,password\nbulk1,Secret123!\n{username},Secret456!\n')
+            with self.assertRaisesMessage(CommandError, 'Línea 3: username inválido'):
+                call_command('bulk_create_users', path, '--workers', '0', stdout=StringIO())
+        self.assertFalse(User.objects.filter(username='bulk1').exists())
+
+
+class UserAdminDeleteTest(TestCase):
+    """
+    Pruebas de la eliminación de usuarios desde el admin: siempre borra las tareas en lotes, nunca con `CASCADE`.
+    """
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='root', password='Secret123!')
+        self.client.force_login(self.admin)
+        self.user = User.objects.create_user(username='owner', password='Secret123!')
+        for index in range(3):
+            Tasks.objects.create(name=f'Tarea {index}', user=self.user)
+
+    def test_delete_selected_action_is_removed(self):
+        """
+        Verifica que la acción `delete_selected` de Django no se ofrezca y sí la eliminación en lotes.
+        """
+        response = self.client.get(reverse('admin:auth_user_changelist'))
+        actions = [value for value, _ in response.context['action_form'].fields['action'].choices]
+        self.assertNotIn('delete_selected', actions)
+        self.assertIn('delete_users_in_chunks', actions)
+
+    def test_change_form_delete_uses_chunks(self):
+        """
+        Verifica que el botón "Eliminar" del formulario borre al usuario y sus tareas con `delete_user_in_chunks`.
+        """
+        with patch('app_users.admin.delete_user_in_chunks', wraps=delete_user_in_chunks) as chunked:
+            response = self.client.post(reverse('admin:auth_user_delete', args=[self.user.pk]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        chunked.assert_called_once()
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Tasks.objects.filter(name__startswith='Tarea').exists())